@@ -0,0 +1,176 @@
+"""
+Content-addressed cache of ``AIEngine.analyze`` results.
+
+An analysis depends only on the bug's content and the engine rules, so
+results are keyed by a hash of (title, description, logs, tags, severity, log digest,
+engine version). Re-analyzing an unchanged bug — or an identical duplicate —
+is then a lookup instead of a recomputation.
+
+Two tiers:
+- an in-memory LRU bounded by entry count and total serialized size, with a
+  per-entry TTL;
+- an optional SQLite table (``path``) that survives restarts and is shared
+  by every worker process on the host. Expired rows are deleted by a sweep
+  that writes run at most every ``SWEEP_INTERVAL_SECONDS``.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# Longest gap between two sweeps of expired rows from the SQLite tier
+SWEEP_INTERVAL_SECONDS = 300
+
+
+class AnalysisCache:
+    """Two-tier LRU + SQLite cache of analysis results."""
+
+    def __init__(
+        self,
+        version: str,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float = 3600,
+        path: str = "",
+    ):
+        self.version = version
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # key -> (expires_at, serialized analysis)
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.persistent_hits = 0
+        self.evictions = 0
+        self._swept_at = 0.0
+
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS analysis_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS ix_analysis_cache_expires_at "
+                "ON analysis_cache (expires_at)"
+            )
+
+    def key(self, record: Dict[str, Any], model_version: str = "") -> str:
+        """
+        Content hash of the ``AIEngine.analyze`` arguments in ``record``,
+        scoped to the category model version in use.
+        """
+        digest = hashlib.sha256()
+        for part in (
+            self.version,
+            model_version,
+            record.get("title") or "",
+            record.get("description") or "",
+            record.get("logs") or "",
+            json.dumps(record.get("tags") or []),
+            record.get("severity") or "",
+            json.dumps(record.get("log_digest"), sort_keys=True),
+        ):
+            encoded = part.encode("utf-8", "surrogatepass")
+            # Length-prefix each field so boundaries cannot be shifted
+            digest.update(len(encoded).to_bytes(8, "big"))
+            digest.update(encoded)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return json.loads(value)
+                self._drop(key)
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM analysis_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[1] > time.time():
+                    self.hits += 1
+                    self.persistent_hits += 1
+                    self._store(key, row[0], now + min(self.ttl_seconds, row[1] - time.time()))
+                    return json.loads(row[0])
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, analysis: Dict[str, Any]):
+        value = json.dumps(analysis)
+        with self._lock:
+            self._store(key, value, time.monotonic() + self.ttl_seconds)
+            if self._db is not None:
+                now = time.time()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO analysis_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, value, now + self.ttl_seconds),
+                )
+                if now - self._swept_at >= min(self.ttl_seconds, SWEEP_INTERVAL_SECONDS):
+                    self._sweep(now)
+
+    def sweep(self) -> int:
+        """Delete expired rows from the SQLite tier; returns how many."""
+        with self._lock:
+            return self._sweep(time.time()) if self._db is not None else 0
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM analysis_cache")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "persistentHits": self.persistent_hits,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "persistent": self._db is not None,
+            }
+
+    # ---------- Internal (call with the lock held) ----------
+
+    def _sweep(self, now: float) -> int:
+        self._swept_at = now
+        return self._db.execute(
+            "DELETE FROM analysis_cache WHERE expires_at <= ?", (now,)
+        ).rowcount
+
+    def _store(self, key: str, value: str, expires_at: float):
+        if key in self._entries:
+            self._drop(key)
+        size = len(value)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (expires_at, value)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def _drop(self, key: str):
+        _, value = self._entries.pop(key)
+        self._bytes -= len(value)
@@ -0,0 +1,265 @@
+"""
+TF-IDF + MiniBatchKMeans bug categorization.
+
+A model is trained offline (``python -m app.ai.train``) over every stored
+bug: texts are TF-IDF vectorized and clustered, and each cluster is labelled
+with the most common keyword-rule category among its members, ignoring
+"General Bug" where a cluster has anything better. Bugs that match no rule
+then inherit the category of the bugs they read like.
+
+The model file is written uncompressed so ``CategoryModelStore`` can
+memory-map its arrays; every process serving analyses shares the pages and
+picks up a retrained or incrementally updated file on its next lookup.
+``IncrementalTrainer`` keeps the model current between full trainings with
+``partial_fit`` as bugs arrive.
+"""
+
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Callable, List, Optional, Sequence, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: only writers within one process are serialized
+    fcntl = None
+
+try:
+    import joblib
+    import numpy as np
+    from sklearn.cluster import MiniBatchKMeans
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    ML_AVAILABLE = True
+except ImportError:
+    ML_AVAILABLE = False
+
+logger = logging.getLogger("crowdfundfix.ai")
+
+FALLBACK_CATEGORY = "General Bug"
+
+
+def model_text(title: str, description: str, tags: Optional[Sequence[str]] = None) -> str:
+    """The text a bug is vectorized from."""
+    return f"{title} {description} {' '.join(tags or [])}"
+
+
+class CategoryModel:
+    """Fitted vectorizer + clusters, with per-cluster category counts."""
+
+    def __init__(self, vectorizer, kmeans, categories: List[str], label_counts):
+        self.vectorizer = vectorizer
+        self.kmeans = kmeans
+        self.categories = categories
+        # clusters x categories membership counts; cluster labels follow them
+        self.label_counts = label_counts
+
+    @classmethod
+    def fit(
+        cls,
+        texts: List[str],
+        labels: List[str],
+        n_clusters: int = 16,
+        random_state: int = 0,
+    ) -> "CategoryModel":
+        n_clusters = max(1, min(n_clusters, len(texts)))
+        vectorizer = TfidfVectorizer(
+            sublinear_tf=True, min_df=1, max_features=50000, stop_words="english"
+        )
+        matrix = vectorizer.fit_transform(texts)
+        kmeans = MiniBatchKMeans(
+            n_clusters=n_clusters, random_state=random_state, n_init=3, batch_size=1024
+        )
+        clusters = kmeans.fit_predict(matrix)
+
+        categories = sorted(set(labels) | {FALLBACK_CATEGORY})
+        model = cls(vectorizer, kmeans, categories, np.zeros((n_clusters, len(categories))))
+        model._count(clusters, labels)
+        return model
+
+    def predict(self, texts: List[str]) -> List[str]:
+        """Category per text — one sparse transform for the whole batch."""
+        if not texts:
+            return []
+        matrix = self.vectorizer.transform(texts)
+        clusters = self.kmeans.predict(matrix)
+        labels = self.cluster_labels()
+        # Texts sharing no vocabulary with the training set say nothing
+        known = np.diff(matrix.indptr) > 0
+        return [labels[c] if k else FALLBACK_CATEGORY for c, k in zip(clusters, known)]
+
+    def partial_fit(self, texts: List[str], labels: List[str]):
+        """Move the clusters towards new bugs and count their categories."""
+        if not texts:
+            return
+        matrix = self.vectorizer.transform(texts)
+        self.kmeans.partial_fit(matrix)
+        for label in labels:
+            if label not in self.categories:
+                self.categories.append(label)
+                self.label_counts = np.hstack(
+                    [self.label_counts, np.zeros((len(self.label_counts), 1))]
+                )
+        self._count(self.kmeans.predict(matrix), labels)
+
+    def cluster_labels(self) -> List[str]:
+        fallback = self.categories.index(FALLBACK_CATEGORY)
+        counts = np.array(self.label_counts, dtype=float)
+        # "General Bug" only labels clusters with no specific category at all
+        specific = counts.copy()
+        specific[:, fallback] = 0
+        return [
+            self.categories[int(row.argmax())] if row.any() else FALLBACK_CATEGORY
+            for row in specific
+        ]
+
+    def save(self, path: str):
+        """Write atomically so readers never map a half-written file."""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        partial = f"{path}.{uuid.uuid4().hex}.part"
+        try:
+            joblib.dump(self, partial)
+            os.replace(partial, path)
+        except BaseException:
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> "CategoryModel":
+        # Copy-on-write mapping: pages are shared, partial_fit writes stay private
+        model = joblib.load(path, mmap_mode="c")
+        model.label_counts = np.array(model.label_counts)
+        return model
+
+    def _count(self, clusters, labels: List[str]):
+        index = {c: i for i, c in enumerate(self.categories)}
+        for cluster, label in zip(clusters, labels):
+            self.label_counts[cluster, index[label]] += 1
+
+
+class CategoryModelStore:
+    """
+    Lazily loaded model file, reloaded when it changes on disk.
+
+    The file is stat-ed at most every ``check_interval`` seconds. ``version``
+    identifies the loaded model so cached analyses can be keyed on it.
+    """
+
+    def __init__(self, path: str, check_interval: float = 1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self.version = ""
+        self._model: Optional[CategoryModel] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[CategoryModel]:
+        if not ML_AVAILABLE or not self.path:
+            return None
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return self._model
+        with self._lock:
+            self._checked_at = now
+            try:
+                stat = os.stat(self.path)
+            except OSError:
+                self._model, self.version = None, ""
+                return None
+            version = f"{stat.st_mtime_ns}:{stat.st_size}"
+            if version != self.version:
+                try:
+                    self._model = CategoryModel.load(self.path)
+                    self.version = version
+                except Exception:
+                    logger.exception(f"Could not load category model {self.path}")
+                    self._model, self.version = None, ""
+            return self._model
+
+
+@contextmanager
+def model_file_lock(path: str):
+    """Exclusive lock on ``<path>.lock``, held by one process at a time."""
+    if fcntl is None:
+        yield
+        return
+    with open(f"{path}.lock", "a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+class IncrementalTrainer:
+    """
+    Buffers newly filed bugs and folds them into the stored model.
+
+    Every ``batch_size`` bugs the batch is handed to a background thread,
+    which ``partial_fit``s the model on it — labelled by
+    ``labeler(title, description, tags)`` — and saves it, so the commit hook
+    that observes a bug never waits on the model. Each update reloads,
+    fits and replaces the file under ``model_file_lock``, so workers of
+    several processes add to each other's updates instead of overwriting
+    them; the ``CategoryModelStore`` of every process then reloads it.
+    Nothing happens until a model has been trained offline.
+    """
+
+    def __init__(
+        self,
+        store: CategoryModelStore,
+        labeler: Callable[[str, str, Sequence[str]], str],
+        batch_size: int = 32,
+    ):
+        self.store = store
+        self.labeler = labeler
+        self.batch_size = batch_size
+        self._pending: List[Tuple[str, str, Sequence[str]]] = []
+        self._updates: List[Future] = []
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        return self.store.get() is not None
+
+    def observe(self, title: str, description: str, tags: Optional[Sequence[str]] = None):
+        with self._lock:
+            self._pending.append((title, description, tags or []))
+            if len(self._pending) >= self.batch_size:
+                self._submit()
+
+    def flush(self, timeout: Optional[float] = None):
+        """Fold in the buffered bugs and wait for every pending update."""
+        with self._lock:
+            self._submit()
+            updates = list(self._updates)
+        wait(updates, timeout)
+
+    def _submit(self):
+        bugs, self._pending = self._pending, []
+        if not bugs:
+            return
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="category-model")
+        self._updates = [f for f in self._updates if not f.done()]
+        self._updates.append(self._pool.submit(self._update, bugs))
+
+    def _update(self, bugs: List[Tuple[str, str, Sequence[str]]]):
+        try:
+            if not self.active:
+                return
+            labels = [self.labeler(*bug) for bug in bugs]
+            with model_file_lock(self.store.path):
+                # Work on a private copy; the store keeps serving the mapped one
+                model = CategoryModel.load(self.store.path)
+                model.partial_fit([model_text(*bug) for bug in bugs], labels)
+                model.save(self.store.path)
+        except Exception:
+            logger.exception(f"Could not update category model {self.store.path}")
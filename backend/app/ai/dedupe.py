@@ -0,0 +1,191 @@
+"""
+Near-duplicate bug detection with MinHash + banded LSH.
+
+A bug's title, description and logs are reduced to a set of word shingles
+(variable tokens such as ids, timestamps and counters masked first, so two
+reports of one crash at different times still overlap). MinHash compresses
+the set to ``num_perm`` minimum hash values whose agreement rate estimates
+Jaccard similarity; splitting the signature into ``bands`` buckets means
+only bugs sharing at least one whole band are ever compared, so lookups
+cost the same however many bugs are indexed.
+
+Signatures are computed with NumPy when it is installed; without the ML
+extras the same permutations run in pure Python, slower but equivalent.
+"""
+
+import random
+import threading
+import zlib
+from array import array
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+try:
+    import numpy as np
+
+    ML_AVAILABLE = True
+except ImportError:
+    ML_AVAILABLE = False
+
+from app.ai.drain import mask_tokens
+
+# Largest prime below 2**32: hash values and the permutation stay in uint64
+_PRIME = 4294967291
+_EMPTY = 2**32 - 1
+
+# A uint32 NumPy array, or an ``array("L")`` without NumPy
+Signature = Sequence[int]
+
+
+def shingles(text: str, k: int = 3) -> Set[str]:
+    """Lowercased word ``k``-shingles of ``text`` with variable tokens masked."""
+    tokens = mask_tokens(text.lower().split())
+    if len(tokens) < k:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i:i + k]) for i in range(len(tokens) - k + 1)}
+
+
+class MinHasher:
+    """``num_perm`` random linear permutations ``(a * x + b) mod p``."""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        self.num_perm = num_perm
+        if ML_AVAILABLE:
+            rng = np.random.RandomState(seed)
+            self._a = rng.randint(1, 2**31 - 1, num_perm).astype(np.uint64)
+            self._b = rng.randint(0, 2**31 - 1, num_perm).astype(np.uint64)
+        else:
+            rng = random.Random(seed)
+            self._a = [rng.randrange(1, 2**31 - 1) for _ in range(num_perm)]
+            self._b = [rng.randrange(0, 2**31 - 1) for _ in range(num_perm)]
+
+    def signature(self, shingle_set: Set[str]) -> Signature:
+        hashes = [zlib.crc32(s.encode("utf-8", "surrogatepass")) for s in shingle_set]
+        if not ML_AVAILABLE:
+            return array("L", (
+                min(((a * h + b) % _PRIME for h in hashes), default=_EMPTY)
+                for a, b in zip(self._a, self._b)
+            ))
+        if not hashes:
+            return np.full(self.num_perm, _EMPTY, dtype=np.uint32)
+        hashes = np.array(hashes, dtype=np.uint64)
+        permuted = (np.outer(hashes, self._a) + self._b) % np.uint64(_PRIME)
+        return permuted.min(axis=0).astype(np.uint32)
+
+
+def agreement(a: Signature, b: Signature) -> float:
+    """Share of positions where two signatures agree (estimated Jaccard)."""
+    if ML_AVAILABLE:
+        return float(np.mean(a == b))
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+class DuplicateIndex:
+    """
+    In-memory LSH index of bug signatures, keyed by bug id.
+
+    With the default 32 bands of 4 rows, pairs at Jaccard 0.5 become
+    candidates ~87% of the time and pairs at 0.7 ~99.9%; candidates are then
+    filtered by their estimated similarity. Callers load it once with
+    ``rebuild`` (``built`` is False until then) and keep it current with
+    ``add``/``remove``.
+    """
+
+    def __init__(self, num_perm: int = 128, bands: int = 32):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.built = False
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._buckets: List[Dict[bytes, Set[str]]] = [defaultdict(set) for _ in range(self.bands)]
+        self._signatures: Dict[str, Signature] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, bug_id: str) -> bool:
+        return bug_id in self._signatures
+
+    def signature(self, title: str, description: str, logs: str = "") -> Signature:
+        return self.hasher.signature(shingles(f"{title}\n{description}") | shingles(logs or ""))
+
+    def rebuild(self, bugs: Iterable[Tuple[str, str, str, Optional[str]]]):
+        """Replace the contents with ``(id, title, description, logs)`` rows."""
+        signatures = [(bug_id, self.signature(*text)) for bug_id, *text in bugs]
+        with self._lock:
+            self._reset()
+            for bug_id, sig in signatures:
+                self._insert(bug_id, sig)
+            self.built = True
+
+    def add(self, bug_id: str, title: str, description: str, logs: str = ""):
+        sig = self.signature(title, description, logs)
+        with self._lock:
+            self._delete(bug_id)
+            self._insert(bug_id, sig)
+
+    def remove(self, bug_id: str):
+        with self._lock:
+            self._delete(bug_id)
+
+    def invalidate(self):
+        """Force a rebuild on next use."""
+        with self._lock:
+            self._reset()
+            self.built = False
+
+    def similar(
+        self, bug_id: str, threshold: float = 0.5, limit: int = 10
+    ) -> List[Tuple[str, float]]:
+        """Indexed bugs similar to ``bug_id``, most similar first."""
+        sig = self._signatures.get(bug_id)
+        if sig is None:
+            return []
+        return self.query(sig, threshold, limit, exclude=bug_id)
+
+    def query(
+        self,
+        sig: Signature,
+        threshold: float = 0.5,
+        limit: int = 10,
+        exclude: Optional[str] = None,
+    ) -> List[Tuple[str, float]]:
+        """``(bug id, estimated Jaccard)`` for candidates at or above ``threshold``."""
+        with self._lock:
+            candidates = set()
+            for band, bucket in zip(self._bands(sig), self._buckets):
+                candidates |= bucket.get(band, set())
+            candidates.discard(exclude)
+            scored = [
+                (other, agreement(self._signatures[other], sig))
+                for other in candidates
+            ]
+        matches = [(other, round(score, 3)) for other, score in scored if score >= threshold]
+        matches.sort(key=lambda m: (-m[1], m[0]))
+        return matches[:limit]
+
+    # ---------- Internal (call with the lock held) ----------
+
+    def _bands(self, sig: Signature) -> List[bytes]:
+        return [sig[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def _insert(self, bug_id: str, sig: Signature):
+        self._signatures[bug_id] = sig
+        for band, bucket in zip(self._bands(sig), self._buckets):
+            bucket[band].add(bug_id)
+
+    def _delete(self, bug_id: str):
+        sig = self._signatures.pop(bug_id, None)
+        if sig is None:
+            return
+        for band, bucket in zip(self._bands(sig), self._buckets):
+            members = bucket.get(band)
+            if members is not None:
+                members.discard(bug_id)
+                if not members:
+                    del bucket[band]
@@ -0,0 +1,250 @@
+"""
+Online log template mining in the style of Drain (He et al., ICWS 2017).
+
+Each log line is tokenized, variable-looking tokens (ids, counters,
+timestamps, addresses) are masked to ``<*>``, and the line is routed through
+a fixed-depth parse tree — first by token count, then by its leading tokens —
+to a short list of candidate templates. It joins the most similar one (and
+positions that differ become ``<*>``) or starts a new template. One pass,
+constant work per line, and the number of templates is capped, so mining is
+linear in the log size with bounded memory.
+
+Rule keywords are matched by ``KeywordMatcher`` against each raw line, not
+against templates: masking and merging only shape the templates, so a
+``500`` in ``status=500`` or a ``timeout`` that later becomes ``<*>`` is
+still counted. Keywords must start on a word boundary, so a ``500`` inside
+``15003`` or an ``oom`` inside ``room`` does not count.
+"""
+
+import re
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+WILDCARD = "<*>"
+
+# Tokens carrying a digit are variables — except bare 3-digit numbers, which
+# are kept so status codes like 401 or 500 survive into templates.
+_VARIABLE_TOKEN = re.compile(r"^(?!\d{3}[,.;:)\]]?$).*\d")
+
+
+def mask_tokens(tokens: Iterable[str]) -> List[str]:
+    """Replace variable-looking tokens with ``<*>``."""
+    return [WILDCARD if _VARIABLE_TOKEN.match(token) else token for token in tokens]
+
+
+class LogCluster:
+    """A template and the number of lines it has absorbed."""
+
+    __slots__ = ("tokens", "count", "pinned")
+
+    def __init__(self, tokens: List[str]):
+        self.tokens = tokens
+        self.count = 1
+        # Absorbed a line with a rule keyword; outlives unpinned clusters
+        self.pinned = False
+
+    @property
+    def template(self) -> str:
+        return " ".join(self.tokens)
+
+
+class TemplateMiner:
+    """
+    Fixed-depth parse tree of log templates.
+
+    ``depth`` counts the length layer plus ``depth - 2`` leading-token layers.
+    A line joins a template when at least ``similarity`` of its positions
+    match exactly. Nodes with ``max_children`` children send further tokens
+    down a shared ``<*>`` branch. Past ``max_clusters`` templates the rarest
+    half is dropped — pinned templates last — so counts are exact for the
+    templates that matter and memory stays bounded on logs with unbounded
+    variety.
+    """
+
+    def __init__(
+        self,
+        depth: int = 4,
+        similarity: float = 0.4,
+        max_children: int = 100,
+        max_clusters: int = 1000,
+        max_tokens: int = 64,
+    ):
+        self.depth = max(depth, 3)
+        self.similarity = similarity
+        self.max_children = max_children
+        self.max_clusters = max_clusters
+        self.max_tokens = max_tokens
+        self.lines = 0
+        self._root: Dict = {}
+        self._clusters: List[LogCluster] = []
+
+    def __len__(self) -> int:
+        return len(self._clusters)
+
+    def add(self, line: str, pin: bool = False) -> Optional[LogCluster]:
+        """Mine one log line; returns its template, or None for blank lines."""
+        return self.add_tokens(self.tokenize(line), pin)
+
+    def add_tokens(self, tokens: List[str], pin: bool = False) -> Optional[LogCluster]:
+        """``add`` for a line already passed through ``tokenize``."""
+        if not tokens:
+            return None
+        self.lines += 1
+
+        leaf = self._leaf(tokens, create=True)
+        cluster = self._best_match(leaf, tokens)
+        if cluster is None:
+            cluster = LogCluster(tokens)
+            cluster.pinned = pin
+            leaf.append(cluster)
+            self._clusters.append(cluster)
+            if len(self._clusters) > self.max_clusters:
+                self._prune()
+        else:
+            cluster.count += 1
+            cluster.pinned = cluster.pinned or pin
+            template = cluster.tokens
+            for i, token in enumerate(tokens):
+                if template[i] != token and template[i] != WILDCARD:
+                    template[i] = WILDCARD
+        return cluster
+
+    def consume(self, lines: Iterable[str]) -> "TemplateMiner":
+        for line in lines:
+            self.add(line)
+        return self
+
+    def templates(self, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        """``(template, count)`` pairs, most frequent first."""
+        ranked = sorted(self._clusters, key=lambda c: -c.count)
+        return [(c.template, c.count) for c in ranked[:limit]]
+
+    def tokenize(self, line: str) -> List[str]:
+        return mask_tokens(line.split()[: self.max_tokens])
+
+    # ---------- Internal ----------
+
+    def _leaf(self, tokens: List[str], create: bool) -> Optional[list]:
+        node = self._root.get(len(tokens))
+        if node is None:
+            if not create:
+                return None
+            node = self._root[len(tokens)] = {}
+
+        path = tokens[: self.depth - 2]
+        for i, token in enumerate(path):
+            last = i == len(path) - 1
+            child = node.get(token)
+            if child is None:
+                child = node.get(WILDCARD) if len(node) >= self.max_children else None
+                if child is None:
+                    if not create:
+                        return None
+                    key = token if len(node) < self.max_children else WILDCARD
+                    child = node[key] = [] if last else {}
+            node = child
+        return node
+
+    def _best_match(self, leaf: list, tokens: List[str]) -> Optional[LogCluster]:
+        best, best_score, best_params = None, -1.0, -1
+        for cluster in leaf:
+            same = params = 0
+            for template_token, token in zip(cluster.tokens, tokens):
+                if template_token == WILDCARD:
+                    params += 1
+                elif template_token == token:
+                    same += 1
+            score = same / len(tokens)
+            if score > best_score or (score == best_score and params > best_params):
+                best, best_score, best_params = cluster, score, params
+        return best if best is not None and best_score >= self.similarity else None
+
+    def _prune(self):
+        self._clusters.sort(key=lambda c: (not c.pinned, -c.count))
+        del self._clusters[self.max_clusters // 2:]
+        self._root = {}
+        for cluster in self._clusters:
+            self._leaf(cluster.tokens, create=True).append(cluster)
+
+
+def trie_pattern(keywords: Iterable[str]) -> str:
+    """
+    Regex matching the longest of ``keywords`` at a position, with the
+    alternatives folded into a trie so each position costs one walk.
+    """
+    trie: Dict[str, Dict] = {}
+    for kw in keywords:
+        node = trie
+        for ch in kw:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict[str, Dict]) -> str:
+        branches = [re.escape(ch) + build(node[ch]) for ch in sorted(node) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            return ("(?:" + body + ")?") if len(branches) == 1 else body + "?"
+        return body
+
+    return build(trie) or "(?!)"
+
+
+_CAMEL_HUMP = re.compile(r"[a-z](?=[A-Z])")
+
+
+class KeywordMatcher:
+    """
+    Rule keyword matcher over raw log lines, one regex pass per line
+    plus a scan for camel-case humps.
+
+    A keyword must start a word: after a character that is not a letter or
+    digit, or at a camel-case hump (``ReadTimeout``). Keywords ending in a
+    digit must not be followed by one either, so ``500`` does not match
+    ``5001``. Numeric keywords additionally skip the fields of timestamps
+    and versions (``12:00:500``, ``1.500.2``), and ``oom`` never matches
+    ``room``.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        keywords = {kw.lower() for kw in keywords if kw}
+        trie = trie_pattern(keywords)
+        # Both run on the lowered line. Zero-width, so overlapping keywords
+        # at later positions still match.
+        self._word_start = re.compile(r"(?<![a-z0-9])(?=(" + trie + "))")
+        self._keyword = re.compile(trie)
+        self._prefixes = {
+            kw: [p for p in sorted(keywords, key=len) if kw.startswith(p)]
+            for kw in keywords
+        }
+
+    def find(self, text: str) -> FrozenSet[str]:
+        """Keywords occurring in ``text`` at word boundaries."""
+        lowered = text.lower()
+        starts = [(m.start(), m.group(1)) for m in self._word_start.finditer(lowered)]
+        # Humps are invisible once lowered, so they are located on the raw line
+        for hump in _CAMEL_HUMP.finditer(text):
+            match = self._keyword.match(lowered, hump.end())
+            if match:
+                starts.append((match.start(), match.group()))
+
+        found = set()
+        for start, longest in starts:
+            for kw in self._prefixes[longest]:
+                end = start + len(kw)
+                if kw[0].isdigit() and self._in_number(text, start, end):
+                    continue
+                if not (kw[-1].isdigit() and text[end:end + 1].isdigit()):
+                    found.add(kw)
+        return frozenset(found)
+
+    @staticmethod
+    def _in_number(text: str, start: int, end: int) -> bool:
+        """Whether ``text[start:end]`` is one field of a dotted/colon number."""
+        before = text[max(start - 2, 0):start]
+        after = text[end:end + 2]
+        return (
+            len(before) == 2 and before[1] in ".:," and before[0].isdigit()
+        ) or (
+            len(after) == 2 and after[0] in ".:," and after[1].isdigit()
+        )
@@ -10,13 +10,19 @@ Falls back to mock logic if ML libraries unavailable.
 """
 
 import random
+import re
 import hashlib
+import heapq
 import math
-from typing import List, Dict, Any, Optional
+import threading
+from typing import List, Dict, Any, Callable, Iterable, Optional, Set, Tuple, Union
+
+from app.ai.clustering import CategoryModelStore, FALLBACK_CATEGORY, model_text
+from app.ai.drain import trie_pattern
+from app.ai.logstream import LogDigest, decode_chunks, iter_log_lines
 
 try:
-    from sklearn.feature_extraction.text import TfidfVectorizer
-    from sklearn.cluster import KMeans
+    from scipy.sparse import csr_matrix
     import numpy as np
 
     ML_AVAILABLE = True
@@ -24,6 +30,9 @@ except ImportError:
     ML_AVAILABLE = False
 
 
+# Bump whenever rules or scoring change so cached analyses are not reused
+ENGINE_VERSION = "3"
+
 # ---------- Category keyword mappings ----------
 CATEGORY_KEYWORDS = {
     "Authentication / Security": [
@@ -65,9 +74,386 @@ COMPLEXITY_THRESHOLDS = {
     (85, 101): "Extreme",
 }
 
+COMPLEX_KEYWORDS = [
+    "memory", "leak", "crash", "infinite", "loop", "deadlock",
+    "race condition", "concurrent", "heap", "oom", "segfault",
+]
+
+USER_IMPACT_KEYWORDS = ["user", "customer", "client", "login", "payment", "checkout"]
+
+URGENCY_KEYWORDS = ["critical", "urgent", "crash", "down", "block", "broken"]
+
+ERROR_PATTERNS = {
+    "TypeError": ["typeerror", "cannot read propert", "undefined is not"],
+    "401 Unauthorized": ["401", "unauthorized", "authentication failed"],
+    "500 Server Error": ["500", "internal server error"],
+    "Infinite Redirect": ["redirect", "loop", "infinite"],
+    "JWT Expiration": ["jwt", "token expired", "refresh token"],
+    "Webhook Failure": ["webhook", "callback fail"],
+    "Data Parsing": ["parse", "json", "deserializ"],
+    "OOM Crash": ["oom", "out of memory", "heap limit"],
+    "Buffer Retention": ["buffer", "stream", "unclosed"],
+    "Worker Dying": ["worker", "process exit", "signal"],
+    "Timeout": ["timeout", "timed out", "deadline"],
+    "Connection Error": ["connection refused", "econnrefused", "network"],
+}
+
+LOG_INSIGHT_RULES = [
+    ("redirect", "Detected redirect loop pattern in log output."),
+    ("401", "Authentication failure (401) detected — check token lifecycle."),
+    ("500", "Server error (500) detected — check server-side exception handlers."),
+    ("undefined", "Accessing undefined value — missing null check or data validation."),
+    ("timeout", "Timeout detected — check service connectivity and retry logic."),
+    ("heap", "Heap-related issue — possible memory leak or large allocation."),
+    ("oom", "Out of memory condition — investigate buffer/stream management."),
+    ("touppercase", "Calling method on potentially undefined value — add type guard."),
+    ("fatal error", "Fatal error detected — process stability at risk."),
+    ("mark-compacts", "V8 mark-compacts failing near heap limit — severe memory pressure."),
+]
+
+
+def _all_rule_keywords() -> Set[str]:
+    keywords = set(COMPLEX_KEYWORDS) | set(USER_IMPACT_KEYWORDS) | set(URGENCY_KEYWORDS)
+    for group in CATEGORY_KEYWORDS.values():
+        keywords.update(group)
+    for group in ERROR_PATTERNS.values():
+        keywords.update(group)
+    keywords.update(kw for kw, _ in LOG_INSIGHT_RULES)
+    return keywords
+
+
+class KeywordIndex:
+    """
+    Single-pass substring matcher over every keyword rule table.
+
+    The keywords are compiled into one trie-shaped regex so each start
+    position is tested against all rules at once. A match at a position is
+    always the longest keyword starting there; every shorter keyword starting
+    at the same position is a prefix of it, so hits are expanded through a
+    precomputed prefix table. Advancing one character past each match start
+    keeps overlapping keywords, which makes the hit set identical to running
+    ``kw in text`` for every keyword.
+    """
+
+    def __init__(self, keywords: Set[str]):
+        keywords = {kw for kw in keywords if kw}
+        self.keywords = frozenset(keywords)
+        self.max_len = max((len(kw) for kw in keywords), default=0)
+        self._pattern = re.compile(trie_pattern(keywords))
+        self._prefixes = {
+            kw: [p for p in sorted(keywords, key=len) if kw.startswith(p)]
+            for kw in keywords
+        }
+
+    def scan(self, text: str, region: Tuple[int, int] = (0, 0)) -> Tuple[Set[str], Set[str]]:
+        """
+        Find every keyword occurring in ``text``.
+
+        Returns ``(hits, region_hits)`` where ``region_hits`` only holds the
+        keywords that occur entirely inside ``text[region[0]:region[1]]``.
+        """
+        hits: Set[str] = set()
+        region_hits: Set[str] = set()
+        lo, hi = region
+        search = self._pattern.search
+        prefixes = self._prefixes
+
+        match = search(text)
+        while match:
+            start = match.start()
+            for kw in prefixes[match.group()]:
+                hits.add(kw)
+                if lo <= start and start + len(kw) <= hi:
+                    region_hits.add(kw)
+            match = search(text, start + 1)
+        return hits, region_hits
+
+    def junction(self, left: str, right: str) -> Set[str]:
+        """Keywords that may only occur across the seam of ``left + right``."""
+        if not self.max_len:
+            return set()
+        reach = self.max_len - 1
+        tail = left[max(0, len(left) - reach):]
+        return self.scan(tail + right[:reach])[0]
+
+
+# ---------- Deterministic jitter ----------
+# Score "noise" is derived from a stable hash instead of a global RNG, so the
+# same (seed, bug, developer) always gets the same jitter in every process.
+
+_MASK64 = (1 << 64) - 1
+
+
+def _stable_hash(*parts: str) -> int:
+    """64-bit hash of ``parts`` that is stable across processes and runs."""
+    data = "\x1f".join(parts).encode("utf-8", "surrogatepass")
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+def _mix64(x: int) -> int:
+    """SplitMix64 finalizer — spreads ``x`` over all 64 bits."""
+    x = (x + 0x9E3779B97F4A7C15) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+def _unit(x: int) -> float:
+    """Map a 64-bit integer to [0, 1)."""
+    return (x >> 11) / float(1 << 53)
+
+
+def _mix64_array(x):
+    """Vectorized ``_mix64`` over a ``uint64`` array (wraps like the masks)."""
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _round1(values):
+    """
+    Vectorized ``round(x, 1)``.
+
+    ``np.round`` scales by ten before rounding, so values sitting next to a
+    half step can land on the other side of it; those few are re-rounded
+    with Python's correctly-rounded ``round`` to keep rankings identical.
+    """
+    rounded = np.round(values, 1)
+    frac = values * 10 - np.floor(values * 10)
+    for i in np.flatnonzero(np.abs(frac - 0.5) < 1e-6):
+        rounded[i] = round(float(values[i]), 1)
+    return rounded
+
+
+class DeveloperIndex:
+    """
+    Precomputed developer features for vectorized matching.
+
+    Skills are mapped to integer ids and held as a sparse developer x skill
+    matrix, with ``success_rate`` and ``bugs_resolved`` in NumPy arrays, so a
+    bug is scored against every developer with one matrix-vector product.
+    Rows are keyed by developer id and kept in insertion order; ``upsert`` and
+    ``remove`` apply single-developer changes without a rebuild, and the CSR
+    matrix is re-materialized lazily on the next score after a change.
+
+    Callers that learn about changed developers without their new values can
+    ``mark_dirty`` them and ``refresh`` reloads just those rows.
+
+    The index is shared by request handlers and job workers: ``lock`` is held
+    by every read and write, and callers hold it across ``score`` and
+    ``record`` so the rows they look up are the rows that were scored.
+    """
+
+    def __init__(self):
+        self.built = False
+        self.lock = threading.RLock()
+        # Separate, so marking users dirty never waits on a refresh
+        self._dirty_lock = threading.Lock()
+        self._dirty: Set[str] = set()
+        self._reset()
+
+    def _reset(self):
+        self._records: List[Optional[Dict[str, Any]]] = []
+        self._rows: Dict[str, int] = {}
+        self._row_skills: List[List[int]] = []
+        self._vocab: Dict[str, int] = {}
+        self._matrix = None
+        if ML_AVAILABLE:
+            self._success_rate = np.zeros(64)
+            self._bugs_resolved = np.zeros(64)
+            self._id_hash = np.zeros(64, dtype=np.uint64)
+            self._active = np.zeros(64, dtype=bool)
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self._rows)
+
+    def refresh(
+        self,
+        load_all: Callable[[], Iterable[Dict[str, Any]]],
+        load_changed: Callable[[Set[str]], List[Dict[str, Any]]],
+    ):
+        """
+        Build the index from ``load_all()`` on first use; afterwards reload
+        the dirty developers, dropping those ``load_changed(ids)`` omits.
+        """
+        with self.lock:
+            if not self.built:
+                self.take_dirty()
+                self.rebuild(load_all())
+                return
+            dirty = self.take_dirty()
+            if not dirty:
+                return
+            records = load_changed(dirty)
+            for dev in records:
+                self.upsert(dev)
+            for dev_id in dirty - {dev["id"] for dev in records}:
+                self.remove(dev_id)
+
+    def rebuild(self, developers: Iterable[Dict[str, Any]]):
+        """Replace the index contents with ``developers``."""
+        with self.lock:
+            self._reset()
+            for dev in developers:
+                self.upsert(dev)
+            self.built = True
+
+    def upsert(self, dev: Dict[str, Any]):
+        """Insert a developer or refresh the row of an existing one."""
+        with self.lock:
+            self._upsert(dev)
+
+    def _upsert(self, dev: Dict[str, Any]):
+        row = self._rows.get(dev["id"])
+        if row is None:
+            row = len(self._records)
+            self._rows[dev["id"]] = row
+            self._records.append(None)
+            self._row_skills.append([])
+            if ML_AVAILABLE and row >= len(self._active):
+                grow = len(self._active)
+                self._success_rate = np.concatenate([self._success_rate, np.zeros(grow)])
+                self._bugs_resolved = np.concatenate([self._bugs_resolved, np.zeros(grow)])
+                self._id_hash = np.concatenate([self._id_hash, np.zeros(grow, dtype=np.uint64)])
+                self._active = np.concatenate([self._active, np.zeros(grow, dtype=bool)])
+
+        success_rate = dev.get("success_rate", 50.0)
+        self._records[row] = dev
+        self._row_skills[row] = sorted(
+            {
+                self._vocab.setdefault(skill, len(self._vocab))
+                for skill in (s.lower() for s in (dev.get("skills") or []))
+            }
+        )
+        if ML_AVAILABLE:
+            self._success_rate[row] = success_rate or 0.0
+            self._bugs_resolved[row] = dev.get("bugs_resolved", 0) or 0
+            self._id_hash[row] = _stable_hash(dev["id"])
+            self._active[row] = True
+        self._matrix = None
+
+    def remove(self, dev_id: str):
+        """Drop a developer; its row is tombstoned rather than compacted."""
+        with self.lock:
+            row = self._rows.pop(dev_id, None)
+            if row is None:
+                return
+            self._records[row] = None
+            self._row_skills[row] = []
+            if ML_AVAILABLE:
+                self._active[row] = False
+            self._matrix = None
+
+    def mark_dirty(self, dev_id: str):
+        with self._dirty_lock:
+            self._dirty.add(dev_id)
+
+    def take_dirty(self) -> Set[str]:
+        with self._dirty_lock:
+            dirty, self._dirty = self._dirty, set()
+        return dirty
+
+    def invalidate(self):
+        """Force a full rebuild on next use."""
+        with self.lock, self._dirty_lock:
+            self._dirty = set()
+            self.built = False
+
+    def records(self) -> List[Dict[str, Any]]:
+        """Live developer records in row order."""
+        with self.lock:
+            return [r for r in self._records if r is not None]
+
+    def skill_matrix(self):
+        """CSR developer x skill matrix (built lazily after changes)."""
+        with self.lock:
+            return self._skill_matrix()
+
+    def _skill_matrix(self):
+        if self._matrix is None:
+            n_rows = len(self._records)
+            lengths = np.fromiter((len(s) for s in self._row_skills), dtype=np.int64, count=n_rows)
+            indptr = np.zeros(n_rows + 1, dtype=np.int64)
+            np.cumsum(lengths, out=indptr[1:])
+            indices = np.fromiter(
+                (col for cols in self._row_skills for col in cols),
+                dtype=np.int64,
+                count=int(indptr[-1]),
+            )
+            self._matrix = csr_matrix(
+                (np.ones(len(indices)), indices, indptr),
+                shape=(n_rows, max(len(self._vocab), 1)),
+            )
+        return self._matrix
+
+    def id_hashes(self):
+        """``_stable_hash(developer id)`` per row, as a ``uint64`` array."""
+        with self.lock:
+            return self._id_hash[: len(self._records)]
+
+    def score(self, bug_tags: List[str], variation) -> Tuple[Any, Any]:
+        """
+        Score every live developer against ``bug_tags``.
+
+        ``variation(n)`` supplies the per-row jitter. Returns the live row
+        numbers and their rounded scores.
+        """
+        with self.lock:
+            n_rows = len(self._records)
+            bug_tags_lower = [t.lower() for t in bug_tags]
+            query = np.zeros(max(len(self._vocab), 1))
+            for tag in set(bug_tags_lower):
+                col = self._vocab.get(tag)
+                if col is not None:
+                    query[col] = 1.0
+
+            overlap = self._skill_matrix() @ query
+            skill_score = overlap / max(len(bug_tags_lower), 1) * 60
+            reputation_score = self._success_rate[:n_rows] / 100.0 * 25
+            experience_score = np.minimum(self._bugs_resolved[:n_rows] / 50.0, 1.0) * 10
+            total = skill_score + reputation_score + experience_score + variation(n_rows)
+            rows = np.flatnonzero(self._active[:n_rows])
+            return rows, _round1(np.clip(total[rows], 0, 100))
+
+    def record(self, row: int) -> Dict[str, Any]:
+        with self.lock:
+            return self._records[row]
+
 
 class AIEngine:
-    """Core AI engine for bug analysis and developer matching."""
+    """
+    Core AI engine for bug analysis and developer matching.
+
+    With ``deterministic`` (the default) the simulated noise in match scores
+    and popularity is derived from a hash of ``seed`` and the bug/developer,
+    so identical inputs always produce identical results. Otherwise it comes
+    from the global RNG.
+
+    Bugs the keyword rules cannot categorize are assigned the category of
+    their TF-IDF cluster when a model has been trained to
+    ``category_model_path`` (see ``app.ai.clustering``).
+    """
+
+    version = ENGINE_VERSION
+
+    def __init__(
+        self,
+        deterministic: bool = True,
+        seed: str = "",
+        category_model_path: str = "",
+    ):
+        self.keyword_index = KeywordIndex(_all_rule_keywords())
+        self.deterministic = deterministic
+        self.seed = seed
+        self.category_models = CategoryModelStore(category_model_path)
+
+    @property
+    def model_version(self) -> str:
+        """Identifies the loaded category model ("" when there is none)."""
+        self.category_models.get()
+        return self.category_models.version
 
     def analyze(
         self,
@@ -76,26 +462,52 @@ class AIEngine:
         logs: str = "",
         tags: List[str] = None,
         severity: str = "Medium",
+        log_digest: Optional[Dict[str, Any]] = None,
+        model_category: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Full AI analysis of a bug."""
+        """
+        Full AI analysis of a bug.
+
+        Logs are mined into templates (``LogDigest``) and rule keywords are
+        matched against each raw log line; title, description and tags are
+        scanned as text. For logs ingested as a stream, ``log_digest``
+        (``LogDigest.to_dict``) stands in for the full log text and ``logs``
+        is only its excerpt. ``model_category`` is a category already
+        predicted by the category model (``analyze_many`` batches those).
+        """
         tags = tags or []
-        full_text = f"{title} {description} {logs} {' '.join(tags)}".lower()
+        head = f"{title} {description} ".lower()
+        tags_lower = " ".join(tags).lower()
+        if log_digest is None:
+            log_digest = self.digest_log_text(logs).to_dict()
+
+        # Single keyword pass over the text, shared by every scorer below
+        full_text = f"{head} {tags_lower}"
+        hits, _ = self.keyword_index.scan(full_text)
+        log_hits = log_digest["hits"]
+        hits |= set(log_hits)
+        logs_chars, has_logs = log_digest["chars"], log_digest["hasContent"]
+        text_chars = len(full_text) + logs_chars
 
         # 1. Categorize
-        category = self._categorize(full_text, tags)
+        category = self._categorize(
+            hits | self.keyword_index.junction(full_text, f" {tags_lower}")
+        )
+        if category == FALLBACK_CATEGORY:
+            category = model_category or self._model_category(title, description, tags)
 
         # 2. Score complexity
-        complexity_score = self._compute_complexity(full_text, severity, logs)
+        complexity_score = self._compute_complexity(text_chars, hits, severity, logs_chars)
         complexity = self._score_to_complexity(complexity_score)
 
         # 3. Estimate bounty
         estimated_bounty = self._estimate_bounty(complexity_score, severity)
 
         # 4. Confidence score
-        confidence = self._compute_confidence(full_text, logs)
+        confidence = self._compute_confidence(text_chars, logs_chars)
 
         # 5. Impact scores
-        impact = self._compute_impact(full_text, severity, tags)
+        impact = self._compute_impact(hits, severity, title, description)
 
         # 6. Priority score
         priority = self._compute_priority(complexity_score, severity, impact)
@@ -104,10 +516,10 @@ class AIEngine:
         summary = self._generate_summary(title, category, complexity, severity)
 
         # 8. Error clusters
-        error_clusters = self._extract_error_clusters(full_text, logs)
+        error_clusters = self._extract_error_clusters(hits, log_hits)
 
         # 9. Log insights
-        log_insights = self._extract_log_insights(logs)
+        log_insights = self._extract_log_insights(has_logs, log_hits)
 
         return {
             "category": category,
@@ -122,24 +534,165 @@ class AIEngine:
             "log_insights": log_insights,
         }
 
+    def analyze_many(self, records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Analyze a batch of bugs.
+
+        Each record carries the keyword arguments of ``analyze`` (title,
+        description, logs, tags, severity); results come back in input order.
+        """
+        records = list(records)
+        model = self.category_models.get()
+        if model is None:
+            return [self.analyze(**record) for record in records]
+
+        # Model categories for the whole batch with one sparse transform
+        categories = model.predict([
+            model_text(r["title"], r["description"], r.get("tags")) for r in records
+        ])
+        return [
+            self.analyze(**record, model_category=category)
+            for record, category in zip(records, categories)
+        ]
+
+    def keyword_category(self, title: str, description: str, tags: List[str] = None) -> str:
+        """Keyword-rule category of the bug text alone (category model labels)."""
+        hits, _ = self.keyword_index.scan(model_text(title, description, tags).lower())
+        return self._categorize(hits)
+
+    def digest_log(
+        self, chunks: Iterable[bytes], excerpt_chars: int = 16 * 1024
+    ) -> LogDigest:
+        """Stream a log's raw byte chunks into a bounded ``LogDigest``."""
+        return LogDigest(self.keyword_index.keywords, excerpt_chars).consume(
+            iter_log_lines(decode_chunks(chunks))
+        )
+
+    def digest_log_text(self, logs: str) -> LogDigest:
+        """``digest_log`` for a log already held in memory."""
+        return LogDigest(self.keyword_index.keywords, max(len(logs), 1)).consume(
+            iter_log_lines([logs])
+        )
+
+    def log_insights(self, log_digest: Dict[str, Any]) -> List[str]:
+        """Log insights for a digested log (``LogDigest.to_dict``)."""
+        return self._extract_log_insights(log_digest["hasContent"], log_digest["hits"])
+
     def match_developers(
         self,
         bug_tags: List[str],
         bug_severity: str,
+        developers: Union[List[Dict[str, Any]], DeveloperIndex],
+        limit: Optional[int] = None,
+        min_score: Optional[float] = None,
+        bug_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Match developers to bug based on skills, reputation, and random variation.
+
+        ``developers`` is either a list of developer dicts or a prebuilt
+        ``DeveloperIndex``. In deterministic mode the variation is keyed on
+        ``bug_id`` (or, without one, on the tags and severity). Only
+        developers scoring at least ``min_score`` are considered, and only
+        the best ``limit`` of them are ranked and returned.
+
+        With ML libraries available the scores are computed in one vectorized
+        pass and selected with ``argpartition``; otherwise a heap keeps the
+        top ``limit`` while scoring in Python.
+        """
+        if not ML_AVAILABLE:
+            if isinstance(developers, DeveloperIndex):
+                developers = developers.records()
+            return self._match_developers_loop(
+                bug_tags, developers, limit, min_score,
+                self._bug_key(bug_id, bug_tags, bug_severity),
+            )
+
+        if not isinstance(developers, DeveloperIndex):
+            index = DeveloperIndex()
+            index.rebuild(developers)
+            developers = index
+        # The index may be refreshed concurrently: score and look up one version
+        with developers.lock:
+            return self._match_index(bug_tags, bug_severity, developers, limit, min_score, bug_id)
+
+    def _match_index(
+        self,
+        bug_tags: List[str],
+        bug_severity: str,
+        developers: DeveloperIndex,
+        limit: Optional[int],
+        min_score: Optional[float],
+        bug_id: Optional[str],
+    ) -> List[Dict[str, Any]]:
+        if not len(developers):
+            return []
+
+        if self.deterministic:
+            bug_hash = np.uint64(
+                _stable_hash(self.seed, self._bug_key(bug_id, bug_tags, bug_severity))
+            )
+
+            def variation(n):
+                mixed = _mix64_array(developers.id_hashes() ^ bug_hash)
+                return -5 + 10 * ((mixed >> np.uint64(11)).astype(np.float64) / float(1 << 53))
+        else:
+            def variation(n):
+                return np.random.uniform(-5, 5, n)
+
+        rows, scores = developers.score(bug_tags, variation)
+        if min_score is not None:
+            keep = scores >= min_score
+            rows, scores = rows[keep], scores[keep]
+        if limit is not None and limit < len(rows):
+            # Keep every score above the k-th best, then fill the remaining
+            # slots with the earliest ties so ordering matches a stable sort.
+            kth = scores[np.argpartition(-scores, limit - 1)[limit - 1]]
+            above = np.flatnonzero(scores > kth)
+            tied = np.flatnonzero(scores == kth)[: limit - len(above)]
+            keep = np.concatenate([above, tied])
+            rows, scores = rows[keep], scores[keep]
+
+        order = np.lexsort((rows, -scores))
+        return [
+            self._developer_match(developers.record(int(rows[i])), float(scores[i]))
+            for i in order
+        ]
+
+    @staticmethod
+    def _developer_match(dev: Dict[str, Any], score: float) -> Dict[str, Any]:
+        return {
+            "id": dev["id"],
+            "name": dev["name"],
+            "skills": dev.get("skills", []),
+            "successRate": dev.get("success_rate", 0),
+            "bugsResolved": dev.get("bugs_resolved", 0),
+            "avatarUrl": dev.get("avatar_url"),
+            "matchScore": round(score, 1),
+        }
+
+    def _match_developers_loop(
+        self,
+        bug_tags: List[str],
         developers: List[Dict[str, Any]],
+        limit: Optional[int] = None,
+        min_score: Optional[float] = None,
+        bug_key: str = "",
     ) -> List[Dict[str, Any]]:
-        """Match developers to bug based on skills, reputation, and random variation."""
+        """Pure-Python scoring used when NumPy/SciPy are unavailable."""
         if not developers:
             return []
 
         matches = []
+        bug_tags_lower = [t.lower() for t in bug_tags]
+        bug_tag_set = set(bug_tags_lower)
+        max_possible = max(len(bug_tags_lower), 1)
+        bug_hash = _stable_hash(self.seed, bug_key)
         for dev in developers:
-            skills = [s.lower() for s in (dev.get("skills") or [])]
-            bug_tags_lower = [t.lower() for t in bug_tags]
+            skills = {s.lower() for s in (dev.get("skills") or [])}
 
             # Skill overlap
-            overlap = len(set(skills) & set(bug_tags_lower))
-            max_possible = max(len(bug_tags_lower), 1)
+            overlap = len(skills & bug_tag_set)
             skill_score = (overlap / max_possible) * 60  # up to 60%
 
             # Reputation weighting (success_rate contributes up to 25%)
@@ -151,59 +704,63 @@ class AIEngine:
             experience_score = min(resolved / 50.0, 1.0) * 10
 
             # Random variation (±5%)
-            variation = random.uniform(-5, 5)
+            if self.deterministic:
+                variation = -5 + 10 * _unit(_mix64(_stable_hash(dev["id"]) ^ bug_hash))
+            else:
+                variation = random.uniform(-5, 5)
 
             total = max(0, min(100, skill_score + reputation_score + experience_score + variation))
+            match = self._developer_match(dev, total)
+            if min_score is None or match["matchScore"] >= min_score:
+                matches.append(match)
 
-            matches.append(
-                {
-                    "id": dev["id"],
-                    "name": dev["name"],
-                    "skills": dev.get("skills", []),
-                    "successRate": dev.get("success_rate", 0),
-                    "bugsResolved": dev.get("bugs_resolved", 0),
-                    "avatarUrl": dev.get("avatar_url"),
-                    "matchScore": round(total, 1),
-                }
-            )
-
-        # Sort by match score descending
+        # Sort by match score descending; a bounded heap when only the top few are wanted
+        if limit is not None and limit < len(matches):
+            return heapq.nlargest(limit, matches, key=lambda x: x["matchScore"])
         matches.sort(key=lambda x: x["matchScore"], reverse=True)
         return matches
 
     # ---------- Private helpers ----------
 
-    def _categorize(self, text: str, tags: List[str]) -> str:
+    @staticmethod
+    def _bug_key(bug_id: Optional[str], bug_tags: List[str], bug_severity: str) -> str:
+        if bug_id is not None:
+            return bug_id
+        return "\x1f".join([bug_severity, *sorted(t.lower() for t in bug_tags)])
+
+    def _model_category(self, title: str, description: str, tags: List[str]) -> str:
+        model = self.category_models.get()
+        if model is None:
+            return FALLBACK_CATEGORY
+        return model.predict([model_text(title, description, tags)])[0]
+
+    def _categorize(self, hits: Set[str]) -> str:
         """Match text + tags to category using keyword overlap."""
         best_category = "General Bug"
         best_score = 0
 
-        combined = f"{text} {' '.join(tags)}".lower()
-
         for category, keywords in CATEGORY_KEYWORDS.items():
-            score = sum(1 for kw in keywords if kw in combined)
+            score = sum(1 for kw in keywords if kw in hits)
             if score > best_score:
                 best_score = score
                 best_category = category
 
         return best_category
 
-    def _compute_complexity(self, text: str, severity: str, logs: str) -> float:
+    def _compute_complexity(
+        self, text_chars: int, hits: Set[str], severity: str, logs_chars: int
+    ) -> float:
         """Heuristic complexity score (0–100)."""
         base = SEVERITY_WEIGHTS.get(severity, 0.5) * 40
 
         # Text length contributes to complexity
-        text_factor = min(len(text) / 500, 1.0) * 20
+        text_factor = min(text_chars / 500, 1.0) * 20
 
         # Log presence and length
-        log_factor = min(len(logs) / 200, 1.0) * 15 if logs else 0
+        log_factor = min(logs_chars / 200, 1.0) * 15 if logs_chars else 0
 
         # Keyword density
-        complex_keywords = [
-            "memory", "leak", "crash", "infinite", "loop", "deadlock",
-            "race condition", "concurrent", "heap", "oom", "segfault",
-        ]
-        keyword_hits = sum(1 for kw in complex_keywords if kw in text.lower())
+        keyword_hits = sum(1 for kw in COMPLEX_KEYWORDS if kw in hits)
         keyword_factor = min(keyword_hits * 5, 25)
 
         return min(100, base + text_factor + log_factor + keyword_factor)
@@ -223,30 +780,35 @@ class AIEngine:
         # Round to nearest 25
         return round(bounty / 25) * 25
 
-    def _compute_confidence(self, text: str, logs: str) -> float:
+    def _compute_confidence(self, text_chars: int, logs_chars: int) -> float:
         """Higher confidence with more data."""
-        text_score = min(len(text) / 300, 1.0) * 50
-        log_score = min(len(logs) / 100, 1.0) * 30 if logs else 0
+        text_score = min(text_chars / 300, 1.0) * 50
+        log_score = min(logs_chars / 100, 1.0) * 30 if logs_chars else 0
         base = 20  # baseline confidence
         return round(min(100, base + text_score + log_score), 1)
 
-    def _compute_impact(self, text: str, severity: str, tags: List[str]) -> Dict[str, float]:
+    def _compute_impact(
+        self, hits: Set[str], severity: str, title: str = "", description: str = ""
+    ) -> Dict[str, float]:
         sev_weight = SEVERITY_WEIGHTS.get(severity, 0.5)
-        user_keywords = ["user", "customer", "client", "login", "payment", "checkout"]
-        user_hits = sum(1 for kw in user_keywords if kw in text.lower())
+        user_hits = sum(1 for kw in USER_IMPACT_KEYWORDS if kw in hits)
         user_impact = min(100, sev_weight * 60 + user_hits * 15)
 
-        urgency_keywords = ["critical", "urgent", "crash", "down", "block", "broken"]
-        urgency_hits = sum(1 for kw in urgency_keywords if kw in text.lower())
+        urgency_hits = sum(1 for kw in URGENCY_KEYWORDS if kw in hits)
         urgency = min(100, sev_weight * 50 + urgency_hits * 20)
 
         return {
             "userImpact": round(user_impact),
             "severity": round(sev_weight * 100),
             "urgency": round(urgency),
-            "popularity": round(random.uniform(30, 80)),  # simulated
+            "popularity": self._popularity(title, description),  # simulated
         }
 
+    def _popularity(self, title: str, description: str) -> int:
+        if self.deterministic:
+            return round(30 + 50 * _unit(_mix64(_stable_hash(self.seed, title, description))))
+        return round(random.uniform(30, 80))
+
     def _compute_priority(
         self, complexity: float, severity: str, impact: Dict[str, float]
     ) -> float:
@@ -265,54 +827,33 @@ class AIEngine:
             f"addressing the root cause identified in the error patterns."
         )
 
-    def _extract_error_clusters(self, text: str, logs: str) -> List[str]:
-        """Extract error pattern clusters from text and logs."""
-        clusters = []
-        error_patterns = {
-            "TypeError": ["typeerror", "cannot read propert", "undefined is not"],
-            "401 Unauthorized": ["401", "unauthorized", "authentication failed"],
-            "500 Server Error": ["500", "internal server error"],
-            "Infinite Redirect": ["redirect", "loop", "infinite"],
-            "JWT Expiration": ["jwt", "token expired", "refresh token"],
-            "Webhook Failure": ["webhook", "callback fail"],
-            "Data Parsing": ["parse", "json", "deserializ"],
-            "OOM Crash": ["oom", "out of memory", "heap limit"],
-            "Buffer Retention": ["buffer", "stream", "unclosed"],
-            "Worker Dying": ["worker", "process exit", "signal"],
-            "Timeout": ["timeout", "timed out", "deadline"],
-            "Connection Error": ["connection refused", "econnrefused", "network"],
-        }
+    def _extract_error_clusters(self, hits: Set[str], log_hits: List[str]) -> List[str]:
+        """
+        Extract error pattern clusters from text and logs.
 
-        combined = f"{text} {logs}".lower()
-        for cluster_name, patterns in error_patterns.items():
-            if any(p in combined for p in patterns):
-                clusters.append(cluster_name)
+        Clusters seen in the logs come first, ordered by how many log lines
+        mention them; clusters only mentioned in the text follow.
+        """
+        rank = {kw: i for i, kw in enumerate(log_hits)}
+        clusters = []
+        for cluster_name, patterns in ERROR_PATTERNS.items():
+            matched = [p for p in patterns if p in hits]
+            if matched:
+                clusters.append((min(rank.get(p, len(rank)) for p in matched), cluster_name))
 
-        return clusters or ["Uncategorized Error"]
+        clusters.sort(key=lambda c: c[0])
+        return [name for _, name in clusters] or ["Uncategorized Error"]
 
-    def _extract_log_insights(self, logs: str) -> List[str]:
-        """Extract actionable insights from logs."""
-        if not logs or not logs.strip():
+    def _extract_log_insights(self, has_logs: bool, log_hits: List[str]) -> List[str]:
+        """Extract actionable insights from logs, most frequent keyword first."""
+        if not has_logs:
             return ["No log data provided for analysis."]
 
-        insights = []
-        log_lower = logs.lower()
-
-        insight_rules = [
-            ("redirect", "Detected redirect loop pattern in log output."),
-            ("401", "Authentication failure (401) detected — check token lifecycle."),
-            ("500", "Server error (500) detected — check server-side exception handlers."),
-            ("undefined", "Accessing undefined value — missing null check or data validation."),
-            ("timeout", "Timeout detected — check service connectivity and retry logic."),
-            ("heap", "Heap-related issue — possible memory leak or large allocation."),
-            ("oom", "Out of memory condition — investigate buffer/stream management."),
-            ("touppercase", "Calling method on potentially undefined value — add type guard."),
-            ("fatal error", "Fatal error detected — process stability at risk."),
-            ("mark-compacts", "V8 mark-compacts failing near heap limit — severe memory pressure."),
+        rank = {kw: i for i, kw in enumerate(log_hits)}
+        insights = sorted(
+            ((rank[keyword], insight) for keyword, insight in LOG_INSIGHT_RULES if keyword in rank),
+            key=lambda i: i[0],
+        )
+        return [insight for _, insight in insights] or [
+            "Log data present but no specific patterns matched."
         ]
-
-        for keyword, insight in insight_rules:
-            if keyword in log_lower:
-                insights.append(insight)
-
-        return insights or ["Log data present but no specific patterns matched."]
@@ -0,0 +1,122 @@
+"""
+Process-pool executor for CPU-bound AI analysis.
+
+``AIEngine.analyze`` is pure-Python work; running it on the event loop stalls
+every other request in the worker. Analyses are shipped to a pool of worker
+processes instead, each holding its own ``AIEngine``. The number of analyses
+queued or running is bounded: past ``max_pending`` new submissions are
+rejected with ``AnalysisQueueFull`` so callers can shed load (HTTP 503)
+instead of queueing without limit.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from app.ai.engine import AIEngine
+
+# Per-process engine, created on first use inside each pool worker
+_worker_engine: Optional[AIEngine] = None
+_worker_engine_options: Dict[str, Any] = {}
+
+
+def _init_worker(engine_options: Dict[str, Any]):
+    global _worker_engine_options
+    _worker_engine_options = engine_options
+
+
+def _engine() -> AIEngine:
+    global _worker_engine
+    if _worker_engine is None:
+        _worker_engine = AIEngine(**_worker_engine_options)
+    return _worker_engine
+
+
+def _analyze(record: Dict[str, Any]) -> Dict[str, Any]:
+    return _engine().analyze(**record)
+
+
+def _analyze_many(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return _engine().analyze_many(records)
+
+
+class AnalysisQueueFull(Exception):
+    """Raised when the executor already has ``max_pending`` analyses in flight."""
+
+
+class AnalysisExecutor:
+    """Bounded, lazily started process pool for ``AIEngine`` analyses."""
+
+    def __init__(
+        self,
+        workers: int = 0,
+        max_pending: int = 64,
+        engine_options: Optional[Dict[str, Any]] = None,
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        # ``AIEngine`` keyword arguments for the worker-side engines
+        self.engine_options = engine_options or {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn: forking a process that already runs event loops and
+                # driver threads is unsafe
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.engine_options,),
+                )
+            return self._pool
+
+    def _acquire(self, enforce_limit: bool = True):
+        with self._lock:
+            if enforce_limit and self._pending >= self.max_pending:
+                raise AnalysisQueueFull(
+                    f"{self._pending} analyses already pending (limit {self.max_pending})"
+                )
+            self._pending += 1
+
+    def _release(self):
+        with self._lock:
+            self._pending -= 1
+
+    async def analyze(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Run ``AIEngine.analyze(**record)`` in a worker process."""
+        self._acquire()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_pool(), _analyze, record)
+        finally:
+            self._release()
+
+    def analyze_many(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Blocking batch variant for callers already off the event loop.
+
+        Batches wait rather than being rejected — a stream that is half
+        written cannot fail cleanly — but still count towards ``pending``.
+        """
+        self._acquire(enforce_limit=False)
+        try:
+            return self._get_pool().submit(_analyze_many, records).result()
+        finally:
+            self._release()
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
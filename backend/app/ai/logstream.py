@@ -0,0 +1,171 @@
+"""
+Incremental log analysis for logs too large to hold in memory.
+
+Uploaded logs arrive as byte chunks and flow through a generator pipeline:
+
+    decode_chunks -> iter_log_lines -> LogDigest.consume
+
+Only a bounded window is ever resident — the current chunk, one batch of
+lines, and the head/tail excerpt — so peak memory does not depend on the
+size of the log. The resulting digest (sizes, mined templates, keyword hits,
+excerpt) is what ``AIEngine.analyze`` needs in place of the full text.
+"""
+
+import codecs
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from app.ai.drain import KeywordMatcher, TemplateMiner
+
+# Lines longer than this are split; no rule keyword comes close to it
+MAX_LINE_CHARS = 8192
+
+# Lines are appended to the excerpt in batches of roughly this size
+EXCERPT_BATCH_CHARS = 256 * 1024
+
+# Templates kept in a digest for display; keyword hits are counted per line
+DIGEST_TEMPLATES = 20
+
+
+def decode_chunks(chunks: Iterable[bytes], encoding: str = "utf-8") -> Iterator[str]:
+    """Decode byte chunks, keeping multi-byte characters split across chunks intact."""
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    for chunk in chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def iter_log_lines(chunks: Iterable[str], max_line_chars: int = MAX_LINE_CHARS) -> Iterator[str]:
+    """Split text chunks into lines (without terminators), capping line length."""
+    pending = ""
+    for chunk in chunks:
+        pending += chunk
+        lines = pending.split("\n")
+        pending = lines.pop()
+        for line in lines:
+            if len(line) <= max_line_chars and not line.endswith("\r"):
+                yield line
+            else:
+                yield from _cap(line, max_line_chars)
+        while len(pending) > max_line_chars:
+            yield pending[:max_line_chars]
+            pending = pending[max_line_chars:]
+    if pending:
+        yield from _cap(pending, max_line_chars)
+
+
+def _cap(line: str, max_line_chars: int) -> Iterator[str]:
+    if line.endswith("\r"):
+        line = line[:-1]
+    for start in range(0, max(len(line), 1), max_line_chars):
+        yield line[start:start + max_line_chars]
+
+
+class LogDigest:
+    """
+    Streaming summary of a log: size, templates, keyword hits and a
+    head/tail excerpt.
+
+    Every line goes through a ``TemplateMiner``. Rule ``keywords`` are
+    matched against the raw line (up to ``MAX_LINE_CHARS``) in one
+    trie-regex pass whose cost does not depend on the number of rules;
+    masking and the token cap only apply to template mining. Keyword line
+    counts are kept apart from the templates, so pruning cannot drop them.
+    """
+
+    def __init__(
+        self,
+        keywords: Iterable[str],
+        excerpt_chars: int = 16 * 1024,
+        miner: Optional[TemplateMiner] = None,
+    ):
+        self.keywords = frozenset(keywords)
+        self.excerpt_chars = excerpt_chars
+        self.miner = miner or TemplateMiner()
+        self.matcher = KeywordMatcher(self.keywords)
+        self.hit_lines: Dict[str, int] = {}
+        self.chars = 0
+        self.lines = 0
+        self.has_content = False
+        self._head: List[str] = []
+        self._head_chars = 0
+        self._tail = ""
+        self._batch: List[str] = []
+        self._batch_chars = 0
+        self._flushed = False
+
+    def consume(self, lines: Iterable[str]) -> "LogDigest":
+        for line in lines:
+            self.add_line(line)
+        self.flush()
+        return self
+
+    def add_line(self, line: str):
+        if self.lines:
+            self.chars += 1  # the newline joining it to the previous line
+        self.lines += 1
+        self.chars += len(line)
+        found = self.matcher.find(line[:MAX_LINE_CHARS])
+        for keyword in found:
+            self.hit_lines[keyword] = self.hit_lines.get(keyword, 0) + 1
+        if self.miner.add(line, pin=bool(found)) is not None:
+            self.has_content = True
+
+        self._batch.append(line)
+        self._batch_chars += len(line) + 1
+        if self._batch_chars >= EXCERPT_BATCH_CHARS:
+            self.flush()
+
+    def flush(self):
+        """Move the buffered lines into the excerpt."""
+        if not self._batch:
+            return
+        # Batches after the first start with the newline that separates them
+        block = ("\n" if self._flushed else "") + "\n".join(self._batch)
+        self._batch, self._batch_chars = [], 0
+        self._flushed = True
+
+        half = self.excerpt_chars // 2
+        if self._head_chars < half:
+            piece = block[: half - self._head_chars]
+            self._head.append(piece)
+            self._head_chars += len(piece)
+        # A full excerpt's worth of tail, so logs that fit are kept whole
+        self._tail = (self._tail + block)[-self.excerpt_chars:]
+
+    @property
+    def truncated(self) -> bool:
+        return self.chars > self.excerpt_chars
+
+    def excerpt(self) -> str:
+        """The whole log if it fits in ``excerpt_chars``, else its head and tail."""
+        self.flush()
+        if not self.truncated:
+            return self._tail
+        head = "".join(self._head)
+        tail = self._tail[-(self.excerpt_chars - len(head)):]
+        omitted = self.chars - len(head) - len(tail)
+        return f"{head}\n... [{omitted} characters omitted] ...\n{tail}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        JSON-serializable form, stored on the bug as ``log_digest``.
+
+        ``hits`` is ordered by the number of lines containing each keyword,
+        which ``hitLines`` holds.
+        """
+        hits = sorted(self.hit_lines, key=lambda kw: (-self.hit_lines[kw], kw))
+        return {
+            "chars": self.chars,
+            "lines": self.lines,
+            "hasContent": self.has_content,
+            "hits": hits,
+            "hitLines": {kw: self.hit_lines[kw] for kw in hits},
+            "templates": [
+                {"template": template, "count": count}
+                for template, count in self.miner.templates(DIGEST_TEMPLATES)
+            ],
+        }
@@ -0,0 +1,71 @@
+"""
+Offline training of the bug category model.
+
+    python -m app.ai.train [--clusters 16] [--output ./category_model.joblib]
+
+Fits TF-IDF + MiniBatchKMeans over every stored bug, labelling clusters with
+the keyword-rule categories, and writes the model where running engines
+memory-map it from (``AI_CATEGORY_MODEL_PATH``).
+"""
+
+import argparse
+import logging
+from collections import Counter
+from typing import Any, Dict
+
+from sqlalchemy.orm import Session
+
+from app.ai.clustering import CategoryModel, model_text
+from app.ai.engine import AIEngine
+from app.core.config import settings
+from app.models.models import Bug
+
+logger = logging.getLogger("crowdfundfix.ai")
+
+
+def train_category_model(
+    db: Session,
+    path: str,
+    n_clusters: int = 16,
+    batch_size: int = 1000,
+) -> Dict[str, Any]:
+    """Train on every bug in ``db`` and save to ``path``; returns a summary."""
+    engine = AIEngine()
+    texts, labels = [], []
+    columns = (Bug.title, Bug.description, Bug.tags)
+    for title, description, tags in db.query(*columns).yield_per(batch_size):
+        texts.append(model_text(title, description, tags))
+        labels.append(engine.keyword_category(title, description, tags))
+
+    if not texts:
+        raise ValueError("No bugs to train on")
+
+    model = CategoryModel.fit(texts, labels, n_clusters=n_clusters)
+    model.save(path)
+    return {
+        "bugs": len(texts),
+        "clusters": model.kmeans.n_clusters,
+        "clusterLabels": dict(Counter(model.cluster_labels())),
+        "path": path,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1].strip())
+    parser.add_argument("--clusters", type=int, default=settings.AI_CATEGORY_CLUSTERS)
+    parser.add_argument("--output", default=settings.AI_CATEGORY_MODEL_PATH)
+    args = parser.parse_args()
+
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        summary = train_category_model(db, args.output, n_clusters=args.clusters)
+    finally:
+        db.close()
+    logger.info(f"Trained category model: {summary}")
+    print(summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,99 @@
 """AI routes — analysis and developer matching."""
 
+import json
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.schemas.schemas import AIAnalysisRequest, AIAnalysisResponse, DeveloperResponse
-from app.services.ai_service import AIService
+from app.core.config import settings
+from app.core.database import get_async_db, get_db
+from app.schemas.schemas import (
+    AIAnalysisRequest,
+    AIAnalysisResponse,
+    AIBatchAnalysisRequest,
+    AnalysisJobResponse,
+    DeveloperResponse,
+)
+from app.ai.executor import AnalysisQueueFull
+from app.services.ai_service import (
+    AIService,
+    AsyncAIService,
+    analysis_cache,
+    analysis_executor,
+)
+from app.services.job_service import analysis_jobs
 
 router = APIRouter(prefix="/ai", tags=["AI"])
 
-ai_service = AIService()
+ai_service = AIService(executor=analysis_executor)
+async_ai_service = AsyncAIService(ai_service)
 
 
 @router.post("/analyze-bug", response_model=AIAnalysisResponse)
-async def analyze_bug(req: AIAnalysisRequest, db: Session = Depends(get_db)):
-    result = ai_service.analyze_bug(db, req.bugId)
+async def analyze_bug(req: AIAnalysisRequest, db: AsyncSession = Depends(get_async_db)):
+    try:
+        result = await async_ai_service.analyze_bug(db, req.bugId)
+    except AnalysisQueueFull:
+        raise HTTPException(
+            status_code=503,
+            detail="Analysis capacity exhausted, retry shortly",
+            headers={"Retry-After": "1"},
+        )
     if not result:
         raise HTTPException(status_code=404, detail="Bug not found")
     return result
 
 
+@router.post("/analyze-bugs")
+async def analyze_bugs(req: AIBatchAnalysisRequest, db: Session = Depends(get_db)):
+    """Batch analysis, streamed back as NDJSON — one result object per line."""
+
+    def stream():
+        # The request-scoped session is released before streaming starts,
+        # so the generator owns it from here on.
+        try:
+            for result in ai_service.analyze_bugs(db, req.bugIds):
+                yield json.dumps(result) + "\n"
+        finally:
+            db.close()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
 @router.get("/match-developers/{bug_id}", response_model=List[DeveloperResponse])
-async def match_developers(bug_id: str, db: Session = Depends(get_db)):
-    matches = ai_service.match_developers(db, bug_id)
-    if not matches:
-        raise HTTPException(status_code=404, detail="Bug not found or no developers available")
+async def match_developers(
+    bug_id: str,
+    limit: int = Query(settings.AI_MATCH_LIMIT, ge=1, le=100),
+    min_score: float = Query(0.0, ge=0.0, le=100.0),
+    db: AsyncSession = Depends(get_async_db),
+):
+    matches = await async_ai_service.match_developers(
+        db, bug_id, limit=limit, min_score=min_score
+    )
+    if matches is None:
+        raise HTTPException(status_code=404, detail="Bug not found")
     return matches
+
+
+@router.get("/jobs")
+async def job_stats():
+    """Background analysis queue: workers, backlog and jobs per status."""
+    return analysis_jobs.stats()
+
+
+@router.get("/jobs/{bug_id}", response_model=AnalysisJobResponse)
+async def job_status(bug_id: str):
+    """Progress of the background analysis queued when the bug was filed."""
+    job = analysis_jobs.get(bug_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="No analysis job for this bug")
+    return job
+
+
+@router.get("/cache-stats")
+async def cache_stats():
+    """Hit/miss counters and occupancy of the analysis result cache."""
+    return analysis_cache.stats()
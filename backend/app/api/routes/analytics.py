@@ -1,15 +1,78 @@
-"""Analytics routes — dashboard stats."""
+"""Analytics routes — dashboard stats and time series."""
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from datetime import datetime, timedelta, timezone
+from typing import Literal, Optional
 
-from app.core.database import get_db
-from app.schemas.schemas import AnalyticsDashboard
-from app.services.analytics_service import AnalyticsService
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.models.models import BugSeverity, BugStatus
+from app.schemas.schemas import AnalyticsDashboard, TimeseriesResponse
+from app.schemas.serializers import json_response
+from app.services.analytics_service import AsyncAnalyticsService
+from app.services.timeseries_service import INTERVALS, AsyncTimeseriesService
 
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
 
+# Range covered when ``from`` is omitted
+_DEFAULT_BUCKETS = {"hour": 48, "day": 30}
+
+
+def _utc(at: datetime) -> datetime:
+    """Times without an offset are taken as UTC."""
+    return at.replace(tzinfo=timezone.utc) if at.tzinfo is None else at
+
 
 @router.get("/dashboard", response_model=AnalyticsDashboard)
-async def get_dashboard(db: Session = Depends(get_db)):
-    return AnalyticsService.get_dashboard(db)
+async def get_dashboard(db: AsyncSession = Depends(get_async_db)):
+    return json_response(await AsyncAnalyticsService.get_dashboard(db))
+
+
+@router.get("/timeseries", response_model=TimeseriesResponse)
+async def get_timeseries(
+    metric: Literal["bugs_filed", "funding", "status_changes"],
+    interval: Literal["hour", "day"] = "day",
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    severity: Optional[BugSeverity] = None,
+    status: Optional[BugStatus] = None,
+    category: Optional[str] = None,
+    group_by: Optional[Literal["severity", "status", "category"]] = Query(None, alias="groupBy"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Counts (and, for funding, amounts) per hour or day bucket, read from the
+    pre-aggregated rollups.
+
+    ``status_changes`` counts bugs moving into a status; filter it with
+    ``status=Resolved`` for resolution throughput. Times are UTC, ``to`` is
+    exclusive and defaults to now.
+    """
+    end = _utc(end) if end else datetime.now(timezone.utc)
+    start = _utc(start) if start else end - _DEFAULT_BUCKETS[interval] * INTERVALS[interval]
+    if start >= end:
+        raise HTTPException(status_code=400, detail="'from' must be before 'to'")
+    if (end - start) / INTERVALS[interval] > settings.TIMESERIES_MAX_BUCKETS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Range spans more than {settings.TIMESERIES_MAX_BUCKETS} buckets",
+        )
+
+    filters = {
+        dimension: value.value if hasattr(value, "value") else value
+        for dimension, value in (("severity", severity), ("status", status), ("category", category))
+        if value is not None
+    }
+    series = await AsyncTimeseriesService.series(
+        db, metric, interval, start, end, filters=filters, group_by=group_by
+    )
+    return json_response({
+        "metric": metric,
+        "interval": interval,
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "groupBy": group_by,
+        "series": series,
+    })
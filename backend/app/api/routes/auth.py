@@ -1,11 +1,13 @@
 """Auth routes — login, signup, me."""
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 import uuid
 
-from app.core.database import get_db
-from app.core.security import hash_password, verify_password, create_access_token, decode_access_token
+from app.core.database import get_async_db
+from app.core.security import PasswordQueueFull, create_access_token, password_hasher
 from app.models.models import User, UserRole
 from app.schemas.schemas import LoginRequest, SignupRequest, TokenResponse, UserResponse
 from app.dependencies import get_current_user
@@ -13,34 +15,75 @@ from app.dependencies import get_current_user
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 
+def _hashing_busy() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Authentication capacity exhausted, retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.post("/signup", response_model=TokenResponse)
-async def signup(req: SignupRequest, db: Session = Depends(get_db)):
+async def signup(req: SignupRequest, db: AsyncSession = Depends(get_async_db)):
     # Check if email already exists
-    existing = db.query(User).filter(User.email == req.email).first()
+    existing = await db.scalar(select(User.id).where(User.email == req.email))
+    # Hashing takes a while: don't hold a pooled connection meanwhile
+    await db.rollback()
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
 
+    try:
+        hashed_password = await password_hasher.hash(req.password)
+    except PasswordQueueFull:
+        raise _hashing_busy()
+
     user = User(
         id=f"user-{uuid.uuid4().hex[:8]}",
         name=req.name,
         email=req.email,
-        hashed_password=hash_password(req.password),
+        hashed_password=hashed_password,
         role=UserRole(req.role) if req.role in [r.value for r in UserRole] else UserRole.USER,
         avatar_url=f"https://api.dicebear.com/7.x/avataaars/svg?seed={req.name}",
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # Registered concurrently while we were hashing
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Email already registered")
 
     token = create_access_token({"sub": user.id, "email": user.email, "role": user.role.value})
     return TokenResponse(access_token=token)
 
 
 @router.post("/login", response_model=TokenResponse)
-async def login(req: LoginRequest, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == req.email).first()
-    if not user or not verify_password(req.password, user.hashed_password):
+async def login(req: LoginRequest, db: AsyncSession = Depends(get_async_db)):
+    user = (
+        await db.execute(
+            select(User.id, User.email, User.role, User.hashed_password).where(
+                User.email == req.email
+            )
+        )
+    ).first()
+    # Verifying takes a while: don't hold a pooled connection meanwhile
+    await db.rollback()
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    try:
+        valid, new_hash = await password_hasher.verify_and_update(
+            req.password, user.hashed_password
+        )
+    except PasswordQueueFull:
+        raise _hashing_busy()
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    if new_hash:
+        # Stored with an outdated bcrypt cost; upgrade while we have the password
+        await db.execute(
+            update(User).where(User.id == user.id).values(hashed_password=new_hash)
+        )
+        await db.commit()
 
     token = create_access_token({"sub": user.id, "email": user.email, "role": user.role.value})
     return TokenResponse(access_token=token)
@@ -1,48 +1,51 @@
 """Bug routes — CRUD operations."""
 
-from typing import List
+import os
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+import anyio
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, PlainTextResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
-from app.models.models import User
-from app.schemas.schemas import BugCreate, BugResponse, BugStatusUpdate
-from app.services.bug_service import BugService
+from app.core.database import get_async_db
+from app.models.models import User, BugStatus, BugSeverity
+from app.schemas.schemas import (
+    BugCreate,
+    BugCreateResponse,
+    BugResponse,
+    BugListItem,
+    BugSearchResult,
+    BugStatusUpdate,
+    LogUploadResponse,
+    SimilarBug,
+)
+from app.schemas.serializers import bug_dict, bug_fields, json_response, search_hit_dict
+from app.services.bug_service import (
+    AsyncBugService,
+    BUG_FIELD_COLUMNS,
+    DEFAULT_BUG_FIELDS,
+    decode_bug_cursor,
+)
+from app.services.duplicate_service import AsyncDuplicateService
+from app.services.job_service import analysis_jobs
+from app.services.log_service import AsyncLogService, LogService, LogTooLarge
 from app.dependencies import get_current_user
 
 router = APIRouter(prefix="/bugs", tags=["Bugs"])
 
-
-def _bug_to_response(bug) -> BugResponse:
-    return BugResponse(
-        id=bug.id,
-        title=bug.title,
-        description=bug.description,
-        repoLink=bug.repo_link or "",
-        logs=bug.logs or "",
-        tags=bug.tags or [],
-        severity=bug.severity.value if bug.severity else "Medium",
-        expectedBehavior=bug.expected_behavior or "",
-        status=bug.status.value if bug.status else "Open",
-        createdAt=bug.created_at.isoformat() if bug.created_at else "",
-        bounty=bug.bounty or 0.0,
-        fundsRaised=bug.funds_raised or 0.0,
-        contributors=bug.contributors or 0,
-        authorId=bug.author_id,
-        assignedDeveloperId=bug.assigned_developer_id,
-        aiScore=bug.ai_priority_score,
-    )
+log_service = LogService()
 
 
-@router.post("", response_model=BugResponse)
+@router.post("", response_model=BugCreateResponse)
 async def create_bug(
     req: BugCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
-    bug = BugService.create_bug(
-        db=db,
+    bug = await AsyncBugService.create_bug(
+        db,
         title=req.title,
         description=req.description,
         author_id=current_user.id,
@@ -52,31 +55,172 @@ async def create_bug(
         severity=req.severity,
         expected_behavior=req.expectedBehavior or "",
     )
-    return _bug_to_response(bug)
+    duplicates = await AsyncDuplicateService.similar_bugs(db, bug.id, limit=5)
+    job = analysis_jobs.get(bug.id)
+    return json_response({
+        **bug_dict(bug),
+        "possibleDuplicates": duplicates or [],
+        "analysisStatus": job["status"] if job else None,
+    })
+
+
+@router.get("", response_model=List[BugListItem], response_model_exclude_unset=True)
+async def list_bugs(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    status: Optional[BugStatus] = None,
+    severity: Optional[BugSeverity] = None,
+    tag: Optional[str] = None,
+    fields: Optional[str] = Query(
+        None, description="Comma-separated response fields; defaults to all but logs"
+    ),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    List bugs newest first, one page at a time.
+
+    The cursor for the next page is returned in the ``X-Next-Cursor`` header.
+    """
+    selected = [f.strip() for f in fields.split(",") if f.strip()] if fields else DEFAULT_BUG_FIELDS
+    unknown = [f for f in selected if f not in BUG_FIELD_COLUMNS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+
+    position = None
+    if cursor:
+        position = decode_bug_cursor(cursor)
+        if position is None:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    bugs, next_cursor = await AsyncBugService.list_bugs(
+        db,
+        limit=limit,
+        cursor=position,
+        status=status,
+        severity=severity,
+        tag=tag,
+        columns=[BUG_FIELD_COLUMNS[f] for f in selected],
+    )
+    selected = ["id"] + [f for f in dict.fromkeys(selected) if f != "id"]
+    return json_response(
+        [bug_fields(b, selected) for b in bugs],
+        headers={"X-Next-Cursor": next_cursor} if next_cursor else None,
+    )
 
 
-@router.get("", response_model=List[BugResponse])
-async def list_bugs(db: Session = Depends(get_db)):
-    bugs = BugService.get_all_bugs(db)
-    return [_bug_to_response(b) for b in bugs]
+@router.get("/search", response_model=List[BugSearchResult])
+async def search_bugs(
+    q: str = Query(..., min_length=1, max_length=500),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Full-text search over title, tags, description and logs, best match first.
+
+    Each result carries a snippet with matches between ``**``. When more
+    results follow, the next page's offset is in the ``X-Next-Offset`` header.
+    """
+    hits, more = await AsyncBugService.search_bugs(db, q, limit=limit, offset=offset)
+    return json_response(
+        [search_hit_dict(hit) for hit in hits],
+        headers={"X-Next-Offset": str(offset + limit)} if more else None,
+    )
 
 
 @router.get("/{bug_id}", response_model=BugResponse)
-async def get_bug(bug_id: str, db: Session = Depends(get_db)):
-    bug = BugService.get_bug_by_id(db, bug_id)
+async def get_bug(bug_id: str, db: AsyncSession = Depends(get_async_db)):
+    bug = await AsyncBugService.get_bug_by_id(db, bug_id)
     if not bug:
         raise HTTPException(status_code=404, detail="Bug not found")
-    return _bug_to_response(bug)
+    return json_response(bug_dict(bug))
+
+
+@router.get("/{bug_id}/similar", response_model=List[SimilarBug])
+async def similar_bugs(
+    bug_id: str,
+    limit: int = Query(10, ge=1, le=100),
+    threshold: Optional[float] = Query(None, ge=0.0, le=1.0),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Near-duplicates by estimated Jaccard similarity of title, description and logs."""
+    similar = await AsyncDuplicateService.similar_bugs(
+        db, bug_id, threshold=threshold, limit=limit
+    )
+    if similar is None:
+        raise HTTPException(status_code=404, detail="Bug not found")
+    return json_response(similar)
 
 
 @router.patch("/{bug_id}/status", response_model=BugResponse)
 async def update_bug_status(
     bug_id: str,
     req: BugStatusUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    bug = await AsyncBugService.update_bug_status(db, bug_id, req.status)
+    if not bug:
+        raise HTTPException(status_code=404, detail="Bug not found")
+    return json_response(bug_dict(bug))
+
+
+def _blocking_chunks(stream):
+    """Pull an async byte stream from a worker thread, one chunk at a time."""
+    while True:
+        try:
+            yield anyio.from_thread.run(stream.__anext__)
+        except StopAsyncIteration:
+            return
+
+
+@router.put("/{bug_id}/logs", response_model=LogUploadResponse)
+async def upload_bug_logs(
+    bug_id: str,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
-    bug = BugService.update_bug_status(db, bug_id, req.status)
+    """
+    Stream a raw log (any size) as the request body.
+
+    The log is gzipped to disk and analyzed chunk by chunk on a worker
+    thread; the bug keeps a bounded excerpt plus the digest.
+    """
+    if not await AsyncBugService.get_bug_by_id(db, bug_id):
+        raise HTTPException(status_code=404, detail="Bug not found")
+
+    try:
+        ingested = await run_in_threadpool(
+            log_service.ingest, bug_id, _blocking_chunks(request.stream())
+        )
+    except LogTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    if not await AsyncLogService.save_digest(db, bug_id, ingested):
+        raise HTTPException(status_code=404, detail="Bug not found")
+    digest = ingested["digest"]
+    return LogUploadResponse(
+        bugId=bug_id,
+        bytes=digest["bytes"],
+        compressedBytes=digest["compressedBytes"],
+        lines=digest["lines"],
+        excerptChars=len(ingested["excerpt"]),
+        logInsights=digest["insights"],
+    )
+
+
+@router.get("/{bug_id}/logs")
+async def download_bug_logs(bug_id: str, db: AsyncSession = Depends(get_async_db)):
+    """The full stored log (gzip-encoded) or, failing that, the inline logs."""
+    path = log_service.log_path(bug_id)
+    if os.path.exists(path):
+        return FileResponse(
+            path,
+            media_type="text/plain; charset=utf-8",
+            headers={"Content-Encoding": "gzip"},
+        )
+    bug = await AsyncBugService.get_bug_by_id(db, bug_id)
     if not bug:
         raise HTTPException(status_code=404, detail="Bug not found")
-    return _bug_to_response(bug)
+    return PlainTextResponse(bug.logs or "")
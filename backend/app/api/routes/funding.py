@@ -1,47 +1,56 @@
 """Funding routes."""
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from typing import Optional
 
-from app.core.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_async_db
 from app.schemas.schemas import FundingCreate, FundingSummary, FundingResponse
-from app.services.funding_service import FundingService
+from app.schemas.serializers import funding_dict, json_response
+from app.services.funding_service import AsyncFundingService, decode_funding_cursor
 
 router = APIRouter(prefix="/fund", tags=["Funding"])
 
 
 @router.post("/{bug_id}", response_model=FundingResponse)
-async def fund_bug(bug_id: str, req: FundingCreate, db: Session = Depends(get_db)):
-    funding = FundingService.add_funding(
-        db=db,
+async def fund_bug(bug_id: str, req: FundingCreate, db: AsyncSession = Depends(get_async_db)):
+    funding = await AsyncFundingService.add_funding(
+        db,
         bug_id=bug_id,
         contributor_name=req.contributor_name,
         amount=req.amount,
     )
     if not funding:
         raise HTTPException(status_code=404, detail="Bug not found")
-    return FundingResponse(
-        id=funding.id,
-        bug_id=funding.bug_id,
-        contributor_name=funding.contributor_name,
-        amount=funding.amount,
-    )
+    return json_response(funding_dict(funding))
 
 
 @router.get("/{bug_id}", response_model=FundingSummary)
-async def get_funding(bug_id: str, db: Session = Depends(get_db)):
-    result = FundingService.get_fundings_for_bug(db, bug_id)
-    return FundingSummary(
-        bug_id=result["bug_id"],
-        total_funded=result["total_funded"],
-        contributors=result["contributors"],
-        fundings=[
-            FundingResponse(
-                id=f.id,
-                bug_id=f.bug_id,
-                contributor_name=f.contributor_name,
-                amount=f.amount,
-            )
-            for f in result["fundings"]
-        ],
+async def get_funding(
+    bug_id: str,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Pledge totals for a bug and one page of its pledges, newest first.
+
+    The cursor for the next page is returned in the ``X-Next-Cursor`` header.
+    """
+    position = None
+    if cursor:
+        position = decode_funding_cursor(cursor)
+        if position is None:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    result = await AsyncFundingService.get_fundings_for_bug(db, bug_id, limit=limit, cursor=position)
+    return json_response(
+        {
+            "bug_id": result["bug_id"],
+            "total_funded": result["total_funded"],
+            "contributors": result["contributors"],
+            "fundings": [funding_dict(f) for f in result["fundings"]],
+        },
+        headers={"X-Next-Cursor": result["next_cursor"]} if result["next_cursor"] else None,
     )
@@ -0,0 +1,116 @@
+"""
+Caches behind ``get_current_user``.
+
+Every authenticated request used to verify the JWT signature and load the
+user row. Repeat callers now hit two small in-process LRUs instead:
+
+- ``token_cache``: token -> verified claims, each entry expiring with the
+  token's own ``exp``, so a cached token is never honoured past its expiry;
+- ``principal_cache``: user id -> the user's columns (never the password
+  hash), expiring after ``AUTH_USER_CACHE_TTL_SECONDS`` and dropped as soon
+  as a session in this process commits a change to the user. The TTL bounds
+  how long changes committed by other workers stay unseen.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import Base
+from app.models.models import User
+
+
+class TTLCache:
+    """Thread-safe LRU whose entries each carry an absolute expiry time."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # key -> (expires_at as time.time(), value)
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any, expires_at: Optional[float] = None):
+        """Store ``value`` until ``expires_at``, or at most ``ttl_seconds``."""
+        expires_at = min(
+            expires_at if expires_at is not None else float("inf"),
+            time.time() + self.ttl_seconds,
+        )
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Claims are re-verified at least daily even for long-lived tokens
+token_cache = TTLCache(settings.AUTH_TOKEN_CACHE_SIZE, ttl_seconds=24 * 3600)
+principal_cache = TTLCache(
+    settings.AUTH_USER_CACHE_SIZE, ttl_seconds=settings.AUTH_USER_CACHE_TTL_SECONDS
+)
+
+# Columns cached per user; the password hash stays in the database
+_PRINCIPAL_COLUMNS = [c.key for c in User.__table__.columns if c.key != "hashed_password"]
+
+
+def cache_principal(user: User):
+    principal_cache.put(user.id, {c: getattr(user, c) for c in _PRINCIPAL_COLUMNS})
+
+
+def cached_principal(user_id: str) -> Optional[User]:
+    """A fresh, session-less ``User`` built from the cache, or None."""
+    values: Optional[Dict[str, Any]] = principal_cache.get(user_id)
+    return User(**values) if values is not None else None
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_principal_changes(session, flush_context):
+    changed = session.info.setdefault("changed_principal_ids", set())
+    for obj in (*session.dirty, *session.deleted):
+        if isinstance(obj, User):
+            changed.add(obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_principals(session):
+    for user_id in session.info.pop("changed_principal_ids", ()):
+        principal_cache.pop(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_principal_changes(session):
+    session.info.pop("changed_principal_ids", None)
+
+
+@event.listens_for(Base.metadata, "after_create")
+@event.listens_for(Base.metadata, "after_drop")
+def _reset_auth_caches(target, connection, **kw):
+    token_cache.clear()
+    principal_cache.clear()
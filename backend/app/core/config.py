@@ -12,12 +12,107 @@ class Settings(BaseSettings):
 
     # Database — use ./app.db for production safety
     DATABASE_URL: str = "sqlite:///./app.db"
+    # Async driver URL; derived from a SQLite DATABASE_URL when empty
+    # (sqlite -> sqlite+aiosqlite), required for any other database
+    ASYNC_DATABASE_URL: str = ""
 
     # JWT
     SECRET_KEY: str = "crowdfundfix-super-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 24 hours
 
+    # Password hashing — bcrypt cost (hashes of any other cost are upgraded
+    # on the next successful login), run on a thread pool of
+    # PASSWORD_HASH_WORKERS (0 = one per CPU core); past
+    # PASSWORD_HASH_MAX_PENDING queued/running hashes requests get HTTP 503
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 0
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    # Auth caches — verified JWT claims (kept until the token expires) and
+    # user principals (kept AUTH_USER_CACHE_TTL_SECONDS, dropped as soon as the
+    # user changes in this process)
+    AUTH_TOKEN_CACHE_SIZE: int = 4096
+    AUTH_USER_CACHE_SIZE: int = 4096
+    AUTH_USER_CACHE_TTL_SECONDS: int = 60
+
+    # AI batch analysis — bugs loaded, scored and written back per chunk
+    AI_BATCH_CHUNK_SIZE: int = 200
+
+    # AI analysis process pool — 0 workers means one per CPU core; requests
+    # beyond AI_EXECUTOR_MAX_PENDING queued/running analyses get HTTP 503
+    AI_EXECUTOR_WORKERS: int = 0
+    AI_EXECUTOR_MAX_PENDING: int = 64
+
+    # Developer matching — developers returned (and persisted) per bug when
+    # the caller does not ask for a limit, incl. background analysis
+    AI_MATCH_LIMIT: int = 10
+
+    # AI scoring — deterministic mode derives the simulated match/popularity
+    # noise from a hash of AI_SCORING_SEED and the bug/developer ids, so
+    # identical inputs give identical, cacheable results
+    AI_DETERMINISTIC_SCORING: bool = True
+    AI_SCORING_SEED: str = ""
+
+    # AI category model — trained with `python -m app.ai.train`, memory-mapped
+    # by every engine, and partial_fit every AI_CATEGORY_MODEL_UPDATE_BATCH
+    # new bugs (empty path disables it)
+    AI_CATEGORY_MODEL_PATH: str = "./category_model.joblib"
+    AI_CATEGORY_CLUSTERS: int = 16
+    AI_CATEGORY_MODEL_UPDATE_BATCH: int = 32
+
+    # AI analysis cache — results keyed by bug content + engine version.
+    # AI_CACHE_DB_PATH enables a persistent SQLite tier shared by workers.
+    AI_CACHE_MAX_ENTRIES: int = 1024
+    AI_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    AI_CACHE_TTL_SECONDS: int = 3600
+    AI_CACHE_DB_PATH: str = ""
+
+    # Background analysis — new bugs are scored and matched by JOB_WORKERS
+    # threads; failed jobs are retried JOB_MAX_ATTEMPTS times with backoff
+    # doubling from JOB_RETRY_BASE_SECONDS. JOB_QUEUE_DB_PATH makes the queue
+    # durable across restarts; finished jobs are deleted from it after
+    # JOB_RETENTION_SECONDS.
+    AI_ANALYZE_ON_CREATE: bool = True
+    JOB_WORKERS: int = 2
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BASE_SECONDS: float = 1.0
+    JOB_QUEUE_DB_PATH: str = ""
+    JOB_RETENTION_SECONDS: int = 7 * 24 * 3600
+
+    # Streamed log uploads — full logs are gzipped under LOG_STORAGE_DIR; the
+    # bug row keeps an excerpt of at most LOG_EXCERPT_CHARS plus a digest
+    LOG_STORAGE_DIR: str = "./log_storage"
+    LOG_EXCERPT_CHARS: int = 16 * 1024
+    LOG_UPLOAD_MAX_BYTES: int = 2 * 1024 * 1024 * 1024
+    LOG_COMPRESS_LEVEL: int = 6
+
+    # Duplicate detection — MinHash signatures of DUPLICATE_NUM_PERM values
+    # split into DUPLICATE_LSH_BANDS bands; bugs at or above the estimated
+    # Jaccard similarity threshold are reported as possible duplicates
+    DUPLICATE_SIMILARITY_THRESHOLD: float = 0.5
+    DUPLICATE_NUM_PERM: int = 128
+    DUPLICATE_LSH_BANDS: int = 32
+
+    # Funding writes — attempts per pledge when the database reports lock
+    # contention, with jittered exponential backoff from FUNDING_RETRY_BASE_SECONDS
+    FUNDING_WRITE_ATTEMPTS: int = 5
+    FUNDING_RETRY_BASE_SECONDS: float = 0.02
+
+    # Analytics — in-process dashboard totals are fully reloaded this often
+    DASHBOARD_CACHE_TTL_SECONDS: int = 60
+    # Time series — most buckets one /analytics/timeseries request may span
+    TIMESERIES_MAX_BUCKETS: int = 2000
+
+    # HTTP caching — polled read endpoints carry ETags and answer matching
+    # If-None-Match with 304; up to HTTP_CACHE_MAX_ENTRIES / HTTP_CACHE_MAX_BYTES
+    # of responses are replayed from memory. Versions older than
+    # HTTP_CACHE_TTL_SECONDS are re-minted, bounding staleness across workers.
+    HTTP_CACHE_MAX_ENTRIES: int = 512
+    HTTP_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    HTTP_CACHE_TTL_SECONDS: int = 60
+    HTTP_CACHE_MAX_AGE: int = 0
+
     # CORS
     FRONTEND_URL: str = "http://localhost:3000"
 
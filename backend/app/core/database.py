@@ -2,6 +2,7 @@
 
 import os
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 from app.core.config import settings
@@ -22,6 +23,32 @@ engine = create_engine(
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def _async_database_url(url: str) -> str:
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    # Only aiosqlite ships in requirements.txt; other backends name their
+    # async driver explicitly rather than getting one that is not installed
+    raise RuntimeError(
+        "ASYNC_DATABASE_URL must be set for non-SQLite databases, e.g. "
+        "postgresql+asyncpg://... with asyncpg installed"
+    )
+
+
+async_engine = create_async_engine(
+    _async_database_url(settings.DATABASE_URL),
+    echo=settings.DEBUG,
+    pool_pre_ping=True,
+)
+
+# expire_on_commit=False: attributes of committed objects stay readable
+# without an implicit (awaitable) refresh
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 Base = declarative_base()
 
 
@@ -34,6 +61,15 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """Dependency that provides an async database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def create_tables():
-    """Create all tables in the database."""
+    """Create all tables in the database, then apply pending schema migrations."""
+    from app.core.migrations import run_migrations
+
     Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
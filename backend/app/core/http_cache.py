@@ -0,0 +1,282 @@
+"""
+HTTP caching for polled read endpoints.
+
+Every cacheable resource depends on a few version counters — ``bugs`` (any
+bug), ``bug:<id>``, ``funding:<id>``, ``users`` — which the services bump
+after committing a write. A response's strong ETag is derived only from the
+counters and a hash of the path and query string, so each query gets its
+own validator and ``HTTPCacheMiddleware`` can compare it with
+``If-None-Match`` and answer ``304 Not Modified`` before the route, the ORM
+or the serializer run. Full 200 responses are kept in a bounded LRU and
+replayed while their versions hold; bumping a counter evicts the responses
+that depend on it.
+
+Counters are per process. A version older than ``ttl_seconds`` is
+re-minted on its next read, so a worker that never saw a write made by
+another one serves stale validators for at most that long.
+"""
+
+import hashlib
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import Base
+from app.models.models import User
+
+# Route (path below the API prefix) -> version counters its response depends on
+CACHEABLE_ROUTES: List[Tuple["re.Pattern", Callable[["re.Match"], Tuple[str, ...]]]] = [
+    (re.compile(r"^/bugs$"), lambda m: ("bugs",)),
+    (re.compile(r"^/bugs/search$"), lambda m: ("bugs",)),
+    (re.compile(r"^/bugs/(?P<id>[^/]+)$"), lambda m: (f"bug:{m['id']}",)),
+    (re.compile(r"^/fund/(?P<id>[^/]+)$"), lambda m: (f"funding:{m['id']}",)),
+    (re.compile(r"^/analytics/dashboard$"), lambda m: ("bugs", "users")),
+    (re.compile(r"^/analytics/timeseries$"), lambda m: ("bugs",)),
+]
+
+# Response headers never replayed from the cache
+_UNCACHED_HEADERS = {b"date", b"server", b"set-cookie", b"etag", b"cache-control"}
+
+
+class CachedResponse:
+    __slots__ = ("etag", "headers", "body", "deps")
+
+    def __init__(self, etag: str, headers: List[Tuple[bytes, bytes]], body: bytes, deps: Sequence[str]):
+        self.etag = etag
+        self.headers = headers
+        self.body = body
+        self.deps = deps
+
+
+class ResponseCache:
+    """Version counters plus an LRU of responses, bounded by count and bytes."""
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 32 * 1024 * 1024, ttl_seconds: float = 60):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        # Distinguishes this process (and database generation) in every ETag
+        self._epoch = uuid.uuid4().hex[:8]
+        self._versions: Dict[str, Tuple[int, float]] = {}
+        self._counter = 0
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._dependents: Dict[str, Set[str]] = {}
+        self._bytes = 0
+        self.hits = 0
+        self.not_modified = 0
+        self.misses = 0
+
+    # ---------- Versions ----------
+
+    def bump(self, *deps: str):
+        """Mark resources changed; evicts every cached response depending on them."""
+        with self._lock:
+            for dep in deps:
+                self._mint(dep)
+                for key in self._dependents.pop(dep, ()):
+                    self._evict(key)
+
+    def etag(self, deps: Iterable[str], key: str = "") -> str:
+        """Strong ETag of the response cached as ``key`` (path and query)."""
+        digest = hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+        with self._lock:
+            now = time.monotonic()
+            parts = []
+            for dep in deps:
+                version = self._versions.get(dep)
+                if version is None or now - version[1] > self.ttl_seconds:
+                    version = self._mint(dep, now)
+                    for key in self._dependents.pop(dep, ()):
+                        self._evict(key)
+                parts.append(str(version[0]))
+            return f'"{self._epoch}-{digest}-{".".join(parts)}"'
+
+    def _mint(self, dep: str, now: Optional[float] = None) -> Tuple[int, float]:
+        self._counter += 1
+        version = self._versions[dep] = (self._counter, now or time.monotonic())
+        return version
+
+    # ---------- Responses ----------
+
+    def get(self, key: str, etag: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.etag != etag:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, entry: CachedResponse):
+        if len(entry.body) > self.max_bytes:
+            return
+        with self._lock:
+            self._evict(key)
+            self._entries[key] = entry
+            self._bytes += len(entry.body)
+            for dep in entry.deps:
+                self._dependents.setdefault(dep, set()).add(key)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._evict(next(iter(self._entries)))
+
+    def _evict(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry.body)
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "notModified": self.not_modified,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def count_not_modified(self):
+        with self._lock:
+            self.not_modified += 1
+
+
+response_cache = ResponseCache(
+    max_entries=settings.HTTP_CACHE_MAX_ENTRIES,
+    max_bytes=settings.HTTP_CACHE_MAX_BYTES,
+    ttl_seconds=settings.HTTP_CACHE_TTL_SECONDS,
+)
+
+
+# ---------- Write hooks (call after the change is committed) ----------
+
+def bug_changed(*bug_ids: str):
+    response_cache.bump("bugs", *(f"bug:{bug_id}" for bug_id in bug_ids))
+
+
+def funding_changed(bug_id: str):
+    response_cache.bump("bugs", f"bug:{bug_id}", f"funding:{bug_id}")
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_user_changes(session, flush_context):
+    if any(isinstance(obj, User) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info["users_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_user_changes(session):
+    if session.info.pop("users_changed", False):
+        response_cache.bump("users")
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_user_changes(session):
+    session.info.pop("users_changed", None)
+
+
+@event.listens_for(Base.metadata, "after_create")
+@event.listens_for(Base.metadata, "after_drop")
+def _reset_response_cache(target, connection, **kw):
+    response_cache.clear()
+
+
+class HTTPCacheMiddleware:
+    """
+    ASGI middleware serving ``CACHEABLE_ROUTES`` GETs from ``cache``.
+
+    Matching ``If-None-Match`` -> 304; a cached response with the current
+    ETag -> replayed; otherwise the route runs and a 200 is stored.
+    """
+
+    def __init__(self, app, prefix: str = "", cache: Optional[ResponseCache] = None):
+        self.app = app
+        self.prefix = prefix
+        self.cache = cache or response_cache
+        self.cache_control = (
+            f"public, max-age={settings.HTTP_CACHE_MAX_AGE}, must-revalidate".encode()
+        )
+
+    def _deps(self, path: str) -> Optional[Tuple[str, ...]]:
+        if not path.startswith(self.prefix):
+            return None
+        path = path[len(self.prefix):]
+        for pattern, deps in CACHEABLE_ROUTES:
+            match = pattern.match(path)
+            if match:
+                return deps(match)
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            return await self.app(scope, receive, send)
+        deps = self._deps(scope["path"])
+        if deps is None:
+            return await self.app(scope, receive, send)
+
+        key = f"{scope['path']}?{scope.get('query_string', b'').decode('latin-1')}"
+        etag = self.cache.etag(deps, key)
+        validators = [
+            (b"etag", etag.encode()),
+            (b"cache-control", self.cache_control),
+        ]
+        request_headers = dict(scope["headers"])
+        if_none_match = request_headers.get(b"if-none-match", b"").decode("latin-1")
+        if if_none_match and _etag_matches(if_none_match, etag):
+            self.cache.count_not_modified()
+            await send({"type": "http.response.start", "status": 304, "headers": validators})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        cached = self.cache.get(key, etag)
+        if cached is not None:
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": cached.headers + validators,
+            })
+            await send({"type": "http.response.body", "body": cached.body})
+            return
+
+        status = None
+        headers: List[Tuple[bytes, bytes]] = []
+        body = []
+
+        async def capture(message):
+            nonlocal status, headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if status == 200:
+                    headers = [
+                        (k, v) for k, v in message.get("headers", [])
+                        if k.lower() not in _UNCACHED_HEADERS
+                    ]
+                    message = {**message, "headers": headers + validators}
+            elif message["type"] == "http.response.body" and status == 200:
+                body.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    self.cache.put(key, CachedResponse(etag, headers, b"".join(body), deps))
+            await send(message)
+
+        await self.app(scope, receive, capture)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 prescribes for If-None-Match
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
@@ -0,0 +1,115 @@
+"""
+Schema migrations.
+
+``create_all`` only creates missing tables — it never changes a table that
+already exists. Changes to existing tables are listed here as ordered,
+idempotent steps; each one is recorded in ``schema_migrations`` once applied
+so it runs exactly once per database.
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Callable, List, Tuple
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.database import Base
+from app.models.models import create_bug_search
+
+logger = logging.getLogger("crowdfundfix.migrations")
+
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("id", String, primary_key=True),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def _create_indexes(*names: str) -> Callable[[Connection], None]:
+    """Migration step creating model-declared indexes that are missing."""
+
+    def step(conn: Connection):
+        indexes = {
+            index.name: index
+            for table in Base.metadata.sorted_tables
+            for index in table.indexes
+        }
+        for name in names:
+            indexes[name].create(conn, checkfirst=True)
+
+    return step
+
+
+def _add_columns(table_name: str, *names: str) -> Callable[[Connection], None]:
+    """Migration step adding model-declared columns missing from a table."""
+
+    def step(conn: Connection):
+        existing = {c["name"] for c in inspect(conn).get_columns(table_name)}
+        table = Base.metadata.tables[table_name]
+        for name in names:
+            if name in existing:
+                continue
+            ddl_type = table.c[name].type.compile(dialect=conn.dialect)
+            conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {name} {ddl_type}"))
+
+    return step
+
+
+def _developer_match_unique(conn: Connection):
+    """Drop duplicate (bug, developer) matches, then add the unique index.
+
+    Of each duplicate group the highest-scoring row is kept, the lowest id
+    breaking ties; creating the index over duplicates would fail.
+    """
+    conn.execute(
+        text(
+            "DELETE FROM developer_matches WHERE EXISTS ("
+            " SELECT 1 FROM developer_matches AS keep"
+            " WHERE keep.bug_id = developer_matches.bug_id"
+            " AND keep.developer_id = developer_matches.developer_id"
+            " AND (keep.match_score > developer_matches.match_score"
+            " OR (keep.match_score = developer_matches.match_score"
+            " AND keep.id < developer_matches.id)))"
+        )
+    )
+    _create_indexes("uq_developer_matches_bug_developer")(conn)
+
+
+MIGRATIONS: List[Tuple[str, Callable[[Connection], None]]] = [
+    ("0001_developer_match_unique", _developer_match_unique),
+    (
+        "0002_hot_path_indexes",
+        _create_indexes(
+            "ix_bugs_created_at_id",
+            "ix_bugs_status_created_at_id",
+            "ix_bugs_severity_created_at_id",
+            "ix_fundings_bug_id_created_at",
+            "ix_users_role_bugs_resolved",
+        ),
+    ),
+    ("0003_bug_log_digest", _add_columns("bugs", "log_digest")),
+    ("0004_bug_search", create_bug_search),
+    ("0005_funding_totals_index", _create_indexes("ix_fundings_bug_id_amount")),
+    ("0006_bug_category", _add_columns("bugs", "category")),
+]
+
+
+def run_migrations(engine: Engine):
+    """Apply every migration not yet recorded in ``schema_migrations``."""
+    schema_migrations.create(engine, checkfirst=True)
+    with engine.begin() as conn:
+        applied = {row.id for row in conn.execute(schema_migrations.select())}
+
+    for migration_id, step in MIGRATIONS:
+        if migration_id in applied:
+            continue
+        with engine.begin() as conn:
+            step(conn)
+            conn.execute(
+                schema_migrations.insert().values(
+                    id=migration_id, applied_at=datetime.now(timezone.utc)
+                )
+            )
+        logger.info(f"Applied migration {migration_id}")
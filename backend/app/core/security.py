@@ -1,14 +1,33 @@
 """Security utilities — JWT tokens and password hashing."""
 
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Callable, Optional, Tuple, TypeVar
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
+from app.core.auth_cache import token_cache
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+T = TypeVar("T")
+
+
+def crypt_context(rounds: int) -> CryptContext:
+    """bcrypt at ``rounds``; hashes of any other cost report ``needs_update``."""
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
+
+
+pwd_context = crypt_context(settings.PASSWORD_BCRYPT_ROUNDS)
 
 
 def hash_password(password: str) -> str:
@@ -19,6 +38,82 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """Verify; on success also return a re-hash if the stored cost is outdated."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+class PasswordQueueFull(Exception):
+    """Raised when ``max_pending`` hashes are already queued or running."""
+
+
+class PasswordHasher:
+    """
+    Bounded thread pool for bcrypt.
+
+    A bcrypt call takes hundreds of milliseconds of CPU; on the event loop
+    it stalls every other request. bcrypt releases the GIL, so a thread per
+    core hashes in parallel while the loop keeps serving. Submissions past
+    ``max_pending`` are rejected with ``PasswordQueueFull`` so a login flood
+    sheds load (HTTP 503) instead of queueing without limit.
+    """
+
+    def __init__(self, workers: int = 0, max_pending: int = 64):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="password-hash"
+                )
+            return self._pool
+
+    async def _run(self, fn: Callable[..., T], *args) -> T:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise PasswordQueueFull(
+                    f"{self._pending} password hashes already pending (limit {self.max_pending})"
+                )
+            self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_pool(), fn, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify_and_update(
+        self, password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        return await self._run(verify_and_update_password, password, hashed_password)
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + (
@@ -29,10 +124,20 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 
 def decode_access_token(token: str) -> Optional[dict]:
+    """
+    Verified claims, or None for an invalid or expired token.
+
+    Verified tokens are cached until their ``exp``; the returned dict is
+    shared between callers and must not be modified.
+    """
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
-        return payload
     except JWTError:
         return None
+    token_cache.put(token, payload, expires_at=payload.get("exp"))
+    return payload
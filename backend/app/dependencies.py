@@ -5,9 +5,10 @@ from functools import wraps
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.auth_cache import cache_principal, cached_principal
+from app.core.database import get_async_db
 from app.core.security import decode_access_token
 from app.models.models import User
 
@@ -16,9 +17,15 @@ security_scheme = HTTPBearer(auto_error=False)
 
 async def get_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security_scheme),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> User:
-    """Extract and validate the current user from JWT token."""
+    """
+    Extract and validate the current user from JWT token.
+
+    Repeat callers are served from the token and principal caches, without
+    signature verification or a database round trip. Cached users are
+    session-less copies: read them, don't modify them.
+    """
     if not credentials:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -39,12 +46,16 @@ async def get_current_user(
             detail="Invalid token payload",
         )
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = cached_principal(user_id)
+    if user is not None:
+        return user
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
         )
+    cache_principal(user)
     return user
 
 
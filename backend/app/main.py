@@ -19,7 +19,12 @@ logging.basicConfig(
     format="%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
 )
 from app.core.database import create_tables, SessionLocal
+from app.core.http_cache import HTTPCacheMiddleware
 from app.utils.seed import seed_database
+from app.core.security import password_hasher
+from app.services.ai_service import analysis_executor
+from app.services.duplicate_service import DuplicateService
+from app.services.job_service import analysis_jobs
 
 # Import route modules
 from app.api.routes import auth, bugs, ai, funding, verification, analytics
@@ -33,11 +38,16 @@ async def lifespan(app: FastAPI):
     db = SessionLocal()
     try:
         seed_database(db)
+        DuplicateService.ensure_index(db)
     finally:
         db.close()
+    analysis_jobs.start()
     print(f"🚀 {settings.APP_NAME} v{settings.APP_VERSION} is running!")
     yield
     # Shutdown
+    analysis_jobs.shutdown()
+    analysis_executor.shutdown()
+    password_hasher.shutdown()
     print("👋 Shutting down...")
 
 
@@ -48,6 +58,13 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# ---------- Routes ----------
+API_PREFIX = "/api/v1"
+
+# ---------- HTTP caching ----------
+# Added before CORS so replayed and 304 responses still get CORS headers
+app.add_middleware(HTTPCacheMiddleware, prefix=API_PREFIX)
+
 # ---------- CORS ----------
 # Collect allowed origins: local dev + Vercel + env override
 _allowed_origins = [
@@ -66,9 +83,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# ---------- Routes ----------
-API_PREFIX = "/api/v1"
-
 app.include_router(auth.router, prefix=API_PREFIX)
 app.include_router(bugs.router, prefix=API_PREFIX)
 app.include_router(ai.router, prefix=API_PREFIX)
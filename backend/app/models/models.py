@@ -14,7 +14,10 @@ from sqlalchemy import (
     ForeignKey,
     JSON,
     Boolean,
+    Index,
+    event,
 )
+from sqlalchemy.engine import Connection
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
@@ -53,6 +56,10 @@ class FixSubmissionStatus(str, enum.Enum):
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Developer listings: WHERE role = ? ORDER BY bugs_resolved DESC
+        Index("ix_users_role_bugs_resolved", "role", "bugs_resolved"),
+    )
 
     id = Column(String, primary_key=True, index=True)
     name = Column(String, nullable=False)
@@ -72,12 +79,22 @@ class User(Base):
 
 class Bug(Base):
     __tablename__ = "bugs"
+    __table_args__ = (
+        # Newest-first listing and keyset pagination on (created_at, id),
+        # optionally filtered by status or severity
+        Index("ix_bugs_created_at_id", "created_at", "id"),
+        Index("ix_bugs_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_bugs_severity_created_at_id", "severity", "created_at", "id"),
+    )
 
     id = Column(String, primary_key=True, index=True)
     title = Column(String, nullable=False)
     description = Column(Text, nullable=False)
     repo_link = Column(String, nullable=True)
     logs = Column(Text, nullable=True)
+    # Streamed uploads keep only an excerpt in ``logs``; this holds the
+    # digest of the full log (see app.ai.logstream.LogDigest)
+    log_digest = Column(JSON, nullable=True)
     tags = Column(JSON, default=list)
     severity = Column(Enum(BugSeverity), default=BugSeverity.MEDIUM)
     expected_behavior = Column(Text, nullable=True)
@@ -90,6 +107,8 @@ class Bug(Base):
     contributors = Column(Integer, default=0)
     author_id = Column(String, ForeignKey("users.id"), nullable=False)
     assigned_developer_id = Column(String, ForeignKey("users.id"), nullable=True)
+    # Keyword-rule category at filing time; the analytics rollup dimension
+    category = Column(String, nullable=True)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
 
     # Relationships
@@ -99,8 +118,69 @@ class Bug(Base):
     fix_submissions = relationship("FixSubmission", back_populates="bug")
 
 
+# ---------- Full-text search ----------
+# SQLite: an external-content FTS5 table over bugs (the text is not stored
+# twice) kept in sync by triggers; updates that leave the searched columns
+# alone do not touch it. FTS rows share the bug's rowid, so run
+# create_bug_search again (it rebuilds the index) after a VACUUM.
+# Postgres: a GIN index over a weighted tsvector expression, which search
+# queries repeat verbatim so the planner uses it.
+
+BUG_TSVECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(CAST(tags AS TEXT), '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C') || "
+    "setweight(to_tsvector('english', coalesce(logs, '')), 'D')"
+)
+
+_FTS_COLUMNS = "title, tags, description, logs"
+_FTS_NEW = "new.rowid, new.title, new.tags, new.description, new.logs"
+_FTS_OLD = "'delete', old.rowid, old.title, old.tags, old.description, old.logs"
+
+_BUG_SEARCH_DDL = {
+    "sqlite": [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS bugs_fts USING fts5("
+        f"{_FTS_COLUMNS}, content='bugs', content_rowid='rowid')",
+        f"CREATE TRIGGER IF NOT EXISTS bugs_fts_insert AFTER INSERT ON bugs BEGIN "
+        f"INSERT INTO bugs_fts(rowid, {_FTS_COLUMNS}) VALUES ({_FTS_NEW}); END",
+        f"CREATE TRIGGER IF NOT EXISTS bugs_fts_delete AFTER DELETE ON bugs BEGIN "
+        f"INSERT INTO bugs_fts(bugs_fts, rowid, {_FTS_COLUMNS}) VALUES ({_FTS_OLD}); END",
+        f"CREATE TRIGGER IF NOT EXISTS bugs_fts_update AFTER UPDATE OF {_FTS_COLUMNS} ON bugs BEGIN "
+        f"INSERT INTO bugs_fts(bugs_fts, rowid, {_FTS_COLUMNS}) VALUES ({_FTS_OLD}); "
+        f"INSERT INTO bugs_fts(rowid, {_FTS_COLUMNS}) VALUES ({_FTS_NEW}); END",
+        "INSERT INTO bugs_fts(bugs_fts) VALUES ('rebuild')",
+    ],
+    "postgresql": [
+        f"CREATE INDEX IF NOT EXISTS ix_bugs_search ON bugs USING gin (({BUG_TSVECTOR}))",
+    ],
+}
+
+
+def create_bug_search(conn: Connection):
+    """Create (and fill) the bug full-text index for this database, if supported."""
+    for statement in _BUG_SEARCH_DDL.get(conn.dialect.name, []):
+        conn.exec_driver_sql(statement)
+
+
+@event.listens_for(Bug.__table__, "after_create")
+def _create_bug_search(target, connection, **kw):
+    create_bug_search(connection)
+
+
+@event.listens_for(Bug.__table__, "before_drop")
+def _drop_bug_search(target, connection, **kw):
+    # Triggers and the Postgres index go with the table; the FTS table does not
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql("DROP TABLE IF EXISTS bugs_fts")
+
+
 class Funding(Base):
     __tablename__ = "fundings"
+    __table_args__ = (
+        Index("ix_fundings_bug_id_created_at", "bug_id", "created_at"),
+        # Covers per-bug SUM/COUNT without touching the table
+        Index("ix_fundings_bug_id_amount", "bug_id", "amount"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     bug_id = Column(String, ForeignKey("bugs.id"), nullable=False)
@@ -113,6 +193,10 @@ class Funding(Base):
 
 class DeveloperMatch(Base):
     __tablename__ = "developer_matches"
+    __table_args__ = (
+        # One row per (bug, developer) pair; lets re-matching upsert scores
+        Index("uq_developer_matches_bug_developer", "bug_id", "developer_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     bug_id = Column(String, ForeignKey("bugs.id"), nullable=False)
@@ -136,3 +220,30 @@ class FixSubmission(Base):
 
     bug = relationship("Bug", back_populates="fix_submissions")
     developer = relationship("User")
+
+
+class AnalyticsRollup(Base):
+    """
+    Pre-bucketed counts and sums for the time-series charts: one row per
+    metric, bucket and (severity, status, category).
+    """
+
+    __tablename__ = "analytics_rollups"
+    __table_args__ = (
+        # Upsert target, and range scans on (metric, granularity, bucket_start)
+        Index(
+            "uq_analytics_rollups_bucket",
+            "metric", "granularity", "bucket_start", "severity", "status", "category",
+            unique=True,
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    metric = Column(String, nullable=False)
+    granularity = Column(String, nullable=False)  # "hour" or "day"
+    bucket_start = Column(DateTime, nullable=False)
+    severity = Column(String, nullable=False)
+    status = Column(String, nullable=False)
+    category = Column(String, nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+    total = Column(Float, nullable=False, default=0.0)
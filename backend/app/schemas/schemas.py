@@ -74,6 +74,62 @@ class BugResponse(BaseModel):
         from_attributes = True
 
 
+class BugSearchResult(BaseModel):
+    id: str
+    title: str
+    status: str
+    severity: str
+    tags: List[str] = []
+    createdAt: str
+    score: float
+    snippet: str = ""
+
+
+class SimilarBug(BaseModel):
+    id: str
+    title: str
+    status: str
+    similarity: float
+
+
+class BugCreateResponse(BugResponse):
+    """A newly filed bug plus already-filed bugs it looks like."""
+
+    possibleDuplicates: List[SimilarBug] = []
+    # Status of the background AI analysis job, if one was queued
+    analysisStatus: Optional[str] = None
+
+
+class BugListItem(BaseModel):
+    """A bug in list responses; only the projected fields are present."""
+
+    id: str
+    title: Optional[str] = None
+    description: Optional[str] = None
+    repoLink: Optional[str] = None
+    logs: Optional[str] = None
+    tags: Optional[List[str]] = None
+    severity: Optional[str] = None
+    expectedBehavior: Optional[str] = None
+    status: Optional[str] = None
+    createdAt: Optional[str] = None
+    bounty: Optional[float] = None
+    fundsRaised: Optional[float] = None
+    contributors: Optional[int] = None
+    authorId: Optional[str] = None
+    assignedDeveloperId: Optional[str] = None
+    aiScore: Optional[float] = None
+
+
+class LogUploadResponse(BaseModel):
+    bugId: str
+    bytes: int
+    compressedBytes: int
+    lines: int
+    excerptChars: int
+    logInsights: List[str] = []
+
+
 # ---------- Developer ----------
 
 class DeveloperResponse(BaseModel):
@@ -114,6 +170,23 @@ class AIAnalysisRequest(BaseModel):
     bugId: str
 
 
+class AnalysisJobResponse(BaseModel):
+    bugId: str
+    status: str
+    stage: Optional[str] = None
+    progress: float = 0.0
+    attempts: int = 0
+    error: Optional[str] = None
+    result: Optional[dict] = None
+    enqueuedAt: float
+    startedAt: Optional[float] = None
+    finishedAt: Optional[float] = None
+
+
+class AIBatchAnalysisRequest(BaseModel):
+    bugIds: Optional[List[str]] = None  # None re-scores every bug
+
+
 # ---------- Funding ----------
 
 class FundingCreate(BaseModel):
@@ -167,3 +240,24 @@ class AnalyticsDashboard(BaseModel):
     bugsByStatus: dict
     topDevelopers: List[DeveloperResponse] = []
     recentBugs: List[BugResponse] = []
+
+
+class TimeseriesPoint(BaseModel):
+    bucketStart: str
+    count: int
+    total: float
+
+
+class TimeseriesSeries(BaseModel):
+    # Value of the ``groupBy`` dimension; None for an ungrouped series
+    group: Optional[str] = None
+    points: List[TimeseriesPoint] = []
+
+
+class TimeseriesResponse(BaseModel):
+    metric: str
+    interval: str
+    start: str = Field(alias="from")
+    end: str = Field(alias="to")
+    groupBy: Optional[str] = None
+    series: List[TimeseriesSeries] = []
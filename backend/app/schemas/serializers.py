@@ -0,0 +1,105 @@
+"""
+Response serializers for trusted server-side data.
+
+Read endpoints build plain dicts straight from ORM objects or Core result
+rows (anything with the column attributes) and return them as
+``ORJSONResponse``: one pass per object and no pydantic re-validation of
+output the server produced itself. The pydantic models in ``schemas`` stay on
+the routes as ``response_model`` and still document the shapes.
+"""
+
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+from fastapi.responses import ORJSONResponse
+
+# Response field name -> Bug column, for field projection on list queries
+BUG_FIELD_COLUMNS = {
+    "id": "id",
+    "title": "title",
+    "description": "description",
+    "repoLink": "repo_link",
+    "logs": "logs",
+    "tags": "tags",
+    "severity": "severity",
+    "expectedBehavior": "expected_behavior",
+    "status": "status",
+    "createdAt": "created_at",
+    "bounty": "bounty",
+    "fundsRaised": "funds_raised",
+    "contributors": "contributors",
+    "authorId": "author_id",
+    "assignedDeveloperId": "assigned_developer_id",
+    "aiScore": "ai_priority_score",
+}
+
+# Response field -> value, so list projections touch only the loaded columns
+BUG_FIELD_GETTERS = {
+    "id": lambda b: b.id,
+    "title": lambda b: b.title,
+    "description": lambda b: b.description,
+    "repoLink": lambda b: b.repo_link or "",
+    "logs": lambda b: b.logs or "",
+    "tags": lambda b: b.tags or [],
+    "severity": lambda b: b.severity.value if b.severity else "Medium",
+    "expectedBehavior": lambda b: b.expected_behavior or "",
+    "status": lambda b: b.status.value if b.status else "Open",
+    "createdAt": lambda b: b.created_at.isoformat() if b.created_at else "",
+    "bounty": lambda b: b.bounty or 0.0,
+    "fundsRaised": lambda b: b.funds_raised or 0.0,
+    "contributors": lambda b: b.contributors or 0,
+    "authorId": lambda b: b.author_id,
+    "assignedDeveloperId": lambda b: b.assigned_developer_id,
+    "aiScore": lambda b: b.ai_priority_score,
+}
+
+
+def bug_fields(bug, fields: Iterable[str]) -> Dict[str, Any]:
+    """The given response fields of ``bug``."""
+    return {f: BUG_FIELD_GETTERS[f](bug) for f in fields}
+
+
+def bug_dict(bug) -> Dict[str, Any]:
+    """``BugResponse`` as a dict."""
+    return {f: getter(bug) for f, getter in BUG_FIELD_GETTERS.items()}
+
+
+def developer_dict(user, match_score: Optional[float] = None) -> Dict[str, Any]:
+    """``DeveloperResponse`` as a dict."""
+    return {
+        "id": user.id,
+        "name": user.name,
+        "skills": user.skills or [],
+        "successRate": user.success_rate,
+        "bugsResolved": user.bugs_resolved,
+        "avatarUrl": user.avatar_url,
+        "matchScore": match_score,
+    }
+
+
+def funding_dict(funding) -> Dict[str, Any]:
+    """``FundingResponse`` as a dict."""
+    return {
+        "id": funding.id,
+        "bug_id": funding.bug_id,
+        "contributor_name": funding.contributor_name,
+        "amount": funding.amount,
+    }
+
+
+def search_hit_dict(hit: Mapping[str, Any]) -> Dict[str, Any]:
+    """``BugSearchResult`` as a dict, from a ``BugService.search_bugs`` row."""
+    return {
+        "id": hit["id"],
+        "title": hit["title"],
+        "status": hit["status"].value if hit["status"] else "Open",
+        "severity": hit["severity"].value if hit["severity"] else "Medium",
+        "tags": hit["tags"] or [],
+        "createdAt": hit["created_at"].isoformat() if hit["created_at"] else "",
+        "score": hit["score"] or 0.0,
+        "snippet": hit["snippet"] or "",
+    }
+
+
+def json_response(content: Any, headers: Optional[Mapping[str, str]] = None) -> ORJSONResponse:
+    """Encode ``content`` with orjson, bypassing ``response_model`` validation."""
+    return ORJSONResponse(content, headers=headers)
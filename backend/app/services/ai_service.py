@@ -1,40 +1,297 @@
 """AI service — orchestrates AI engine calls."""
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 
+from sqlalchemy import event, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core import http_cache
+from app.core.config import settings
+from app.core.database import Base
 from app.models.models import Bug, User, UserRole, DeveloperMatch
-from app.ai.engine import AIEngine
+from app.ai.cache import AnalysisCache
+from app.ai.clustering import CategoryModelStore, IncrementalTrainer
+from app.ai.engine import AIEngine, DeveloperIndex, ENGINE_VERSION
+from app.ai.executor import AnalysisExecutor
+
+_ENGINE_OPTIONS = {
+    "deterministic": settings.AI_DETERMINISTIC_SCORING,
+    "seed": settings.AI_SCORING_SEED,
+    "category_model_path": settings.AI_CATEGORY_MODEL_PATH,
+}
+
+# Process pool for CPU-bound analyses, shared by every AIService
+analysis_executor = AnalysisExecutor(
+    workers=settings.AI_EXECUTOR_WORKERS,
+    max_pending=settings.AI_EXECUTOR_MAX_PENDING,
+    engine_options=_ENGINE_OPTIONS,
+)
+
+# Analysis results keyed by bug content, shared by every AIService. The
+# scoring mode and seed are part of the version so switching either never
+# serves results computed under the other.
+_SCORING_MODE = "deterministic" if settings.AI_DETERMINISTIC_SCORING else "random"
+analysis_cache = AnalysisCache(
+    f"{ENGINE_VERSION}:{_SCORING_MODE}:{settings.AI_SCORING_SEED}",
+    max_entries=settings.AI_CACHE_MAX_ENTRIES,
+    max_bytes=settings.AI_CACHE_MAX_BYTES,
+    ttl_seconds=settings.AI_CACHE_TTL_SECONDS,
+    path=settings.AI_CACHE_DB_PATH,
+)
+
+# Folds newly filed bugs into the trained category model
+category_trainer = IncrementalTrainer(
+    CategoryModelStore(settings.AI_CATEGORY_MODEL_PATH),
+    labeler=AIEngine().keyword_category,
+    batch_size=settings.AI_CATEGORY_MODEL_UPDATE_BATCH,
+)
+
+# Process-wide developer index, loaded on first match and then refreshed
+# row-by-row from the users that changed since.
+developer_index = DeveloperIndex()
+
+_DEVELOPER_COLUMNS = (
+    User.id,
+    User.name,
+    User.skills,
+    User.success_rate,
+    User.bugs_resolved,
+    User.avatar_url,
+)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_user_changes(session, flush_context):
+    changed = session.info.setdefault("changed_user_ids", set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, User):
+            changed.add(obj.id)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_new_bugs(session, flush_context):
+    if not category_trainer.active:
+        return
+    new_bugs = session.info.setdefault("new_bugs", [])
+    for obj in session.new:
+        if isinstance(obj, Bug):
+            new_bugs.append((obj.title, obj.description, obj.tags or []))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_user_changes(session):
+    for user_id in session.info.pop("changed_user_ids", ()):
+        developer_index.mark_dirty(user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_new_bugs(session):
+    for bug in session.info.pop("new_bugs", ()):
+        category_trainer.observe(*bug)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_user_changes(session):
+    session.info.pop("changed_user_ids", None)
+    session.info.pop("new_bugs", None)
+
+
+@event.listens_for(Base.metadata, "after_create")
+@event.listens_for(Base.metadata, "after_drop")
+def _reset_developer_index(target, connection, **kw):
+    developer_index.invalidate()
 
 
 class AIService:
 
-    def __init__(self):
-        self.engine = AIEngine()
+    def __init__(
+        self,
+        executor: Optional[AnalysisExecutor] = None,
+        cache: Optional[AnalysisCache] = None,
+    ):
+        self.engine = AIEngine(**_ENGINE_OPTIONS)
+        self.executor = executor
+        self.cache = cache or analysis_cache
+        self.developer_index = developer_index
 
     def analyze_bug(self, db: Session, bug_id: str) -> Dict[str, Any]:
-        """Run full AI analysis pipeline on a bug."""
+        """
+        Run full AI analysis pipeline on a bug.
+
+        Blocking; with an executor the analysis runs in its process pool.
+        """
+        loaded = self.load_analysis_input(db, bug_id)
+        if loaded is None:
+            return {}
+
+        record, stored = loaded
+        key, analysis = self.cached_analysis(record)
+        if analysis is None:
+            if self.executor is not None:
+                analysis = self.executor.analyze_many([record])[0]
+            else:
+                analysis = self.engine.analyze(**record)
+            self.cache.put(key, analysis)
+        return self.save_analysis(db, bug_id, analysis, stored)
+
+    def load_analysis_input(
+        self, db: Session, bug_id: str
+    ) -> Optional[Tuple[Dict[str, Any], Tuple]]:
+        """
+        The ``AIEngine.analyze`` arguments for a bug and its currently stored
+        scores, or None if it does not exist.
+        """
         bug = db.query(Bug).filter(Bug.id == bug_id).first()
         if not bug:
-            return {}
+            return None
+        return self._analysis_input(bug), self._stored_scores(bug)
+
+    def cached_analysis(
+        self, record: Dict[str, Any]
+    ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """The cache key for ``record`` and its cached analysis, if any."""
+        key = self.cache.key(record, self.engine.model_version)
+        return key, self.cache.get(key)
+
+    def save_analysis(
+        self,
+        db: Session,
+        bug_id: str,
+        analysis: Dict[str, Any],
+        stored: Optional[Tuple] = None,
+    ) -> Dict[str, Any]:
+        """
+        Persist AI scores back to the bug and build the API response.
+
+        The write is skipped when the scores equal ``stored``.
+        """
+        scores = self._scores(analysis)
+        if scores != stored:
+            db.execute(
+                update(Bug)
+                .where(Bug.id == bug_id)
+                .values(
+                    ai_priority_score=scores[0],
+                    predicted_complexity=scores[1],
+                    predicted_bounty=scores[2],
+                )
+            )
+            db.commit()
+            http_cache.bug_changed(bug_id)
+        return self._analysis_response(bug_id, analysis)
+
+    def analyze_bugs(
+        self,
+        db: Session,
+        bug_ids: Optional[List[str]] = None,
+        chunk_size: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Run the analysis pipeline over many bugs, yielding one result per bug.
+
+        Bugs are loaded with one ``IN`` query per chunk, scored as a batch and
+        written back with a single bulk UPDATE and commit per chunk. With no
+        ``bug_ids`` the whole backlog is re-scored in primary-key order.
+        Unknown ids yield an ``error`` entry instead of a result.
+        """
+        chunk_size = max(1, chunk_size or settings.AI_BATCH_CHUNK_SIZE)
+
+        if bug_ids is None:
+            chunks = self._backlog_chunks(db, chunk_size)
+        else:
+            ids = list(dict.fromkeys(bug_ids))
+            chunks = (
+                self._load_chunk(db, ids[i:i + chunk_size])
+                for i in range(0, len(ids), chunk_size)
+            )
+
+        for requested, bugs in chunks:
+            records = [self._analysis_input(bug) for bug in bugs]
+            lookups = [self.cached_analysis(record) for record in records]
+            misses = [i for i, (_, analysis) in enumerate(lookups) if analysis is None]
+            analyses = [analysis for _, analysis in lookups]
+            if misses:
+                pending = [records[i] for i in misses]
+                if self.executor is not None:
+                    computed = self.executor.analyze_many(pending)
+                else:
+                    computed = self.engine.analyze_many(pending)
+                for i, analysis in zip(misses, computed):
+                    self.cache.put(lookups[i][0], analysis)
+                    analyses[i] = analysis
+
+            scored = [(bug.id, analysis) for bug, analysis in zip(bugs, analyses)]
+            # Only rows whose scores actually moved are written back
+            changed = []
+            for bug, analysis in zip(bugs, analyses):
+                scores = self._scores(analysis)
+                if scores != self._stored_scores(bug):
+                    changed.append({
+                        "id": bug.id,
+                        "ai_priority_score": scores[0],
+                        "predicted_complexity": scores[1],
+                        "predicted_bounty": scores[2],
+                    })
+            if changed:
+                db.execute(update(Bug), changed)
+                db.commit()
+                http_cache.bug_changed(*(row["id"] for row in changed))
 
-        analysis = self.engine.analyze(
-            title=bug.title,
-            description=bug.description,
-            logs=bug.logs or "",
-            tags=bug.tags or [],
-            severity=bug.severity.value if bug.severity else "Medium",
+            results = {
+                bug_id: self._analysis_response(bug_id, analysis)
+                for bug_id, analysis in scored
+            }
+            for bug_id in requested:
+                yield results.get(bug_id) or {"bugId": bug_id, "error": "Bug not found"}
+
+    @staticmethod
+    def _load_chunk(db: Session, ids: List[str]):
+        bugs = db.query(Bug).filter(Bug.id.in_(ids)).all()
+        return ids, bugs
+
+    @staticmethod
+    def _backlog_chunks(db: Session, chunk_size: int):
+        last_id = None
+        while True:
+            query = db.query(Bug).order_by(Bug.id)
+            if last_id is not None:
+                query = query.filter(Bug.id > last_id)
+            bugs = query.limit(chunk_size).all()
+            if not bugs:
+                return
+            last_id = bugs[-1].id
+            yield [b.id for b in bugs], bugs
+
+    @staticmethod
+    def _analysis_input(bug: Bug) -> Dict[str, Any]:
+        return {
+            "title": bug.title,
+            "description": bug.description,
+            "logs": bug.logs or "",
+            "tags": bug.tags or [],
+            "severity": bug.severity.value if bug.severity else "Medium",
+            "log_digest": bug.log_digest,
+        }
+
+    @staticmethod
+    def _scores(analysis: Dict[str, Any]) -> Tuple:
+        return (
+            analysis.get("priority_score", 0.0),
+            analysis.get("complexity", "Medium"),
+            analysis.get("estimated_bounty", 0.0),
         )
 
-        # Persist AI scores back to bug
-        bug.ai_priority_score = analysis.get("priority_score", 0.0)
-        bug.predicted_complexity = analysis.get("complexity", "Medium")
-        bug.predicted_bounty = analysis.get("estimated_bounty", 0.0)
-        db.commit()
+    @staticmethod
+    def _stored_scores(bug: Bug) -> Tuple:
+        return (bug.ai_priority_score, bug.predicted_complexity, bug.predicted_bounty)
 
+    @staticmethod
+    def _analysis_response(bug_id: str, analysis: Dict[str, Any]) -> Dict[str, Any]:
         return {
-            "bugId": bug.id,
+            "bugId": bug_id,
             "category": analysis["category"],
             "complexity": analysis["complexity"],
             "estimatedBounty": analysis["estimated_bounty"],
@@ -45,49 +302,144 @@ class AIService:
             "logInsights": analysis["log_insights"],
         }
 
-    def match_developers(self, db: Session, bug_id: str) -> List[Dict[str, Any]]:
-        """Match developers to a bug based on skills overlap and reputation."""
+    def match_developers(
+        self,
+        db: Session,
+        bug_id: str,
+        limit: Optional[int] = None,
+        min_score: Optional[float] = None,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Match developers to a bug based on skills overlap and reputation.
+
+        Returns the best ``limit`` developers scoring at least ``min_score``
+        (only those are persisted), or None if the bug does not exist.
+        """
         bug = db.query(Bug).filter(Bug.id == bug_id).first()
         if not bug:
-            return []
-
-        developers = (
-            db.query(User).filter(User.role == UserRole.DEVELOPER).all()
-        )
+            return None
 
+        self._sync_developer_index(db)
         matches = self.engine.match_developers(
             bug_tags=bug.tags or [],
             bug_severity=bug.severity.value if bug.severity else "Medium",
-            developers=[
-                {
-                    "id": dev.id,
-                    "name": dev.name,
-                    "skills": dev.skills or [],
-                    "success_rate": dev.success_rate,
-                    "bugs_resolved": dev.bugs_resolved,
-                    "avatar_url": dev.avatar_url,
-                }
-                for dev in developers
-            ],
+            developers=self.developer_index,
+            limit=limit,
+            min_score=min_score,
+            bug_id=bug_id,
         )
 
         # Persist developer matches
-        for match in matches:
-            existing = (
-                db.query(DeveloperMatch)
-                .filter(
-                    DeveloperMatch.bug_id == bug_id,
-                    DeveloperMatch.developer_id == match["id"],
-                )
-                .first()
+        self._upsert_matches(db, bug_id, matches)
+        return matches
+
+    @staticmethod
+    def _upsert_matches(db: Session, bug_id: str, matches: List[Dict[str, Any]]):
+        """Insert or refresh the DeveloperMatch rows for ``matches`` in one statement."""
+        if not matches:
+            return
+        rows = [
+            {"bug_id": bug_id, "developer_id": m["id"], "match_score": m["matchScore"]}
+            for m in matches
+        ]
+
+        dialect = db.get_bind().dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            insert = sqlite_insert if dialect == "sqlite" else postgresql_insert
+            stmt = insert(DeveloperMatch).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["bug_id", "developer_id"],
+                set_={"match_score": stmt.excluded.match_score},
             )
-            if not existing:
-                dm = DeveloperMatch(
-                    bug_id=bug_id,
-                    developer_id=match["id"],
-                    match_score=match["matchScore"],
+            db.execute(stmt)
+        else:
+            existing = {
+                dm.developer_id: dm
+                for dm in db.query(DeveloperMatch).filter(
+                    DeveloperMatch.bug_id == bug_id,
+                    DeveloperMatch.developer_id.in_([r["developer_id"] for r in rows]),
                 )
-                db.add(dm)
+            }
+            for row in rows:
+                dm = existing.get(row["developer_id"])
+                if dm:
+                    dm.match_score = row["match_score"]
+                else:
+                    db.add(DeveloperMatch(**row))
         db.commit()
 
-        return matches
+    def _sync_developer_index(self, db: Session):
+        """Load the developer index once, then apply pending user changes."""
+
+        def load_all():
+            rows = (
+                db.query(*_DEVELOPER_COLUMNS)
+                .filter(User.role == UserRole.DEVELOPER)
+                .all()
+            )
+            return [self._developer_record(row) for row in rows]
+
+        def load_changed(dev_ids):
+            rows = (
+                db.query(*_DEVELOPER_COLUMNS)
+                .filter(User.id.in_(dev_ids), User.role == UserRole.DEVELOPER)
+                .all()
+            )
+            return [self._developer_record(row) for row in rows]
+
+        self.developer_index.refresh(load_all, load_changed)
+
+    @staticmethod
+    def _developer_record(row) -> Dict[str, Any]:
+        return {
+            "id": row.id,
+            "name": row.name,
+            "skills": row.skills or [],
+            "success_rate": row.success_rate,
+            "bugs_resolved": row.bugs_resolved,
+            "avatar_url": row.avatar_url,
+        }
+
+
+class AsyncAIService:
+    """
+    ``AIService`` over an ``AsyncSession`` (see ``AsyncBugService``).
+
+    Analysis itself runs on ``executor``'s process pool, so only the two
+    short database steps around it touch the event loop. Cached analyses
+    skip the pool entirely.
+    """
+
+    def __init__(
+        self,
+        service: Optional[AIService] = None,
+        executor: Optional[AnalysisExecutor] = None,
+    ):
+        self.service = service or AIService()
+        self.executor = executor or self.service.executor
+
+    async def analyze_bug(self, db: AsyncSession, bug_id: str) -> Dict[str, Any]:
+        """Raises ``AnalysisQueueFull`` when the executor is saturated."""
+        if self.executor is None:
+            return await db.run_sync(self.service.analyze_bug, bug_id)
+
+        loaded = await db.run_sync(self.service.load_analysis_input, bug_id)
+        if loaded is None:
+            return {}
+        record, stored = loaded
+        key, analysis = self.service.cached_analysis(record)
+        if analysis is None:
+            analysis = await self.executor.analyze(record)
+            self.service.cache.put(key, analysis)
+        return await db.run_sync(self.service.save_analysis, bug_id, analysis, stored)
+
+    async def match_developers(
+        self,
+        db: AsyncSession,
+        bug_id: str,
+        limit: Optional[int] = None,
+        min_score: Optional[float] = None,
+    ) -> Optional[List[Dict[str, Any]]]:
+        return await db.run_sync(
+            self.service.match_developers, bug_id, limit=limit, min_score=min_score
+        )
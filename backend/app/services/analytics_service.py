@@ -1,94 +1,188 @@
 """Analytics service — aggregated dashboard stats."""
 
-from typing import Dict, Any, List
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import event, func, select
 
+from app.core.config import settings
+from app.core.database import Base
 from app.models.models import Bug, User, UserRole, BugStatus, BugSeverity
+from app.schemas.serializers import BUG_FIELD_COLUMNS, bug_dict, developer_dict
+
+
+class DashboardAggregates:
+    """
+    In-process bug totals behind the dashboard.
+
+    Loaded with one ``GROUP BY severity, status`` query, then kept current by
+    the bug and funding services as they commit writes, so a dashboard hit
+    reads counters instead of scanning ``bugs``. A full reload happens every
+    ``DASHBOARD_CACHE_TTL_SECONDS`` to pick up writes made by other workers.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaded_at: Optional[float] = None
+        self._counts: Dict[Tuple[Optional[str], Optional[str]], int] = {}
+        self._total_funding = 0.0
+        self._bounty_sum = 0.0
+        self._bounty_count = 0
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = None
+
+    def _load(self, db: Session):
+        # The query runs outside the lock: with async sessions it yields to
+        # the event loop, and other requests must not block on the lock.
+        rows = (
+            db.query(
+                Bug.severity,
+                Bug.status,
+                func.count(Bug.id),
+                func.sum(Bug.funds_raised),
+                func.sum(Bug.bounty),
+                func.count(Bug.bounty),
+            )
+            .group_by(Bug.severity, Bug.status)
+            .all()
+        )
+        counts = {}
+        total_funding = bounty_total = 0.0
+        bounty_count = 0
+        for severity, status, count, funds, bounty_sum, bounty_n in rows:
+            key = (severity.value if severity else None, status.value if status else None)
+            counts[key] = count
+            total_funding += funds or 0.0
+            bounty_total += bounty_sum or 0.0
+            bounty_count += bounty_n
+
+        with self._lock:
+            self._counts = counts
+            self._total_funding = total_funding
+            self._bounty_sum = bounty_total
+            self._bounty_count = bounty_count
+            self._loaded_at = time.monotonic()
+
+    def snapshot(self, db: Session) -> Dict[str, Any]:
+        """Current totals, reloading from the database when missing or stale."""
+        loaded_at = self._loaded_at
+        if (
+            loaded_at is None
+            or time.monotonic() - loaded_at > settings.DASHBOARD_CACHE_TTL_SECONDS
+        ):
+            self._load(db)
+
+        with self._lock:
+            severity_counts = {sev.value: 0 for sev in BugSeverity}
+            status_counts = {st.value: 0 for st in BugStatus}
+            for (severity, status), count in self._counts.items():
+                if severity in severity_counts:
+                    severity_counts[severity] += count
+                if status in status_counts:
+                    status_counts[status] += count
+
+            return {
+                "total_bugs": sum(self._counts.values()),
+                "total_funding": self._total_funding,
+                "average_bounty": (
+                    self._bounty_sum / self._bounty_count if self._bounty_count else 0.0
+                ),
+                "bugs_by_severity": severity_counts,
+                "bugs_by_status": status_counts,
+            }
+
+    # ---------- Write hooks (call after the change is committed) ----------
+
+    def bug_created(self, bug: Bug):
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            key = (
+                bug.severity.value if bug.severity else None,
+                bug.status.value if bug.status else None,
+            )
+            self._counts[key] = self._counts.get(key, 0) + 1
+            self._total_funding += bug.funds_raised or 0.0
+            if bug.bounty is not None:
+                self._bounty_sum += bug.bounty
+                self._bounty_count += 1
+
+    def status_changed(
+        self, severity: Optional[BugSeverity], old: Optional[BugStatus], new: Optional[BugStatus]
+    ):
+        if old == new:
+            return
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            sev = severity.value if severity else None
+            old_key = (sev, old.value if old else None)
+            new_key = (sev, new.value if new else None)
+            self._counts[old_key] = self._counts.get(old_key, 0) - 1
+            self._counts[new_key] = self._counts.get(new_key, 0) + 1
+
+    def funds_added(self, amount: float):
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            self._total_funding += amount
+
+
+dashboard_aggregates = DashboardAggregates()
+
+
+@event.listens_for(Base.metadata, "after_create")
+@event.listens_for(Base.metadata, "after_drop")
+def _reset_dashboard_aggregates(target, connection, **kw):
+    dashboard_aggregates.invalidate()
 
 
 class AnalyticsService:
 
     @staticmethod
     def get_dashboard(db: Session) -> Dict[str, Any]:
-        total_bugs = db.query(Bug).count()
-        resolved_bugs = (
-            db.query(Bug).filter(Bug.status == BugStatus.RESOLVED).count()
-        )
+        totals = dashboard_aggregates.snapshot(db)
+        total_bugs = totals["total_bugs"]
+        resolved_bugs = totals["bugs_by_status"][BugStatus.RESOLVED.value]
         resolved_pct = (resolved_bugs / total_bugs * 100) if total_bugs > 0 else 0.0
 
-        total_funding = (
-            db.query(func.sum(Bug.funds_raised)).scalar() or 0.0
-        )
-        avg_bounty = (
-            db.query(func.avg(Bug.bounty)).scalar() or 0.0
-        )
-
-        # Bugs by severity
-        severity_counts = {}
-        for sev in BugSeverity:
-            count = db.query(Bug).filter(Bug.severity == sev).count()
-            severity_counts[sev.value] = count
-
-        # Bugs by status
-        status_counts = {}
-        for st in BugStatus:
-            count = db.query(Bug).filter(Bug.status == st).count()
-            status_counts[st.value] = count
-
-        # Top developers
-        top_devs = (
-            db.query(User)
-            .filter(User.role == UserRole.DEVELOPER)
+        # Top developers and recent bugs as plain rows, serialized directly
+        top_devs = db.execute(
+            select(
+                User.id, User.name, User.skills, User.success_rate,
+                User.bugs_resolved, User.avatar_url,
+            )
+            .where(User.role == UserRole.DEVELOPER)
             .order_by(User.bugs_resolved.desc())
             .limit(10)
-            .all()
-        )
-
-        # Recent bugs
-        recent_bugs = (
-            db.query(Bug).order_by(Bug.created_at.desc()).limit(5).all()
-        )
+        ).all()
+        recent_bugs = db.execute(
+            select(*(getattr(Bug, c) for c in BUG_FIELD_COLUMNS.values()))
+            .order_by(Bug.created_at.desc())
+            .limit(5)
+        ).all()
 
         return {
             "totalBugs": total_bugs,
             "resolvedBugs": resolved_bugs,
             "resolvedPercentage": round(resolved_pct, 1),
-            "totalFunding": float(total_funding),
-            "averageBounty": round(float(avg_bounty), 2),
-            "bugsBySeverity": severity_counts,
-            "bugsByStatus": status_counts,
-            "topDevelopers": [
-                {
-                    "id": d.id,
-                    "name": d.name,
-                    "skills": d.skills or [],
-                    "successRate": d.success_rate,
-                    "bugsResolved": d.bugs_resolved,
-                    "avatarUrl": d.avatar_url,
-                }
-                for d in top_devs
-            ],
-            "recentBugs": [
-                {
-                    "id": b.id,
-                    "title": b.title,
-                    "description": b.description,
-                    "repoLink": b.repo_link or "",
-                    "logs": b.logs or "",
-                    "tags": b.tags or [],
-                    "severity": b.severity.value if b.severity else "Medium",
-                    "expectedBehavior": b.expected_behavior or "",
-                    "status": b.status.value if b.status else "Open",
-                    "createdAt": b.created_at.isoformat() if b.created_at else "",
-                    "bounty": b.bounty or 0.0,
-                    "fundsRaised": b.funds_raised or 0.0,
-                    "contributors": b.contributors or 0,
-                    "authorId": b.author_id,
-                    "assignedDeveloperId": b.assigned_developer_id,
-                    "aiScore": b.ai_priority_score,
-                }
-                for b in recent_bugs
-            ],
+            "totalFunding": float(totals["total_funding"]),
+            "averageBounty": round(float(totals["average_bounty"]), 2),
+            "bugsBySeverity": totals["bugs_by_severity"],
+            "bugsByStatus": totals["bugs_by_status"],
+            "topDevelopers": [developer_dict(d) for d in top_devs],
+            "recentBugs": [bug_dict(b) for b in recent_bugs],
         }
+
+
+class AsyncAnalyticsService:
+    """``AnalyticsService`` over an ``AsyncSession`` (see ``AsyncBugService``)."""
+
+    @staticmethod
+    async def get_dashboard(db: AsyncSession) -> Dict[str, Any]:
+        return await db.run_sync(AnalyticsService.get_dashboard)
@@ -1,12 +1,61 @@
 """Bug service — business logic for bug operations."""
 
+import base64
+import re
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 import uuid
 
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, column, exists, func, literal_column, or_, select, table
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, load_only
 
-from app.models.models import Bug, BugStatus, BugSeverity
+from app.core import http_cache
+from app.core.config import settings
+from app.models.models import BUG_TSVECTOR, Bug, BugStatus, BugSeverity
+from app.schemas.serializers import BUG_FIELD_COLUMNS
+from app.services.analytics_service import dashboard_aggregates
+from app.services.duplicate_service import DuplicateService
+from app.services.job_service import analysis_jobs
+from app.services.timeseries_service import BUGS_FILED, STATUS_CHANGES, TimeseriesService, bug_category
+
+
+# Large text blobs are only loaded when explicitly requested
+DEFAULT_BUG_FIELDS = [f for f in BUG_FIELD_COLUMNS if f != "logs"]
+
+
+# Search snippets mark matched terms with these
+SNIPPET_START, SNIPPET_END = "**", "**"
+
+# FTS5 table maintained alongside ``bugs`` (see app.models.models)
+_bugs_fts = table("bugs_fts", column("rowid"))
+
+
+def fts_query(text: str) -> str:
+    """
+    User input as an FTS5 query: every word must match, the last as a prefix.
+
+    Words are quoted, so FTS5 operators and punctuation in ``text`` are never
+    interpreted.
+    """
+    words = re.findall(r"\w+", text.lower())
+    if not words:
+        return ""
+    return " ".join(f'"{w}"' for w in words) + "*"
+
+
+def encode_bug_cursor(bug: Bug) -> str:
+    raw = f"{bug.created_at.isoformat()}|{bug.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_bug_cursor(cursor: str) -> Optional[Tuple[datetime, str]]:
+    try:
+        created_at, bug_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(created_at), bug_id
+    except (ValueError, UnicodeDecodeError):
+        return None
 
 
 class BugService:
@@ -37,17 +86,145 @@ class BugService:
             funds_raised=0.0,
             contributors=0,
             author_id=author_id,
+            category=bug_category(title, description, tags),
             created_at=datetime.now(timezone.utc),
         )
         db.add(bug)
+        TimeseriesService.record(
+            db, BUGS_FILED, bug.created_at, bug.severity, bug.status, bug.category
+        )
         db.commit()
         db.refresh(bug)
+        dashboard_aggregates.bug_created(bug)
+        http_cache.bug_changed(bug.id)
+        DuplicateService.bug_created(bug)
+        if settings.AI_ANALYZE_ON_CREATE:
+            analysis_jobs.enqueue(bug.id)
         return bug
 
     @staticmethod
     def get_all_bugs(db: Session) -> List[Bug]:
         return db.query(Bug).order_by(Bug.created_at.desc()).all()
 
+    @staticmethod
+    def list_bugs(
+        db: Session,
+        limit: int = 50,
+        cursor: Optional[Tuple[datetime, str]] = None,
+        status: Optional[BugStatus] = None,
+        severity: Optional[BugSeverity] = None,
+        tag: Optional[str] = None,
+        columns: Optional[Iterable[str]] = None,
+    ) -> Tuple[List[Bug], Optional[str]]:
+        """
+        One page of bugs, newest first, plus the cursor for the next page.
+
+        Paging is keyset-based on ``(created_at, id)`` so deep pages cost the
+        same as the first. Only ``columns`` (plus the cursor keys) are read
+        from the database; the rest stay deferred.
+        """
+        query = db.query(Bug)
+        if columns is not None:
+            wanted = set(columns) | {"id", "created_at"}
+            query = query.options(load_only(*(getattr(Bug, c) for c in wanted)))
+
+        if status is not None:
+            query = query.filter(Bug.status == status)
+        if severity is not None:
+            query = query.filter(Bug.severity == severity)
+        if tag is not None:
+            query = query.filter(BugService._has_tag(db, tag))
+        if cursor is not None:
+            created_at, bug_id = cursor
+            query = query.filter(
+                or_(
+                    Bug.created_at < created_at,
+                    and_(Bug.created_at == created_at, Bug.id < bug_id),
+                )
+            )
+
+        bugs = (
+            query.order_by(Bug.created_at.desc(), Bug.id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+        next_cursor = encode_bug_cursor(bugs[limit - 1]) if len(bugs) > limit else None
+        return bugs[:limit], next_cursor
+
+    @staticmethod
+    def _has_tag(db: Session, tag: str):
+        """SQL predicate: ``tag`` is an element of the JSON ``tags`` array."""
+        dialect = db.get_bind().dialect.name
+        if dialect == "sqlite":
+            tags = func.json_each(Bug.tags).table_valued("value")
+            return exists(select(1).select_from(tags).where(tags.c.value == tag))
+        if dialect == "postgresql":
+            return Bug.tags.cast(JSONB).contains([tag])
+        return Bug.tags.like(f'%"{tag}"%')
+
+    @staticmethod
+    def search_bugs(
+        db: Session, query: str, limit: int = 20, offset: int = 0
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        One page of bugs matching ``query``, best match first, and whether
+        more follow.
+
+        Ranked in the index — BM25 on SQLite, ``ts_rank_cd`` on Postgres —
+        with title matches weighted above tags, description and then logs.
+        Only the page's rows are read from ``bugs``.
+        """
+        dialect = db.get_bind().dialect.name
+        if dialect == "sqlite":
+            match = fts_query(query)
+            if not match:
+                return [], False
+            fts = literal_column("bugs_fts")
+            score = func.bm25(fts, 10.0, 5.0, 3.0, 1.0)
+            stmt = (
+                select(
+                    Bug.id, Bug.title, Bug.status, Bug.severity, Bug.tags, Bug.created_at,
+                    (-score).label("score"),
+                    func.snippet(fts, -1, SNIPPET_START, SNIPPET_END, "…", 16).label("snippet"),
+                )
+                .select_from(_bugs_fts)
+                .join(Bug, literal_column("bugs.rowid") == _bugs_fts.c.rowid)
+                .where(fts.op("MATCH")(match))
+                .order_by(score, Bug.id)
+            )
+        elif dialect == "postgresql":
+            vector = literal_column(f"({BUG_TSVECTOR})")
+            tsquery = func.websearch_to_tsquery("english", query)
+            score = func.ts_rank_cd(vector, tsquery)
+            stmt = (
+                select(
+                    Bug.id, Bug.title, Bug.status, Bug.severity, Bug.tags, Bug.created_at,
+                    score.label("score"),
+                    func.ts_headline(
+                        "english",
+                        Bug.title + " " + Bug.description,
+                        tsquery,
+                        f"StartSel={SNIPPET_START}, StopSel={SNIPPET_END}, MaxWords=24, MinWords=8",
+                    ).label("snippet"),
+                )
+                .where(vector.op("@@")(tsquery))
+                .order_by(score.desc(), Bug.id)
+            )
+        else:
+            pattern = f"%{query}%"
+            stmt = (
+                select(
+                    Bug.id, Bug.title, Bug.status, Bug.severity, Bug.tags, Bug.created_at,
+                    literal_column("0.0").label("score"),
+                    func.substr(Bug.description, 1, 200).label("snippet"),
+                )
+                .where(or_(Bug.title.like(pattern), Bug.description.like(pattern)))
+                .order_by(Bug.created_at.desc(), Bug.id.desc())
+            )
+
+        rows = db.execute(stmt.limit(limit + 1).offset(offset)).all()
+        return [row._asdict() for row in rows[:limit]], len(rows) > limit
+
     @staticmethod
     def get_bug_by_id(db: Session, bug_id: str) -> Optional[Bug]:
         return db.query(Bug).filter(Bug.id == bug_id).first()
@@ -56,9 +233,17 @@ class BugService:
     def update_bug_status(db: Session, bug_id: str, status: str) -> Optional[Bug]:
         bug = db.query(Bug).filter(Bug.id == bug_id).first()
         if bug:
+            old_status = bug.status
             bug.status = BugStatus(status)
+            if bug.status != old_status:
+                TimeseriesService.record(
+                    db, STATUS_CHANGES, datetime.now(timezone.utc),
+                    bug.severity, bug.status, bug.category,
+                )
             db.commit()
             db.refresh(bug)
+            dashboard_aggregates.status_changed(bug.severity, old_status, bug.status)
+            http_cache.bug_changed(bug.id)
         return bug
 
     @staticmethod
@@ -76,4 +261,35 @@ class BugService:
             bug.predicted_bounty = predicted_bounty
             db.commit()
             db.refresh(bug)
+            http_cache.bug_changed(bug.id)
         return bug
+
+
+class AsyncBugService:
+    """
+    ``BugService`` over an ``AsyncSession``.
+
+    The business logic is shared with ``BugService`` and runs through
+    ``AsyncSession.run_sync``, where every query awaits the async driver
+    instead of blocking the event loop.
+    """
+
+    @staticmethod
+    async def create_bug(db: AsyncSession, **kwargs) -> Bug:
+        return await db.run_sync(BugService.create_bug, **kwargs)
+
+    @staticmethod
+    async def list_bugs(db: AsyncSession, **kwargs) -> Tuple[List[Bug], Optional[str]]:
+        return await db.run_sync(BugService.list_bugs, **kwargs)
+
+    @staticmethod
+    async def search_bugs(db: AsyncSession, query: str, **kwargs) -> Tuple[List[Dict[str, Any]], bool]:
+        return await db.run_sync(BugService.search_bugs, query, **kwargs)
+
+    @staticmethod
+    async def get_bug_by_id(db: AsyncSession, bug_id: str) -> Optional[Bug]:
+        return await db.run_sync(BugService.get_bug_by_id, bug_id)
+
+    @staticmethod
+    async def update_bug_status(db: AsyncSession, bug_id: str, status: str) -> Optional[Bug]:
+        return await db.run_sync(BugService.update_bug_status, bug_id, status)
@@ -0,0 +1,92 @@
+"""Duplicate service — near-duplicate bug lookup over a MinHash LSH index."""
+
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.ai.dedupe import DuplicateIndex
+from app.core.config import settings
+from app.core.database import Base
+from app.models.models import Bug
+
+duplicate_index = DuplicateIndex(
+    num_perm=settings.DUPLICATE_NUM_PERM, bands=settings.DUPLICATE_LSH_BANDS
+)
+
+
+@event.listens_for(Base.metadata, "after_create")
+@event.listens_for(Base.metadata, "after_drop")
+def _reset_duplicate_index(target, connection, **kw):
+    duplicate_index.invalidate()
+
+
+class DuplicateService:
+    """
+    Loads ``duplicate_index`` from the ``bugs`` table on first use (or at
+    startup), then keeps it current as ``BugService.create_bug`` commits.
+    """
+
+    @staticmethod
+    def ensure_index(db: Session):
+        if duplicate_index.built:
+            return
+        rows = db.query(Bug.id, Bug.title, Bug.description, Bug.logs).yield_per(1000)
+        duplicate_index.rebuild(tuple(row) for row in rows)
+
+    @staticmethod
+    def bug_created(bug: Bug):
+        """Index a committed bug; an index not yet built picks it up on load."""
+        if duplicate_index.built:
+            duplicate_index.add(bug.id, bug.title, bug.description, bug.logs or "")
+
+    @staticmethod
+    def similar_bugs(
+        db: Session,
+        bug_id: str,
+        threshold: Optional[float] = None,
+        limit: int = 10,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Bugs resembling ``bug_id``, most similar first; None if it does not exist."""
+        DuplicateService.ensure_index(db)
+        if bug_id not in duplicate_index:
+            # Filed by another worker since the index was loaded
+            bug = db.query(Bug).filter(Bug.id == bug_id).first()
+            if not bug:
+                return None
+            DuplicateService.bug_created(bug)
+
+        if threshold is None:
+            threshold = settings.DUPLICATE_SIMILARITY_THRESHOLD
+        matches = duplicate_index.similar(bug_id, threshold, limit)
+        if not matches:
+            return []
+        rows = {
+            row.id: row
+            for row in db.query(Bug.id, Bug.title, Bug.status).filter(
+                Bug.id.in_([other for other, _ in matches])
+            )
+        }
+        return [
+            {
+                "id": other,
+                "title": rows[other].title,
+                "status": rows[other].status.value if rows[other].status else "Open",
+                "similarity": similarity,
+            }
+            for other, similarity in matches
+            if other in rows
+        ]
+
+
+class AsyncDuplicateService:
+    """``DuplicateService`` over an ``AsyncSession``."""
+
+    @staticmethod
+    async def ensure_index(db: AsyncSession):
+        await db.run_sync(DuplicateService.ensure_index)
+
+    @staticmethod
+    async def similar_bugs(db: AsyncSession, bug_id: str, **kwargs) -> Optional[List[Dict[str, Any]]]:
+        return await db.run_sync(DuplicateService.similar_bugs, bug_id, **kwargs)
@@ -1,52 +1,201 @@
 """Funding service — business logic for funding operations."""
 
-from typing import List, Optional, Dict, Any
+import asyncio
+import base64
+import random
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import and_, func, or_, select, update
 
-from app.models.models import Bug, Funding
+from app.core import http_cache
+from app.core.config import settings
+from app.models.models import Bug, BugStatus, Funding
+from app.services.analytics_service import dashboard_aggregates
+from app.services.timeseries_service import FUNDING, STATUS_CHANGES, TimeseriesService
+
+
+# Postgres serialization_failure, deadlock_detected, lock_not_available
+_RETRYABLE_SQLSTATES = {"40001", "40P01", "55P03"}
+
+
+def encode_funding_cursor(funding) -> str:
+    raw = f"{funding.created_at.isoformat()}|{funding.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_funding_cursor(cursor: str) -> Optional[Tuple[datetime, int]]:
+    try:
+        created_at, funding_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(created_at), int(funding_id)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def is_contention_error(exc: DBAPIError) -> bool:
+    """Lock timeouts, deadlocks and serialization failures — safe to retry."""
+    orig = exc.orig
+    if "database is locked" in str(orig):  # SQLite busy timeout
+        return True
+    code = getattr(orig, "pgcode", None) or getattr(orig, "sqlstate", None)
+    return code in _RETRYABLE_SQLSTATES
+
+
+def retry_delays() -> Iterator[float]:
+    """Backoff before each retry: jittered, doubling from the configured base."""
+    for attempt in range(settings.FUNDING_WRITE_ATTEMPTS - 1):
+        yield random.uniform(0, settings.FUNDING_RETRY_BASE_SECONDS * 2**attempt)
 
 
 class FundingService:
 
     @staticmethod
-    def add_funding(
+    def record_funding(
         db: Session, bug_id: str, contributor_name: str, amount: float
     ) -> Optional[Funding]:
-        bug = db.query(Bug).filter(Bug.id == bug_id).first()
-        if not bug:
-            return None
-
-        funding = Funding(
-            bug_id=bug_id,
-            contributor_name=contributor_name,
-            amount=amount,
-        )
-        db.add(funding)
-
-        # Update bug totals
-        bug.funds_raised += amount
-        bug.contributors += 1
-
-        # Auto-update status to Funded if threshold met
-        if bug.funds_raised >= bug.bounty and bug.bounty > 0:
-            from app.models.models import BugStatus
-            bug.status = BugStatus.FUNDED
-
-        db.commit()
-        db.refresh(funding)
+        """
+        One attempt at a pledge: a ledger insert, an in-database increment of
+        the bug's totals and the pledge's analytics rollups, committed together.
+
+        The bug's UPDATE runs first, so the transaction holds the row (or, on
+        SQLite, the write lock) before anything else; concurrent pledges
+        queue on it instead of overwriting each other's totals. Rolls back
+        and re-raises on failure.
+        """
+        try:
+            row = db.execute(
+                update(Bug)
+                .where(Bug.id == bug_id)
+                .values(
+                    funds_raised=func.coalesce(Bug.funds_raised, 0.0) + amount,
+                    contributors=func.coalesce(Bug.contributors, 0) + 1,
+                )
+                .returning(Bug.funds_raised, Bug.bounty, Bug.status, Bug.severity, Bug.category)
+            ).first()
+            if row is None:
+                db.rollback()
+                return None
+
+            # Auto-update status to Funded if threshold met. The row is locked
+            # by our UPDATE, so the status we read is still current.
+            old_status = new_status = row.status
+            if row.bounty and row.bounty > 0 and row.funds_raised >= row.bounty:
+                new_status = BugStatus.FUNDED
+                if old_status != new_status:
+                    db.execute(update(Bug).where(Bug.id == bug_id).values(status=new_status))
+
+            now = datetime.now(timezone.utc)
+            funding = Funding(
+                bug_id=bug_id, contributor_name=contributor_name, amount=amount, created_at=now
+            )
+            db.add(funding)
+            TimeseriesService.record(
+                db, FUNDING, now, row.severity, new_status, row.category, total=amount
+            )
+            if new_status != old_status:
+                TimeseriesService.record(
+                    db, STATUS_CHANGES, now, row.severity, new_status, row.category
+                )
+            db.commit()
+        except BaseException:
+            db.rollback()
+            raise
+
+        dashboard_aggregates.funds_added(amount)
+        dashboard_aggregates.status_changed(row.severity, old_status, new_status)
+        http_cache.funding_changed(bug_id)
         return funding
 
     @staticmethod
-    def get_fundings_for_bug(db: Session, bug_id: str) -> Dict[str, Any]:
-        bug = db.query(Bug).filter(Bug.id == bug_id).first()
-        fundings = db.query(Funding).filter(Funding.bug_id == bug_id).all()
-        total = sum(f.amount for f in fundings)
+    def add_funding(
+        db: Session, bug_id: str, contributor_name: str, amount: float
+    ) -> Optional[Funding]:
+        """``record_funding``, retried with backoff on lock contention."""
+        delays = retry_delays()
+        while True:
+            try:
+                return FundingService.record_funding(db, bug_id, contributor_name, amount)
+            except DBAPIError as e:
+                delay = next(delays, None)
+                if delay is None or not is_contention_error(e):
+                    raise
+            time.sleep(delay)
+
+    @staticmethod
+    def get_fundings_for_bug(
+        db: Session,
+        bug_id: str,
+        limit: int = 50,
+        cursor: Optional[Tuple[datetime, int]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Pledge totals for a bug plus one page of its pledges, newest first.
+
+        Totals come from a single aggregate over the ledger, answered from the
+        ``(bug_id, amount)`` index; pledges are paged by keyset on
+        ``(created_at, id)``. Neither loads more than ``limit`` rows.
+        """
+        total, count = db.execute(
+            select(func.coalesce(func.sum(Funding.amount), 0.0), func.count())
+            .where(Funding.bug_id == bug_id)
+        ).one()
+
+        query = select(
+            Funding.id, Funding.bug_id, Funding.contributor_name, Funding.amount,
+            Funding.created_at,
+        ).where(Funding.bug_id == bug_id)
+        if cursor is not None:
+            created_at, funding_id = cursor
+            query = query.where(
+                or_(
+                    Funding.created_at < created_at,
+                    and_(Funding.created_at == created_at, Funding.id < funding_id),
+                )
+            )
+        fundings = db.execute(
+            query.order_by(Funding.created_at.desc(), Funding.id.desc()).limit(limit + 1)
+        ).all()
+        next_cursor = encode_funding_cursor(fundings[limit - 1]) if len(fundings) > limit else None
 
         return {
             "bug_id": bug_id,
-            "total_funded": total,
-            "contributors": len(fundings),
-            "fundings": fundings,
+            "total_funded": float(total),
+            "contributors": count,
+            "fundings": fundings[:limit],
+            "next_cursor": next_cursor,
         }
+
+
+class AsyncFundingService:
+    """``FundingService`` over an ``AsyncSession`` (see ``AsyncBugService``)."""
+
+    @staticmethod
+    async def add_funding(
+        db: AsyncSession, bug_id: str, contributor_name: str, amount: float
+    ) -> Optional[Funding]:
+        # Same retry loop as ``FundingService.add_funding``, but backing off
+        # without blocking the event loop
+        delays = retry_delays()
+        while True:
+            try:
+                return await db.run_sync(
+                    FundingService.record_funding, bug_id, contributor_name, amount
+                )
+            except DBAPIError as e:
+                delay = next(delays, None)
+                if delay is None or not is_contention_error(e):
+                    raise
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    async def get_fundings_for_bug(
+        db: AsyncSession,
+        bug_id: str,
+        limit: int = 50,
+        cursor: Optional[Tuple[datetime, int]] = None,
+    ) -> Dict[str, Any]:
+        return await db.run_sync(FundingService.get_fundings_for_bug, bug_id, limit, cursor)
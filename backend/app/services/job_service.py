@@ -0,0 +1,352 @@
+"""
+Job service — background AI analysis of newly filed bugs.
+
+``BugService.create_bug`` enqueues the bug and returns; worker threads then
+score it (on the analysis process pool) and match developers, so filing a
+bug never waits on the AI and a burst of submissions drains at the pace of
+``JOB_WORKERS``. A bug has at most one job: enqueueing a bug that is already
+queued is a no-op, and one that is running is re-run once it finishes.
+Failed attempts are retried with exponential backoff.
+
+With ``JOB_QUEUE_DB_PATH`` set, job state is also written to a SQLite file
+and unfinished jobs are picked up again on the next start; finished jobs are
+swept from it once they are ``JOB_RETENTION_SECONDS`` old.
+"""
+
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import Base, SessionLocal
+from app.services.ai_service import AIService, analysis_executor
+
+logger = logging.getLogger("crowdfundfix.jobs")
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+
+# Stages of an analysis job, in order
+STAGES = ("analysis", "matching")
+
+# Longest gap between two sweeps of a JobStore's finished jobs
+SWEEP_INTERVAL_SECONDS = 3600
+
+
+class JobFailed(Exception):
+    """A failure that retrying cannot fix, e.g. the bug no longer exists."""
+
+
+class Job:
+    """State of the analysis job for one bug."""
+
+    __slots__ = (
+        "bug_id", "status", "stage", "attempts", "error", "result",
+        "enqueued_at", "started_at", "finished_at", "rerun",
+    )
+
+    def __init__(self, bug_id: str, enqueued_at: Optional[float] = None):
+        self.bug_id = bug_id
+        self.status = QUEUED
+        self.stage: Optional[str] = None
+        self.attempts = 0
+        self.error: Optional[str] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.enqueued_at = enqueued_at or time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        # Enqueued again while running: run once more when done
+        self.rerun = False
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        done = STAGES.index(self.stage) if self.stage in STAGES else 0
+        return {
+            "bugId": self.bug_id,
+            "status": self.status,
+            "stage": self.stage,
+            "progress": 1.0 if self.status == SUCCEEDED else round(done / len(STAGES), 2),
+            "attempts": self.attempts,
+            "error": self.error,
+            "result": self.result,
+            "enqueuedAt": self.enqueued_at,
+            "startedAt": self.started_at,
+            "finishedAt": self.finished_at,
+        }
+
+
+class JobStore:
+    """
+    SQLite table of job states, so queued work survives a restart.
+
+    Finished jobs are deleted once ``retention_seconds`` old, by a sweep
+    that runs on saving a finished job at most every ``SWEEP_INTERVAL_SECONDS``.
+    """
+
+    def __init__(self, path: str, retention_seconds: float = 7 * 24 * 3600):
+        self.retention_seconds = retention_seconds
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS analysis_jobs ("
+            "bug_id TEXT PRIMARY KEY, status TEXT NOT NULL, attempts INTEGER NOT NULL, "
+            "error TEXT, enqueued_at REAL NOT NULL, finished_at REAL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS ix_analysis_jobs_finished_at "
+            "ON analysis_jobs (finished_at)"
+        )
+        self._lock = threading.Lock()
+        self._swept_at = 0.0
+
+    def save(self, job: Job):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO analysis_jobs VALUES (?, ?, ?, ?, ?, ?)",
+                (job.bug_id, job.status, job.attempts, job.error, job.enqueued_at, job.finished_at),
+            )
+            now = time.time()
+            interval = min(self.retention_seconds, SWEEP_INTERVAL_SECONDS)
+            if job.finished and now - self._swept_at >= interval:
+                self._sweep(now)
+
+    def sweep(self) -> int:
+        """Delete finished jobs older than the retention; returns how many."""
+        with self._lock:
+            return self._sweep(time.time())
+
+    def _sweep(self, now: float) -> int:
+        self._swept_at = now
+        return self._db.execute(
+            "DELETE FROM analysis_jobs WHERE finished_at < ? AND status IN (?, ?)",
+            (now - self.retention_seconds, SUCCEEDED, FAILED),
+        ).rowcount
+
+    def unfinished(self) -> List[Job]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT bug_id, enqueued_at FROM analysis_jobs "
+                "WHERE status IN (?, ?) ORDER BY enqueued_at",
+                (QUEUED, RUNNING),
+            ).fetchall()
+        return [Job(bug_id, enqueued_at) for bug_id, enqueued_at in rows]
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM analysis_jobs")
+
+
+class AnalysisJobQueue:
+    """
+    In-process queue of per-bug analysis jobs, drained by worker threads.
+
+    Workers start on first use. Sessions come from ``session_factory``.
+    The ``history`` most recent finished jobs are kept for status lookups.
+    Matching keeps the best ``match_limit`` developers, like the match route.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        service: Optional[AIService] = None,
+        workers: int = 2,
+        max_attempts: int = 3,
+        retry_base_seconds: float = 1.0,
+        history: int = 10000,
+        store: Optional[JobStore] = None,
+        match_limit: int = 10,
+    ):
+        self.session_factory = session_factory
+        self.service = service or AIService(executor=analysis_executor)
+        self.workers = max(1, workers)
+        self.max_attempts = max(1, max_attempts)
+        self.retry_base_seconds = retry_base_seconds
+        self.history = history
+        self.store = store
+        self.match_limit = match_limit
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._threads: List[threading.Thread] = []
+        self._timers: List[threading.Timer] = []
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+    # ---------- Public API ----------
+
+    def enqueue(self, bug_id: str) -> Job:
+        """Queue analysis of ``bug_id`` unless it is already queued."""
+        with self._lock:
+            job = self._jobs.get(bug_id)
+            if job is not None and not job.finished:
+                if job.status == RUNNING:
+                    job.rerun = True
+                return job
+            job = self._jobs[bug_id] = Job(bug_id)
+            self._jobs.move_to_end(bug_id)
+            self._trim()
+            self._ensure_workers()
+        self._save(job)
+        self._queue.put(bug_id)
+        return job
+
+    def get(self, bug_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(bug_id)
+            return job.to_dict() if job is not None else None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = {status: 0 for status in (QUEUED, RUNNING, SUCCEEDED, FAILED)}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return {"workers": self.workers, "backlog": self._queue.qsize(), **counts}
+
+    def start(self):
+        """Start workers and resume jobs left unfinished by a previous run."""
+        recovered = self.store.unfinished() if self.store else []
+        for job in recovered:
+            self.enqueue(job.bug_id)
+        if recovered:
+            logger.info(f"Resumed {len(recovered)} analysis jobs")
+        with self._lock:
+            self._ensure_workers()
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until no job is queued or running; False on timeout."""
+        with self._changed:
+            return self._changed.wait_for(
+                lambda: all(job.finished for job in self._jobs.values()), timeout
+            )
+
+    def clear(self):
+        """Forget all job state (the database was recreated)."""
+        with self._changed:
+            self._jobs.clear()
+            self._changed.notify_all()
+        if self.store:
+            self.store.clear()
+
+    def shutdown(self):
+        """Stop the workers; queued jobs stay in the store for the next start."""
+        with self._lock:
+            threads, self._threads = self._threads, []
+            timers, self._timers = self._timers, []
+        for timer in timers:
+            timer.cancel()
+        for _ in threads:
+            self._queue.put(None)
+        for thread in threads:
+            thread.join()
+
+    # ---------- Internal ----------
+
+    def _ensure_workers(self):
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(
+                target=self._work, name=f"analysis-job-{len(self._threads)}", daemon=True
+            )
+            self._threads.append(thread)
+            thread.start()
+
+    def _trim(self):
+        excess = len(self._jobs) - self.history
+        for bug_id in [b for b, job in self._jobs.items() if job.finished][:max(0, excess)]:
+            del self._jobs[bug_id]
+
+    def _save(self, job: Job):
+        if self.store:
+            self.store.save(job)
+
+    def _work(self):
+        while True:
+            bug_id = self._queue.get()
+            if bug_id is None:
+                return
+            with self._lock:
+                job = self._jobs.get(bug_id)
+                if job is None or job.status != QUEUED:
+                    continue
+                job.status, job.stage = RUNNING, STAGES[0]
+                job.attempts += 1
+                job.rerun = False
+                job.started_at = time.time()
+            self._save(job)
+
+            retry_in = None
+            try:
+                result = self._run(job)
+            except Exception as e:
+                logger.warning(f"Analysis job for {bug_id} failed (attempt {job.attempts}): {e}")
+                with self._changed:
+                    job.error = str(e)
+                    if isinstance(e, JobFailed) or job.attempts >= self.max_attempts:
+                        job.status, job.finished_at = FAILED, time.time()
+                    else:
+                        job.status = QUEUED
+                        retry_in = self.retry_base_seconds * 2 ** (job.attempts - 1)
+                    self._changed.notify_all()
+            else:
+                with self._changed:
+                    job.result, job.error = result, None
+                    if job.rerun:
+                        job.status, job.attempts = QUEUED, 0
+                        retry_in = 0.0
+                    else:
+                        job.status, job.finished_at = SUCCEEDED, time.time()
+                    self._changed.notify_all()
+            self._save(job)
+
+            if retry_in == 0.0:
+                self._queue.put(bug_id)
+            elif retry_in is not None:
+                timer = threading.Timer(retry_in, self._queue.put, (bug_id,))
+                timer.daemon = True
+                with self._lock:
+                    self._timers = [t for t in self._timers if t.is_alive()] + [timer]
+                timer.start()
+
+    def _run(self, job: Job) -> Dict[str, Any]:
+        db = self.session_factory()
+        try:
+            analysis = self.service.analyze_bug(db, job.bug_id)
+            if not analysis:
+                raise JobFailed("Bug not found")
+            job.stage = STAGES[1]
+            matches = self.service.match_developers(
+                db, job.bug_id, limit=self.match_limit
+            ) or []
+            return {
+                "category": analysis["category"],
+                "complexity": analysis["complexity"],
+                "estimatedBounty": analysis["estimatedBounty"],
+                "matchedDevelopers": len(matches),
+            }
+        finally:
+            db.close()
+
+
+analysis_jobs = AnalysisJobQueue(
+    workers=settings.JOB_WORKERS,
+    max_attempts=settings.JOB_MAX_ATTEMPTS,
+    retry_base_seconds=settings.JOB_RETRY_BASE_SECONDS,
+    store=(
+        JobStore(settings.JOB_QUEUE_DB_PATH, settings.JOB_RETENTION_SECONDS)
+        if settings.JOB_QUEUE_DB_PATH else None
+    ),
+    match_limit=settings.AI_MATCH_LIMIT,
+)
+
+
+@event.listens_for(Base.metadata, "after_create")
+@event.listens_for(Base.metadata, "after_drop")
+def _reset_analysis_jobs(target, connection, **kw):
+    analysis_jobs.clear()
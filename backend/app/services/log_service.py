@@ -0,0 +1,95 @@
+"""Log service — streamed log uploads and their storage."""
+
+import gzip
+import os
+import uuid
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.ai.engine import AIEngine
+from app.core import http_cache
+from app.core.config import settings
+from app.models.models import Bug
+
+
+class LogTooLarge(Exception):
+    """Raised when an upload exceeds ``LOG_UPLOAD_MAX_BYTES``."""
+
+
+class LogService:
+    """
+    Streams uploaded logs to gzip files while digesting them incrementally.
+
+    Nothing but the current chunk and the digest's bounded buffers is held in
+    memory, so uploads of any size are handled in constant space. The bug row
+    keeps the excerpt (in ``logs``) and the digest; the full log stays on disk.
+    """
+
+    def __init__(self, engine: Optional[AIEngine] = None, storage_dir: Optional[str] = None):
+        self.engine = engine or AIEngine()
+        self.storage_dir = storage_dir or settings.LOG_STORAGE_DIR
+
+    def log_path(self, bug_id: str) -> str:
+        return os.path.join(self.storage_dir, f"{os.path.basename(bug_id)}.log.gz")
+
+    def ingest(self, bug_id: str, chunks: Iterable[bytes]) -> Dict[str, Any]:
+        """
+        Store and digest an uploaded log. Blocking — run off the event loop.
+
+        The log is written to a temporary file and moved into place only once
+        complete, so a failed upload never replaces a previous log. Raises
+        ``LogTooLarge`` past ``LOG_UPLOAD_MAX_BYTES``.
+        """
+        os.makedirs(self.storage_dir, exist_ok=True)
+        path = self.log_path(bug_id)
+        partial = f"{path}.{uuid.uuid4().hex}.part"
+        received = 0
+
+        def stored(out) -> Iterator[bytes]:
+            nonlocal received
+            for chunk in chunks:
+                received += len(chunk)
+                if received > settings.LOG_UPLOAD_MAX_BYTES:
+                    raise LogTooLarge(
+                        f"Log exceeds {settings.LOG_UPLOAD_MAX_BYTES} bytes"
+                    )
+                out.write(chunk)
+                yield chunk
+
+        try:
+            with gzip.open(partial, "wb", compresslevel=settings.LOG_COMPRESS_LEVEL) as out:
+                digest = self.engine.digest_log(stored(out), settings.LOG_EXCERPT_CHARS)
+            os.replace(partial, path)
+        except BaseException:
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise
+
+        summary = digest.to_dict()
+        summary["bytes"] = received
+        summary["compressedBytes"] = os.path.getsize(path)
+        summary["insights"] = self.engine.log_insights(summary)
+        return {"excerpt": digest.excerpt(), "digest": summary}
+
+    @staticmethod
+    def save_digest(db: Session, bug_id: str, ingested: Dict[str, Any]) -> bool:
+        """Keep the excerpt and digest on the bug; False if it no longer exists."""
+        result = db.execute(
+            update(Bug)
+            .where(Bug.id == bug_id)
+            .values(logs=ingested["excerpt"], log_digest=ingested["digest"])
+        )
+        db.commit()
+        http_cache.bug_changed(bug_id)
+        return result.rowcount > 0
+
+
+class AsyncLogService:
+    """``LogService`` database steps over an ``AsyncSession``."""
+
+    @staticmethod
+    async def save_digest(db: AsyncSession, bug_id: str, ingested: Dict[str, Any]) -> bool:
+        return await db.run_sync(LogService.save_digest, bug_id, ingested)
@@ -0,0 +1,304 @@
+"""
+Timeseries service — hourly and daily rollups behind the analytics charts.
+
+Every write that moves a chart — a bug filed, a pledge, a status change —
+adds to its hour and day buckets in ``analytics_rollups`` within the same
+transaction, keyed by severity, status and category. A chart then reads only
+the buckets in its range instead of scanning ``bugs`` and ``fundings``.
+
+``backfill`` rebuilds the bug and funding rollups from the raw rows
+(``python -m app.utils.backfill_rollups``). Status changes leave no history
+behind, so their rollups only accumulate from live writes.
+"""
+
+import enum
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, delete, func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.ai.engine import AIEngine
+from app.models.models import AnalyticsRollup, Bug, BugStatus, Funding
+
+BUGS_FILED, FUNDING, STATUS_CHANGES = "bugs_filed", "funding", "status_changes"
+METRICS = (BUGS_FILED, FUNDING, STATUS_CHANGES)
+
+INTERVALS = {"hour": timedelta(hours=1), "day": timedelta(days=1)}
+
+# Rollup columns a series can be filtered or grouped by
+DIMENSIONS = ("severity", "status", "category")
+
+_category_engine = AIEngine()
+
+
+def bug_category(title: str, description: str, tags: Optional[List[str]] = None) -> str:
+    """The category a bug is rolled up under."""
+    return _category_engine.keyword_category(title or "", description or "", tags or [])
+
+
+def _naive_utc(at: datetime) -> datetime:
+    # Stored timestamps are naive UTC
+    return at.astimezone(timezone.utc).replace(tzinfo=None) if at.tzinfo is not None else at
+
+
+def bucket_start(at: datetime, interval: str) -> datetime:
+    """Start of the ``interval`` bucket holding ``at``, as naive UTC."""
+    at = _naive_utc(at).replace(minute=0, second=0, microsecond=0)
+    return at.replace(hour=0) if interval == "day" else at
+
+
+def _value(value) -> str:
+    return value.value if isinstance(value, enum.Enum) else value
+
+
+class TimeseriesService:
+
+    @staticmethod
+    def record(
+        db: Session,
+        metric: str,
+        at: datetime,
+        severity,
+        status,
+        category: Optional[str],
+        count: int = 1,
+        total: float = 0.0,
+    ):
+        """
+        Add an event to its hour and day buckets. Runs in the caller's
+        transaction, which must commit it together with the write itself.
+        """
+        rows = [
+            {
+                "metric": metric,
+                "granularity": interval,
+                "bucket_start": bucket_start(at, interval),
+                "severity": _value(severity) or "Medium",
+                "status": _value(status) or BugStatus.OPEN.value,
+                "category": category or "Uncategorized",
+                "count": count,
+                "total": total,
+            }
+            for interval in INTERVALS
+        ]
+        TimeseriesService._upsert(db, rows)
+
+    @staticmethod
+    def _upsert(db: Session, rows: List[Dict[str, Any]]):
+        dialect = db.get_bind().dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            insert_ = sqlite_insert if dialect == "sqlite" else postgresql_insert
+            stmt = insert_(AnalyticsRollup).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[
+                    "metric", "granularity", "bucket_start", "severity", "status", "category",
+                ],
+                set_={
+                    "count": AnalyticsRollup.count + stmt.excluded.count,
+                    "total": AnalyticsRollup.total + stmt.excluded.total,
+                },
+            )
+            db.execute(stmt)
+            return
+        for row in rows:
+            key = and_(*(
+                getattr(AnalyticsRollup, column) == row[column]
+                for column in ("metric", "granularity", "bucket_start", *DIMENSIONS)
+            ))
+            result = db.execute(
+                update(AnalyticsRollup)
+                .where(key)
+                .values(
+                    count=AnalyticsRollup.count + row["count"],
+                    total=AnalyticsRollup.total + row["total"],
+                )
+            )
+            if result.rowcount == 0:
+                db.execute(insert(AnalyticsRollup).values(row))
+
+    @staticmethod
+    def series(
+        db: Session,
+        metric: str,
+        interval: str,
+        start: datetime,
+        end: datetime,
+        filters: Optional[Dict[str, str]] = None,
+        group_by: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Zero-filled buckets from ``start`` up to (not including) ``end``, one
+        series per ``group_by`` value — or a single series with group None.
+        """
+        step = INTERVALS[interval]
+        # Buckets overlapping [start, end): the last one may be in progress
+        last = bucket_start(end, interval)
+        start, end = bucket_start(start, interval), last if last == _naive_utc(end) else last + step
+        group = getattr(AnalyticsRollup, group_by) if group_by else None
+        columns = [AnalyticsRollup.bucket_start] + ([group] if group is not None else [])
+        query = (
+            select(*columns, func.sum(AnalyticsRollup.count), func.sum(AnalyticsRollup.total))
+            .where(
+                AnalyticsRollup.metric == metric,
+                AnalyticsRollup.granularity == interval,
+                AnalyticsRollup.bucket_start >= start,
+                AnalyticsRollup.bucket_start < end,
+            )
+            .group_by(*columns)
+        )
+        for dimension, value in (filters or {}).items():
+            query = query.where(getattr(AnalyticsRollup, dimension) == value)
+
+        found: Dict[Optional[str], Dict[datetime, Tuple[int, float]]] = defaultdict(dict)
+        for row in db.execute(query):
+            key = row[1] if group is not None else None
+            found[key][row[0]] = (int(row[-2] or 0), float(row[-1] or 0.0))
+        if group is None:
+            found.setdefault(None, {})
+
+        buckets = []
+        at = start
+        while at < end:
+            buckets.append(at)
+            at += step
+        return [
+            {
+                "group": key,
+                "points": [
+                    {
+                        "bucketStart": at.isoformat(),
+                        "count": values.get(at, (0, 0.0))[0],
+                        "total": values.get(at, (0, 0.0))[1],
+                    }
+                    for at in buckets
+                ],
+            }
+            for key, values in sorted(found.items(), key=lambda item: item[0] or "")
+        ]
+
+    @staticmethod
+    def backfill(
+        db: Session,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        batch_size: int = 1000,
+    ) -> Dict[str, Any]:
+        """
+        Rebuild the bug-filed and funding rollups from ``bugs`` and ``fundings``.
+
+        With ``start``/``end`` only the whole days between them are rebuilt;
+        otherwise everything is. Bugs filed before categories were stored get
+        theirs first. Pledges are rolled up under their bug's current status.
+        Pledges or bugs committed in the window while this runs can be
+        miscounted; run it again to correct them.
+        """
+        categorized = TimeseriesService._categorize_bugs(db, batch_size)
+
+        if start is not None:
+            start = bucket_start(start, "day")
+        if end is not None:
+            day = bucket_start(end, "day")
+            end = day if day == _naive_utc(end) else day + INTERVALS["day"]
+
+        def window(column):
+            return [
+                condition for condition in (
+                    column >= start if start is not None else None,
+                    column < end if end is not None else None,
+                )
+                if condition is not None
+            ]
+
+        totals: Dict[Tuple, List[float]] = defaultdict(lambda: [0, 0.0])
+
+        def add(metric, at, severity, status, category, amount=0.0):
+            for interval in INTERVALS:
+                key = (
+                    metric, interval, bucket_start(at, interval),
+                    _value(severity) or "Medium", _value(status) or BugStatus.OPEN.value,
+                    category or "Uncategorized",
+                )
+                totals[key][0] += 1
+                totals[key][1] += amount
+
+        bugs = (
+            select(Bug.created_at, Bug.severity, Bug.category)
+            .where(Bug.created_at.isnot(None), *window(Bug.created_at))
+            .execution_options(yield_per=batch_size)
+        )
+        for created_at, severity, category in db.execute(bugs):
+            add(BUGS_FILED, created_at, severity, BugStatus.OPEN, category)
+
+        pledges = (
+            select(Funding.created_at, Funding.amount, Bug.severity, Bug.status, Bug.category)
+            .join(Bug, Bug.id == Funding.bug_id)
+            .where(Funding.created_at.isnot(None), *window(Funding.created_at))
+            .execution_options(yield_per=batch_size)
+        )
+        for created_at, amount, severity, status, category in db.execute(pledges):
+            add(FUNDING, created_at, severity, status, category, amount or 0.0)
+
+        db.execute(
+            delete(AnalyticsRollup).where(
+                AnalyticsRollup.metric.in_([BUGS_FILED, FUNDING]),
+                *window(AnalyticsRollup.bucket_start),
+            )
+        )
+        rows = [
+            {
+                "metric": metric, "granularity": interval, "bucket_start": at,
+                "severity": severity, "status": status, "category": category,
+                "count": count, "total": total,
+            }
+            for (metric, interval, at, severity, status, category), (count, total) in totals.items()
+        ]
+        for i in range(0, len(rows), batch_size):
+            db.execute(insert(AnalyticsRollup), rows[i:i + batch_size])
+        db.commit()
+        return {"categorizedBugs": categorized, "buckets": len(rows)}
+
+    @staticmethod
+    def _categorize_bugs(db: Session, batch_size: int) -> int:
+        """Store the category of bugs that have none, one chunk per commit."""
+        done = 0
+        while True:
+            chunk = db.execute(
+                select(Bug.id, Bug.title, Bug.description, Bug.tags)
+                .where(Bug.category.is_(None))
+                .order_by(Bug.id)
+                .limit(batch_size)
+            ).all()
+            if not chunk:
+                return done
+            db.execute(
+                update(Bug),
+                [
+                    {"id": bug_id, "category": bug_category(title, description, tags)}
+                    for bug_id, title, description, tags in chunk
+                ],
+            )
+            db.commit()
+            done += len(chunk)
+
+
+class AsyncTimeseriesService:
+    """``TimeseriesService`` reads over an ``AsyncSession`` (see ``AsyncBugService``)."""
+
+    @staticmethod
+    async def series(
+        db: AsyncSession,
+        metric: str,
+        interval: str,
+        start: datetime,
+        end: datetime,
+        filters: Optional[Dict[str, str]] = None,
+        group_by: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        return await db.run_sync(
+            TimeseriesService.series, metric, interval, start, end, filters, group_by
+        )
@@ -0,0 +1,42 @@
+"""
+Backfill of the analytics time-series rollups.
+
+    python -m app.utils.backfill_rollups [--from 2026-01-01] [--to 2026-02-01]
+
+Rebuilds the hourly and daily bug-filed and funding buckets from the raw
+``bugs`` and ``fundings`` rows — all of them, or the whole days between
+``--from`` and ``--to`` — after storing categories for bugs that lack one.
+"""
+
+import argparse
+import logging
+from datetime import datetime
+
+from app.services.timeseries_service import TimeseriesService
+
+logger = logging.getLogger("crowdfundfix.analytics")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1].strip())
+    parser.add_argument("--from", dest="start", type=datetime.fromisoformat, default=None)
+    parser.add_argument("--to", dest="end", type=datetime.fromisoformat, default=None)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    from app.core.database import SessionLocal, create_tables
+
+    create_tables()
+    db = SessionLocal()
+    try:
+        summary = TimeseriesService.backfill(
+            db, start=args.start, end=args.end, batch_size=args.batch_size
+        )
+    finally:
+        db.close()
+    logger.info(f"Backfilled analytics rollups: {summary}")
+    print(summary)
+
+
+if __name__ == "__main__":
+    main()
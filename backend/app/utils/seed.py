@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 
 from app.core.security import hash_password
 from app.models.models import User, UserRole, Bug, BugSeverity, BugStatus
+from app.services.timeseries_service import TimeseriesService
 
 
 # Resolve paths relative to this file
@@ -136,4 +137,7 @@ def seed_database(db: Session):
         db.add(bug)
 
     db.commit()
+
+    # Categories and time-series buckets for the seeded bugs
+    TimeseriesService.backfill(db)
     print(f"✅ Seeded {len(regular_users) + 1} users, {len(developers_data)} developers, {len(bugs_data)} bugs")
@@ -0,0 +1,122 @@
+"""
+Login throughput benchmark.
+
+    python -m benchmarks.auth_login --requests 400 --concurrency 32
+
+Drives ``POST /api/v1/auth/login`` in-process (httpx over ASGI, no network)
+against a throwaway SQLite database and reports requests/sec, latency
+percentiles, and the longest event-loop stall seen meanwhile: the time any
+other request would have waited behind password hashing. ``--inline``
+hashes on the event loop instead of the thread pool, for comparison.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+
+def _percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+async def _watch_loop(stop: asyncio.Event, interval: float = 0.005) -> float:
+    """Longest delay past ``interval`` before the loop got back to us."""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst
+
+
+async def run(args):
+    import httpx
+
+    from app.core.database import create_tables
+    from app.core.security import password_hasher
+    from app.main import app
+
+    if args.inline:
+        async def inline(fn, *fn_args):
+            return fn(*fn_args)
+
+        password_hasher._run = inline
+
+    logging.getLogger("crowdfundfix").setLevel(logging.WARNING)
+    create_tables()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        users = [f"bench{i}@example.com" for i in range(args.users)]
+        for email in users:
+            response = await client.post(
+                "/api/v1/auth/signup",
+                json={"name": "Bench", "email": email, "password": "bench-pass", "role": "User"},
+            )
+            response.raise_for_status()
+
+        latencies = []
+        errors = 0
+        queue = asyncio.Queue()
+        for i in range(args.requests):
+            queue.put_nowait(users[i % len(users)])
+
+        async def worker():
+            nonlocal errors
+            while not queue.empty():
+                email = queue.get_nowait()
+                start = time.perf_counter()
+                response = await client.post(
+                    "/api/v1/auth/login", json={"email": email, "password": "bench-pass"}
+                )
+                latencies.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    errors += 1
+
+        stop = asyncio.Event()
+        watcher = asyncio.create_task(_watch_loop(stop))
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        stall = await watcher
+
+    password_hasher.shutdown()
+    ms = [s * 1000 for s in latencies]
+    print(
+        f"mode={'inline' if args.inline else 'pool'} workers={password_hasher.workers} "
+        f"rounds={os.environ['PASSWORD_BCRYPT_ROUNDS']} concurrency={args.concurrency}"
+    )
+    print(f"requests={len(ms)} errors={errors} elapsed={elapsed:.2f}s "
+          f"throughput={len(ms) / elapsed:.1f} req/s")
+    print(f"latency ms: p50={statistics.median(ms):.1f} p95={_percentile(ms, 95):.1f} "
+          f"p99={_percentile(ms, 99):.1f} max={max(ms):.1f}")
+    print(f"max event-loop stall: {stall * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--users", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost")
+    parser.add_argument("--workers", type=int, default=0, help="hash threads (0 = per core)")
+    parser.add_argument("--inline", action="store_true", help="hash on the event loop")
+    args = parser.parse_args()
+
+    # Settings are read at import time
+    tmp = tempfile.mkdtemp(prefix="auth-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+    os.environ["DEBUG"] = "false"
+    os.environ["PASSWORD_BCRYPT_ROUNDS"] = str(args.rounds)
+    os.environ["PASSWORD_HASH_WORKERS"] = str(args.workers)
+    os.environ["PASSWORD_HASH_MAX_PENDING"] = str(max(64, args.concurrency))
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Bug serialization benchmark.
+
+    python -m benchmarks.serialize_bugs --items 200 --repeat 50
+
+Encodes a page of ``--items`` bugs to response bytes both ways and reports
+the cost per bug:
+
+- ``pydantic+json``: build a ``BugResponse`` per bug, re-validate the list
+  against the route's ``response_model`` and encode it with stdlib ``json``,
+  as the routes did before;
+- ``serializer+orjson``: ``bug_dict`` per bug and ``ORJSONResponse``, as
+  they do now.
+
+Rows are in-memory ``Bug`` objects, so neither path touches a database.
+"""
+
+import argparse
+import json
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+
+def _bugs(count: int):
+    from app.models.models import Bug, BugSeverity, BugStatus
+
+    severities, statuses = list(BugSeverity), list(BugStatus)
+    now = datetime.now(timezone.utc)
+    return [
+        Bug(
+            id=f"bug-{i:06d}",
+            title=f"Crash when saving draft #{i}",
+            description="Saving a draft with an attachment throws a null pointer exception. " * 4,
+            repo_link="https://github.com/org/repo",
+            logs="",
+            tags=["editor", "drafts", "crash"],
+            severity=severities[i % len(severities)],
+            expected_behavior="The draft is saved.",
+            status=statuses[i % len(statuses)],
+            bounty=100.0 + i,
+            funds_raised=12.5 * (i % 9),
+            contributors=i % 9,
+            author_id="user-1",
+            assigned_developer_id=None if i % 3 else "dev-1",
+            ai_priority_score=round(i % 100 * 0.73, 2),
+            created_at=now - timedelta(minutes=i),
+        )
+        for i in range(count)
+    ]
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(args):
+    from pydantic import TypeAdapter
+
+    from app.schemas.schemas import BugResponse
+    from app.schemas.serializers import BUG_FIELD_GETTERS, bug_dict, json_response
+
+    bugs = _bugs(args.items)
+    response_model = TypeAdapter(List[BugResponse])
+
+    def legacy():
+        models = [
+            BugResponse(**{f: getter(b) for f, getter in BUG_FIELD_GETTERS.items()})
+            for b in bugs
+        ]
+        validated = response_model.validate_python(models, from_attributes=True)
+        content = response_model.dump_python(validated, mode="json")
+        # What JSONResponse.render does
+        return json.dumps(
+            content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8")
+
+    def current():
+        return json_response([bug_dict(b) for b in bugs]).body
+
+    assert json.loads(legacy()) == json.loads(current())
+    results = {
+        "pydantic+json": _time(legacy, args.repeat),
+        "serializer+orjson": _time(current, args.repeat),
+    }
+    print(f"items={args.items} repeat={args.repeat} (best run)")
+    for name, seconds in results.items():
+        print(f"{name:>18}: {seconds * 1e6 / args.items:7.2f} us/bug  "
+              f"{seconds * 1000:7.2f} ms/page")
+    speedup = results["pydantic+json"] / results["serializer+orjson"]
+    print(f"speedup: {speedup:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    os.environ["DEBUG"] = "false"
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,53 @@
 """Tests for CrowdfundFix backend."""
 
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 from app.main import app
-from app.core.database import Base, get_db
+from app.core.database import Base, get_async_db, get_db
+from app.ai.cache import AnalysisCache
+from app.ai.clustering import CategoryModel, CategoryModelStore, IncrementalTrainer
+from app.ai.engine import AIEngine, DeveloperIndex, KeywordIndex
+from app.ai.executor import AnalysisExecutor
+from app.ai import dedupe
+from app.ai.dedupe import DuplicateIndex
+from app.ai.drain import TemplateMiner
+from app.ai.logstream import LogDigest, iter_log_lines
+from app.ai.train import train_category_model
+from app.api.routes import ai as ai_routes
+from app.api.routes import bugs as bug_routes
+from app.core.config import settings
+from app.core.http_cache import CachedResponse, ResponseCache
+from app.core.migrations import run_migrations
+from app.core import security
+from app.core.auth_cache import TTLCache, principal_cache
+from app.core.security import create_access_token, crypt_context, password_hasher
+from app.models.models import Bug, BugStatus, DeveloperMatch, Funding, User, UserRole
+from app.schemas.schemas import AnalyticsDashboard, BugResponse, DeveloperResponse
+from app.services.ai_service import analysis_cache
+from app.services.analytics_service import dashboard_aggregates
+from app.services.funding_service import AsyncFundingService, FundingService
+from app.services.timeseries_service import TimeseriesService
+from app.services.job_service import (
+    FAILED,
+    SUCCEEDED,
+    AnalysisJobQueue,
+    Job,
+    JobStore,
+    analysis_jobs,
+)
 
 # Use in-memory SQLite for tests
 TEST_DATABASE_URL = "sqlite:///./test_crowdfundfix.db"
@@ -22,7 +63,20 @@ def override_get_db():
         db.close()
 
 
+# TestClient runs each request on a fresh event loop, so async connections
+# must not be pooled across requests
+async_engine = create_async_engine("sqlite+aiosqlite:///./test_crowdfundfix.db", poolclass=NullPool)
+AsyncTestingSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def override_get_async_db():
+    async with AsyncTestingSessionLocal() as db:
+        yield db
+
+
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_async_db] = override_get_async_db
+analysis_jobs.session_factory = TestingSessionLocal
 
 client = TestClient(app)
 
@@ -31,7 +85,10 @@ client = TestClient(app)
 def setup_db():
     """Create tables before each test and drop after."""
     Base.metadata.create_all(bind=engine)
+    analysis_cache.clear()
     yield
+    # Background analyses of the test's bugs must finish before the tables go
+    assert analysis_jobs.wait_idle(timeout=60)
     Base.metadata.drop_all(bind=engine)
 
 
@@ -126,6 +183,39 @@ class TestAuth:
         )
         assert response.status_code == 401
 
+    def test_login_upgrades_outdated_hash_cost(self):
+        client.post(
+            "/api/v1/auth/signup",
+            json={"name": "Old Hash", "email": "old@example.com", "password": "pw-1", "role": "User"},
+        )
+        db = TestingSessionLocal()
+        user = db.query(User).filter(User.email == "old@example.com").one()
+        user.hashed_password = crypt_context(4).hash("pw-1")
+        db.commit()
+
+        response = client.post(
+            "/api/v1/auth/login", json={"email": "old@example.com", "password": "pw-1"}
+        )
+        assert response.status_code == 200
+        db.refresh(user)
+        assert user.hashed_password.startswith(f"$2b${settings.PASSWORD_BCRYPT_ROUNDS:02d}$")
+        db.close()
+
+        # Still the same password
+        response = client.post(
+            "/api/v1/auth/login", json={"email": "old@example.com", "password": "pw-1"}
+        )
+        assert response.status_code == 200
+
+    def test_hashing_overload_sheds_load(self, monkeypatch):
+        monkeypatch.setattr(password_hasher, "max_pending", 0)
+        response = client.post(
+            "/api/v1/auth/signup",
+            json={"name": "Busy", "email": "busy@example.com", "password": "pw", "role": "User"},
+        )
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+
     def test_me(self):
         # Signup to get token
         signup = client.post(
@@ -148,6 +238,60 @@ class TestAuth:
         assert data["name"] == "Me User"
         assert data["role"] == "Developer"
 
+    def test_repeat_callers_skip_crypto_and_db(self, monkeypatch):
+        token = _get_auth_token(name="Cached", email="cached@example.com")
+        headers = {"Authorization": f"Bearer {token}"}
+        assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+
+        calls = {"decode": 0, "get": 0}
+        decode, get = security.jwt.decode, AsyncSession.get
+
+        def counting_decode(*args, **kwargs):
+            calls["decode"] += 1
+            return decode(*args, **kwargs)
+
+        async def counting_get(self, *args, **kwargs):
+            calls["get"] += 1
+            return await get(self, *args, **kwargs)
+
+        monkeypatch.setattr(security.jwt, "decode", counting_decode)
+        monkeypatch.setattr(AsyncSession, "get", counting_get)
+        for _ in range(3):
+            response = client.get("/api/v1/auth/me", headers=headers)
+            assert response.json()["name"] == "Cached"
+        assert calls == {"decode": 0, "get": 0}
+
+    def test_user_changes_invalidate_principal(self):
+        token = _get_auth_token(name="Before", email="rename@example.com")
+        headers = {"Authorization": f"Bearer {token}"}
+        assert client.get("/api/v1/auth/me", headers=headers).json()["name"] == "Before"
+
+        db = TestingSessionLocal()
+        user = db.query(User).filter(User.email == "rename@example.com").one()
+        user.name = "After"
+        db.commit()
+        assert principal_cache.get(user.id) is None
+        db.close()
+        assert client.get("/api/v1/auth/me", headers=headers).json()["name"] == "After"
+
+    def test_expired_token_not_cached(self):
+        _get_auth_token(name="Exp", email="exp@example.com")
+        db = TestingSessionLocal()
+        user_id = db.query(User.id).filter(User.email == "exp@example.com").scalar()
+        db.close()
+        expired = create_access_token({"sub": user_id}, expires_delta=timedelta(seconds=-1))
+        response = client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {expired}"})
+        assert response.status_code == 401
+
+        cache = TTLCache(max_entries=2, ttl_seconds=60)
+        cache.put("a", 1, expires_at=time.time() - 1)
+        assert cache.get("a") is None
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+
     def test_me_no_token(self):
         response = client.get("/api/v1/auth/me")
         assert response.status_code == 401
@@ -213,6 +357,490 @@ class TestBugs:
         response = client.get("/api/v1/bugs/nonexistent")
         assert response.status_code == 404
 
+    def test_list_bugs_keyset_pagination(self):
+        token = _get_auth_token(email="pager@example.com")
+        created = [
+            client.post(
+                "/api/v1/bugs",
+                json={"title": f"Page {i}", "description": "desc", "tags": []},
+                headers={"Authorization": f"Bearer {token}"},
+            ).json()["id"]
+            for i in range(5)
+        ]
+
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = client.get("/api/v1/bugs", params=params)
+            assert response.status_code == 200
+            page = response.json()
+            assert len(page) <= 2
+            seen += [b["id"] for b in page]
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        full = [b["id"] for b in client.get("/api/v1/bugs", params={"limit": 200}).json()]
+        assert seen == full
+        assert sorted(seen) == sorted(created)
+
+    def test_list_bugs_filters_and_projection(self):
+        token = _get_auth_token(email="filter@example.com")
+        headers = {"Authorization": f"Bearer {token}"}
+        client.post(
+            "/api/v1/bugs",
+            json={"title": "Auth", "description": "d", "logs": "trace", "tags": ["auth", "jwt"], "severity": "High"},
+            headers=headers,
+        )
+        client.post(
+            "/api/v1/bugs",
+            json={"title": "CSS", "description": "d", "tags": ["css"], "severity": "Low"},
+            headers=headers,
+        )
+
+        data = client.get("/api/v1/bugs", params={"tag": "jwt"}).json()
+        assert [b["title"] for b in data] == ["Auth"]
+        assert "logs" not in data[0]
+
+        data = client.get("/api/v1/bugs", params={"severity": "Low"}).json()
+        assert [b["title"] for b in data] == ["CSS"]
+        assert client.get("/api/v1/bugs", params={"status": "Resolved"}).json() == []
+
+        data = client.get("/api/v1/bugs", params={"tag": "auth", "fields": "title,logs"}).json()
+        assert data == [{"id": data[0]["id"], "title": "Auth", "logs": "trace"}]
+
+        assert client.get("/api/v1/bugs", params={"fields": "nope"}).status_code == 400
+        assert client.get("/api/v1/bugs", params={"cursor": "!!"}).status_code == 400
+
+    def test_list_bugs_does_not_read_logs_by_default(self):
+        statements = []
+
+        def capture(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+        try:
+            client.get("/api/v1/bugs")
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+        select_bugs = [s for s in statements if "FROM bugs" in s]
+        assert select_bugs and all("bugs.logs" not in s for s in select_bugs)
+
+
+    def test_responses_match_response_models(self):
+        token = _get_auth_token()
+        bug_id = client.post(
+            "/api/v1/bugs",
+            json={"title": "Shape", "description": "desc", "tags": ["ui"]},
+            headers={"Authorization": f"Bearer {token}"},
+        ).json()["id"]
+        client.post("/api/v1/auth/signup", json={
+            "name": "Dev", "email": "shape-dev@example.com", "password": "pass123", "role": "Developer",
+        })
+
+        response = client.get(f"/api/v1/bugs/{bug_id}")
+        assert response.headers["content-type"] == "application/json"
+        assert set(response.json()) == set(BugResponse.model_fields)
+        assert BugResponse.model_validate(response.json()).tags == ["ui"]
+
+        dashboard = client.get("/api/v1/analytics/dashboard").json()
+        AnalyticsDashboard.model_validate(dashboard)
+        assert set(dashboard["recentBugs"][0]) == set(BugResponse.model_fields)
+        assert set(dashboard["topDevelopers"][0]) == set(DeveloperResponse.model_fields)
+
+
+class TestHTTPCache:
+    def _bug(self, token):
+        bug_id = client.post(
+            "/api/v1/bugs",
+            json={"title": "Cache me", "description": "desc", "tags": []},
+            headers={"Authorization": f"Bearer {token}"},
+        ).json()["id"]
+        # Background analysis writes AI scores; let it settle first
+        assert analysis_jobs.wait_idle(timeout=60)
+        return bug_id
+
+    def test_revalidation_and_invalidation(self):
+        token = _get_auth_token()
+        bug_id = self._bug(token)
+        first = client.get(f"/api/v1/bugs/{bug_id}")
+        etag = first.headers["ETag"]
+        assert etag.startswith('"') and "must-revalidate" in first.headers["Cache-Control"]
+
+        response = client.get(f"/api/v1/bugs/{bug_id}", headers={"If-None-Match": etag})
+        assert response.status_code == 304 and response.content == b""
+        assert response.headers["ETag"] == etag
+
+        client.patch(
+            f"/api/v1/bugs/{bug_id}/status",
+            json={"status": "Claimed"},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        response = client.get(f"/api/v1/bugs/{bug_id}", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["status"] == "Claimed"
+        assert response.headers["ETag"] != etag
+
+    def test_queries_on_one_route_get_distinct_etags(self):
+        token = _get_auth_token()
+        for _ in range(3):
+            self._bug(token)
+        two = client.get("/api/v1/bugs?limit=2")
+        one = client.get("/api/v1/bugs?limit=1")
+        assert two.headers["ETag"] != one.headers["ETag"]
+
+        response = client.get("/api/v1/bugs?limit=1", headers={"If-None-Match": two.headers["ETag"]})
+        assert response.status_code == 200 and len(response.json()) == 1
+        response = client.get("/api/v1/bugs?limit=1", headers={"If-None-Match": one.headers["ETag"]})
+        assert response.status_code == 304
+
+    def test_pledges_change_bug_funding_and_dashboard_etags(self):
+        bug_id = self._bug(_get_auth_token())
+        paths = [f"/api/v1/bugs/{bug_id}", f"/api/v1/fund/{bug_id}", "/api/v1/bugs", "/api/v1/analytics/dashboard"]
+        before = {path: client.get(path).headers["ETag"] for path in paths}
+
+        client.post(f"/api/v1/fund/{bug_id}", json={"contributor_name": "Ann", "amount": 25})
+        for path in paths:
+            response = client.get(path, headers={"If-None-Match": before[path]})
+            assert response.status_code == 200, path
+        assert client.get(f"/api/v1/fund/{bug_id}").json()["total_funded"] == 25
+
+    def test_cached_responses_skip_the_database(self):
+        token = _get_auth_token()
+        for _ in range(3):
+            self._bug(token)
+        first = client.get("/api/v1/bugs?limit=2")
+        assert first.headers["X-Next-Cursor"]
+
+        statements = []
+
+        def capture(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+        try:
+            repeat = client.get("/api/v1/bugs?limit=2")
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+        assert statements == []
+        assert repeat.content == first.content
+        assert repeat.headers["X-Next-Cursor"] == first.headers["X-Next-Cursor"]
+        assert repeat.headers["ETag"] == first.headers["ETag"]
+        # Each query string is its own entry
+        assert len(client.get("/api/v1/bugs?limit=1").json()) == 1
+
+    def test_response_cache_is_bounded(self):
+        cache = ResponseCache(max_entries=2, max_bytes=10)
+        etag = cache.etag(["bugs"])
+        cache.put("a", CachedResponse(etag, [], b"aaaa", ["bugs"]))
+        cache.put("b", CachedResponse(etag, [], b"bbbb", ["bugs"]))
+        assert cache.get("a", etag) is not None
+        cache.put("c", CachedResponse(etag, [], b"cccc", ["bug:1"]))
+        # "b" was least recently used
+        assert cache.get("b", etag) is None
+        assert cache.stats()["entries"] == 2 and cache.stats()["bytes"] == 8
+
+        cache.put("big", CachedResponse(etag, [], b"x" * 11, ["bugs"]))
+        assert cache.get("big", etag) is None
+
+        cache.bump("bugs")
+        assert cache.etag(["bugs"]) != etag
+        assert cache.stats()["entries"] == 1  # only "c" does not depend on "bugs"
+
+
+class TestBugLogs:
+    @pytest.fixture(autouse=True)
+    def log_storage(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(bug_routes.log_service, "storage_dir", str(tmp_path))
+        monkeypatch.setattr(settings, "LOG_EXCERPT_CHARS", 200)
+
+    def _create_bug(self, token):
+        return client.post(
+            "/api/v1/bugs",
+            json={"title": "Worker dies", "description": "Crash dump attached", "tags": []},
+            headers={"Authorization": f"Bearer {token}"},
+        ).json()["id"]
+
+    def test_streamed_upload(self):
+        token = _get_auth_token(email="logs@example.com")
+        bug_id = self._create_bug(token)
+        lines = [f"INFO request {i} served in 12ms" for i in range(5000)]
+        lines[2500] = "FATAL ERROR: Reached heap limit Allocation failed"
+        body = ("\n".join(lines) + "\n").encode()
+
+        def chunks():
+            for start in range(0, len(body), 4096):
+                yield body[start:start + 4096]
+
+        response = client.put(
+            f"/api/v1/bugs/{bug_id}/logs",
+            content=chunks(),
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["bytes"] == len(body)
+        assert data["lines"] == 5000
+        assert data["compressedBytes"] < len(body)
+        assert any("Fatal error" in insight for insight in data["logInsights"])
+
+        # Only the bounded excerpt lives on the bug; the full log is downloadable
+        bug = client.get(f"/api/v1/bugs/{bug_id}").json()
+        assert bug["logs"].startswith(lines[0]) and bug["logs"].endswith(lines[-1])
+        assert "heap limit" not in bug["logs"]
+        assert client.get(f"/api/v1/bugs/{bug_id}/logs").content == body
+
+        # Analysis sees the whole log through the digest
+        analysis = client.post("/api/v1/ai/analyze-bug", json={"bugId": bug_id}).json()
+        assert any("Heap" in insight for insight in analysis["logInsights"])
+
+    def test_upload_too_large(self, monkeypatch):
+        monkeypatch.setattr(settings, "LOG_UPLOAD_MAX_BYTES", 100)
+        token = _get_auth_token(email="biglog@example.com")
+        bug_id = self._create_bug(token)
+        response = client.put(
+            f"/api/v1/bugs/{bug_id}/logs",
+            content=b"x" * 1000,
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == 413
+        assert client.get(f"/api/v1/bugs/{bug_id}").json()["logs"] == ""
+
+    def test_upload_unknown_bug(self):
+        token = _get_auth_token(email="nolog@example.com")
+        response = client.put(
+            "/api/v1/bugs/nonexistent/logs",
+            content=b"log",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == 404
+
+    def test_digest_excerpt_and_size(self):
+        engine = AIEngine()
+        text = "boot ok\nGET /a 500 timeout\r\nheap" + "x" * 50 + "\n\nredirect loop"
+        digest = LogDigest(engine.keyword_index.keywords, excerpt_chars=20).consume(
+            iter_log_lines([text[i:i + 7] for i in range(0, len(text), 7)])
+        )
+        normalized = text.replace("\r\n", "\n")
+        assert digest.chars == len(normalized)
+        assert digest.lines == 5
+        assert digest.excerpt().startswith(normalized[:10])
+        assert digest.excerpt().endswith(normalized[-10:])
+        assert set(digest.to_dict()["hits"]) == {"500", "timeout", "heap", "redirect", "loop"}
+
+
+class TestBugSearch:
+    @pytest.fixture(autouse=True)
+    def log_storage(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(bug_routes.log_service, "storage_dir", str(tmp_path))
+
+    def _file(self, token, **bug):
+        bug.setdefault("tags", [])
+        response = client.post(
+            "/api/v1/bugs", json=bug, headers={"Authorization": f"Bearer {token}"}
+        )
+        return response.json()["id"]
+
+    def test_search_ranks_and_snippets(self):
+        token = _get_auth_token()
+        in_title = self._file(
+            token, title="Websocket reconnect storm", description="Clients hammer the gateway"
+        )
+        in_logs = self._file(
+            token,
+            title="Gateway CPU spike",
+            description="CPU pinned at 100%",
+            logs="warn: websocket closed, retrying",
+        )
+        self._file(token, title="Typo on pricing page", description="Says 'montly'")
+
+        response = client.get("/api/v1/bugs/search", params={"q": "websocket"})
+        assert response.status_code == 200
+        hits = response.json()
+        assert [h["id"] for h in hits] == [in_title, in_logs]
+        assert hits[0]["score"] > hits[1]["score"]
+        assert "**Websocket**" in hits[0]["snippet"]
+
+        # Prefix match on the last word; operators in input are not syntax
+        assert [h["id"] for h in client.get(
+            "/api/v1/bugs/search", params={"q": "reconn"}
+        ).json()] == [in_title]
+        assert client.get("/api/v1/bugs/search", params={"q": 'gateway" OR (*'}).status_code == 200
+        assert client.get("/api/v1/bugs/search", params={"q": "nomatchword"}).json() == []
+
+    def test_search_pagination_and_sync(self):
+        token = _get_auth_token()
+        ids = [
+            self._file(token, title=f"Flaky export job {i}", description="export fails")
+            for i in range(5)
+        ]
+        first = client.get("/api/v1/bugs/search", params={"q": "export", "limit": 3})
+        assert len(first.json()) == 3
+        assert first.headers["X-Next-Offset"] == "3"
+        rest = client.get("/api/v1/bugs/search", params={"q": "export", "limit": 3, "offset": 3})
+        assert "X-Next-Offset" not in rest.headers
+        assert sorted(h["id"] for h in first.json() + rest.json()) == sorted(ids)
+
+        # Log uploads replace the indexed text
+        client.put(
+            f"/api/v1/bugs/{ids[0]}/logs",
+            content=b"kafka consumer lag exceeded",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert [h["id"] for h in client.get(
+            "/api/v1/bugs/search", params={"q": "kafka"}
+        ).json()] == [ids[0]]
+
+
+class TestDuplicateDetection:
+    CRASH = {
+        "title": "Checkout page crashes with NullPointerException",
+        "description": (
+            "Clicking pay on the checkout page throws NullPointerException in "
+            "PaymentController at line 42 and the order is never submitted"
+        ),
+        "logs": "java.lang.NullPointerException at PaymentController.submit(PaymentController.java:42)",
+        "tags": ["checkout"],
+    }
+
+    def _file(self, token, bug):
+        response = client.post(
+            "/api/v1/bugs", json=bug, headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.status_code == 200
+        return response.json()
+
+    def test_create_flags_near_duplicates(self):
+        token = _get_auth_token()
+        first = self._file(token, self.CRASH)
+        assert first["possibleDuplicates"] == []
+
+        unrelated = self._file(token, {
+            "title": "Dark mode toggle forgets preference",
+            "description": "After reload the settings page shows light mode again",
+            "tags": ["ui"],
+        })
+        assert unrelated["possibleDuplicates"] == []
+
+        # Same crash, another order: only ids and line numbers differ
+        repeat = dict(self.CRASH, logs=self.CRASH["logs"].replace("42", "57"))
+        repeat["description"] = repeat["description"].replace("42", "57")
+        second = self._file(token, repeat)
+        assert [d["id"] for d in second["possibleDuplicates"]] == [first["id"]]
+        assert second["possibleDuplicates"][0]["similarity"] > 0.9
+
+        response = client.get(f"/api/v1/bugs/{first['id']}/similar")
+        assert response.status_code == 200
+        assert [d["id"] for d in response.json()] == [second["id"]]
+        assert client.get(f"/api/v1/bugs/{unrelated['id']}/similar").json() == []
+        assert client.get("/api/v1/bugs/nonexistent/similar").status_code == 404
+
+    def test_lsh_index(self):
+        index = DuplicateIndex(num_perm=128, bands=32)
+        words = "the upload worker crashes when the queue is empty and retries forever".split()
+        text = " ".join(words * 3 + ["after", "deploy", "of", "release", "candidate"])
+        index.rebuild([
+            ("a", "Upload worker crash", text, ""),
+            ("b", "Upload worker crash", text + " on staging", ""),
+            ("c", "Unrelated", "login form layout breaks on narrow screens", ""),
+        ])
+        assert index.built and len(index) == 3
+        similar = index.similar("a", threshold=0.5)
+        assert [bug_id for bug_id, _ in similar] == ["b"]
+        assert index.similar("c", threshold=0.5) == []
+
+        index.remove("b")
+        assert index.similar("a", threshold=0.5) == []
+        index.invalidate()
+        assert not index.built and len(index) == 0
+
+    def test_lsh_index_without_numpy(self, monkeypatch):
+        monkeypatch.setattr(dedupe, "ML_AVAILABLE", False)
+        index = DuplicateIndex(num_perm=64, bands=16)
+        text = "the upload worker crashes when the queue is empty and retries forever " * 3
+        index.rebuild([
+            ("a", "Upload worker crash", text, ""),
+            ("b", "Upload worker crash", text + "on staging", ""),
+            ("c", "Unrelated", "login form layout breaks on narrow screens", ""),
+        ])
+        assert [bug_id for bug_id, _ in index.similar("a", threshold=0.5)] == ["b"]
+        assert index.similar("c", threshold=0.5) == []
+        assert index.signature("", "") == index.signature("", "")
+
+
+class TestTemplateMiner:
+    def test_lines_collapse_into_templates(self):
+        miner = TemplateMiner()
+        for i in range(100):
+            miner.add(f"worker {i} served /api/items/{i * 7} in {i % 13}ms")
+            if i % 10 == 0:
+                miner.add(f"ERROR upstream timeout after {i}ms host=db-{i % 3}")
+        templates = miner.templates()
+        assert templates[0] == ("worker <*> served <*> in <*>", 100)
+        assert templates[1][1] == 10
+        assert templates[1][0].startswith("ERROR upstream timeout after <*>")
+        assert len(miner) == 2
+
+    def test_cluster_count_is_bounded(self):
+        miner = TemplateMiner(max_clusters=50)
+        for i in range(1000):
+            miner.add(f"unique{chr(97 + i % 26)}{chr(97 + i // 26 % 26)} event")
+        assert len(miner) <= 50
+
+    def test_keywords_match_whole_tokens(self):
+        engine = AIEngine()
+        noisy = engine.analyze(
+            "Slow page", "desc",
+            logs="served 15003 bytes at 12:00:500\nuser joined room 7\nredirecting...",
+        )
+        assert noisy["log_insights"] == ["Detected redirect loop pattern in log output."]
+
+        errors = engine.analyze("Slow page", "desc", logs="GET /pay 500\nGET /pay 500\nworker OOM killed")
+        assert errors["log_insights"][0].startswith("Server error (500)")
+        assert any("Out of memory" in insight for insight in errors["log_insights"])
+
+    def test_keywords_match_raw_lines(self):
+        engine = AIEngine()
+        for logs, insight in [
+            ("GET /api/users status=500", "Server error (500)"),
+            ("upstream failed (500)", "Server error (500)"),
+            ("auth rejected code=401", "Authentication failure (401)"),
+            ("upstream timeout=30s exceeded", "Timeout detected"),
+            ("java.net.SocketException: ReadTimeout after 30s", "Timeout detected"),
+            (" ".join(f"field{i}=x" for i in range(80)) + " then OOM", "Out of memory"),
+        ]:
+            insights = engine.analyze("Slow page", "desc", logs=logs)["log_insights"]
+            assert any(i.startswith(insight) for i in insights), logs
+
+    def test_keywords_survive_wildcarding(self):
+        engine = AIEngine()
+        logs = "worker 3 died: oom\nworker 4 died: timeout\nworker 5 died: oom"
+        digest = engine.digest_log_text(logs)
+        assert digest.miner.templates() == [("worker <*> died: <*>", 3)]
+        hit_lines = digest.to_dict()["hitLines"]
+        assert hit_lines["oom"] == 2 and hit_lines["timeout"] == 1
+
+        result = engine.analyze("Crash", "desc", logs=logs)
+        assert {"OOM Crash", "Timeout"} <= set(result["error_clusters"])
+        assert result["log_insights"][0].startswith("Out of memory")
+        assert any(insight.startswith("Timeout") for insight in result["log_insights"])
+
+    def test_keywords_survive_pruning(self):
+        engine = AIEngine()
+        # 5000 lines sharing no token, so none merge and the miner prunes
+        words = ["".join(chr(97 + i // 26 ** k % 26) for k in range(3)) for i in range(5000)]
+        lines = [f"{word}x {word}y {word}z" for word in words]
+        lines.insert(2500, "FATAL ERROR: Reached heap limit Allocation failed - JavaScript heap out of memory")
+        digest = engine.digest_log_text("\n".join(lines))
+        assert len(digest.miner) <= digest.miner.max_clusters
+        assert any(t.startswith("FATAL ERROR") for t, _ in digest.miner.templates())
+        assert {"fatal error", "heap"} <= set(digest.to_dict()["hits"])
+
+        result = engine.analyze("Crash", "desc", logs="\n".join(lines))
+        assert "Uncategorized Error" not in result["error_clusters"]
+        assert any("heap" in insight.lower() for insight in result["log_insights"])
+
 
 # ---------- AI Analysis ----------
 
@@ -252,6 +880,854 @@ class TestAI:
         )
         assert response.status_code == 404
 
+    def test_analyze_bug_saturated_executor(self, monkeypatch):
+        monkeypatch.setattr(settings, "AI_ANALYZE_ON_CREATE", False)
+        token = _get_auth_token(email="busy@example.com")
+        bug_id = client.post(
+            "/api/v1/bugs",
+            json={"title": "Busy", "description": "desc", "tags": []},
+            headers={"Authorization": f"Bearer {token}"},
+        ).json()["id"]
+
+        monkeypatch.setattr(ai_routes.async_ai_service, "executor", AnalysisExecutor(max_pending=0))
+        response = client.post("/api/v1/ai/analyze-bug", json={"bugId": bug_id})
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+
+    def test_analyze_bugs_batch(self):
+        token = _get_auth_token(email="batch@example.com")
+        bug_ids = []
+        for i in range(3):
+            create_resp = client.post(
+                "/api/v1/bugs",
+                json={
+                    "title": f"Batch bug {i}",
+                    "description": "Worker crashes with out of memory",
+                    "logs": "FATAL ERROR: heap limit",
+                    "tags": ["backend"],
+                    "severity": "High",
+                },
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            bug_ids.append(create_resp.json()["id"])
+
+        response = client.post(
+            "/api/v1/ai/analyze-bugs",
+            json={"bugIds": bug_ids + ["nonexistent"]},
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["bugId"] for line in lines] == bug_ids + ["nonexistent"]
+        assert lines[-1]["error"] == "Bug not found"
+        assert all("category" in line for line in lines[:-1])
+
+        bug = client.get(f"/api/v1/bugs/{bug_ids[0]}").json()
+        assert bug["aiScore"] is not None
+
+    def test_analyze_bugs_whole_backlog(self):
+        token = _get_auth_token(email="backlog@example.com")
+        for i in range(3):
+            client.post(
+                "/api/v1/bugs",
+                json={"title": f"Backlog bug {i}", "description": "desc", "tags": []},
+                headers={"Authorization": f"Bearer {token}"},
+            )
+        response = client.post("/api/v1/ai/analyze-bugs", json={})
+        assert response.status_code == 200
+        assert len(response.text.splitlines()) == 3
+
+    def test_repeat_analysis_served_from_cache(self, monkeypatch):
+        # On-demand path only: no background analysis warming the cache
+        monkeypatch.setattr(settings, "AI_ANALYZE_ON_CREATE", False)
+        token = _get_auth_token(email="cache@example.com")
+        bug_id = client.post(
+            "/api/v1/bugs",
+            json={"title": "Cached", "description": "Checkout payment fails", "tags": ["payment"]},
+            headers={"Authorization": f"Bearer {token}"},
+        ).json()["id"]
+
+        before = client.get("/api/v1/ai/cache-stats").json()
+        first = client.post("/api/v1/ai/analyze-bug", json={"bugId": bug_id}).json()
+
+        statements = []
+
+        def capture(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+        try:
+            second = client.post("/api/v1/ai/analyze-bug", json={"bugId": bug_id}).json()
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+
+        assert second == first
+        assert not any(s.lstrip().upper().startswith("UPDATE") for s in statements)
+        stats = client.get("/api/v1/ai/cache-stats").json()
+        assert stats["hits"] - before["hits"] == 1
+        assert stats["misses"] - before["misses"] == 1
+        assert stats["entries"] == 1
+
+
+class TestAnalysisJobs:
+    def test_create_queues_analysis_and_matching(self):
+        token = _get_auth_token(email="jobs@example.com")
+        created = client.post(
+            "/api/v1/bugs",
+            json={"title": "Queue me", "description": "Login fails with 500", "tags": ["auth"]},
+            headers={"Authorization": f"Bearer {token}"},
+        ).json()
+        assert created["analysisStatus"] in ("queued", "running", "succeeded")
+        assert analysis_jobs.wait_idle(timeout=60)
+
+        job = client.get(f"/api/v1/ai/jobs/{created['id']}").json()
+        assert job["status"] == SUCCEEDED
+        assert job["progress"] == 1.0
+        assert job["attempts"] == 1
+        assert job["result"]["category"]
+        assert client.get(f"/api/v1/bugs/{created['id']}").json()["aiScore"] is not None
+        assert client.get("/api/v1/ai/jobs").json()["succeeded"] >= 1
+        assert client.get("/api/v1/ai/jobs/nonexistent").status_code == 404
+
+    def test_background_matching_persists_top_k(self):
+        db = TestingSessionLocal()
+        db.add_all([
+            User(
+                id=f"dev-{i}", name=f"Dev {i}", email=f"topk-dev{i}@example.com",
+                hashed_password="x", role=UserRole.DEVELOPER, skills=["python"],
+            )
+            for i in range(settings.AI_MATCH_LIMIT + 5)
+        ])
+        db.commit()
+
+        token = _get_auth_token(email="jobs-topk@example.com")
+        bug_id = client.post(
+            "/api/v1/bugs",
+            json={"title": "Match in background", "description": "desc", "tags": ["python"]},
+            headers={"Authorization": f"Bearer {token}"},
+        ).json()["id"]
+        assert analysis_jobs.wait_idle(timeout=60)
+
+        job = client.get(f"/api/v1/ai/jobs/{bug_id}").json()
+        assert job["result"]["matchedDevelopers"] == settings.AI_MATCH_LIMIT
+        persisted = db.query(DeveloperMatch).filter(DeveloperMatch.bug_id == bug_id).count()
+        assert persisted == settings.AI_MATCH_LIMIT
+        db.close()
+
+    def test_retries_dedupe_and_permanent_failure(self):
+        class FakeService:
+            calls = []
+            gate = threading.Event()
+
+            def analyze_bug(self, db, bug_id):
+                self.calls.append(bug_id)
+                if len(self.calls) == 1:
+                    raise RuntimeError("transient")
+                self.gate.wait(10)
+                if bug_id == "gone":
+                    return {}
+                return {"category": "c", "complexity": "Low", "estimatedBounty": 1.0}
+
+            def match_developers(self, db, bug_id, limit=None):
+                return []
+
+        service = FakeService()
+        jobs = AnalysisJobQueue(
+            session_factory=lambda: SimpleNamespace(close=lambda: None),
+            service=service,
+            workers=1,
+            retry_base_seconds=0.01,
+        )
+        try:
+            jobs.enqueue("a")
+            deadline = time.time() + 10
+            while len(service.calls) < 2 and time.time() < deadline:
+                time.sleep(0.01)
+            # Retried after the transient failure and now running (held at the gate)
+            assert jobs.get("a")["status"] == "running"
+            assert jobs.get("a")["attempts"] == 2
+
+            jobs.enqueue("a")  # running: re-run once afterwards
+            jobs.enqueue("b")
+            jobs.enqueue("b")  # already queued: no-op
+            jobs.enqueue("gone")
+            assert jobs.stats()["queued"] == 2
+
+            service.gate.set()
+            assert jobs.wait_idle(timeout=10)
+            assert sorted(service.calls) == ["a", "a", "a", "b", "gone"]
+            assert jobs.get("a")["status"] == SUCCEEDED
+            assert jobs.get("b")["status"] == SUCCEEDED
+            gone = jobs.get("gone")
+            assert (gone["status"], gone["attempts"], gone["error"]) == (FAILED, 1, "Bug not found")
+        finally:
+            jobs.shutdown()
+
+    def test_durable_store_resumes_unfinished_jobs(self, tmp_path):
+        store = JobStore(str(tmp_path / "jobs.db"))
+        store.save(Job("bug-left-behind"))
+        done = Job("bug-done")
+        done.status = SUCCEEDED
+        store.save(done)
+
+        ran = []
+        jobs = AnalysisJobQueue(
+            session_factory=lambda: SimpleNamespace(close=lambda: None),
+            service=SimpleNamespace(
+                analyze_bug=lambda db, bug_id: ran.append(bug_id) or {
+                    "category": "c", "complexity": "Low", "estimatedBounty": 1.0
+                },
+                match_developers=lambda db, bug_id, limit=None: [],
+            ),
+            store=store,
+        )
+        try:
+            jobs.start()
+            assert jobs.wait_idle(timeout=10)
+        finally:
+            jobs.shutdown()
+        assert ran == ["bug-left-behind"]
+        assert store.unfinished() == []
+
+    def test_durable_store_sweeps_old_finished_jobs(self, tmp_path):
+        store = JobStore(str(tmp_path / "jobs.db"), retention_seconds=60)
+        old, recent, queued = Job("old"), Job("recent"), Job("queued", time.time() - 3600)
+        old.status, old.finished_at = FAILED, time.time() - 3600
+        recent.status, recent.finished_at = SUCCEEDED, time.time()
+        for job in (queued, recent, old):
+            store.save(job)
+
+        assert store.sweep() == 1
+        remaining = store._db.execute("SELECT bug_id FROM analysis_jobs ORDER BY bug_id").fetchall()
+        assert remaining == [("queued",), ("recent",)]
+
+
+class TestAnalysisCache:
+    RECORD = {"title": "t", "description": "d", "logs": "", "tags": ["a"], "severity": "High"}
+
+    def test_key_depends_on_content_and_version(self):
+        cache = AnalysisCache("1")
+        key = cache.key(self.RECORD)
+        assert key == cache.key(dict(self.RECORD))
+        assert key != cache.key({**self.RECORD, "tags": ["b"]})
+        assert key != AnalysisCache("2").key(self.RECORD)
+
+    def test_lru_and_size_eviction(self):
+        cache = AnalysisCache("1", max_entries=2)
+        cache.put("a", {"v": 1})
+        cache.put("b", {"v": 2})
+        cache.get("a")
+        cache.put("c", {"v": 3})
+        assert cache.get("b") is None
+        assert cache.get("a") == {"v": 1}
+        assert cache.stats()["evictions"] == 1
+
+        small = AnalysisCache("1", max_bytes=20)
+        small.put("a", {"v": "x" * 8})
+        small.put("b", {"v": "y" * 8})
+        assert small.get("a") is None
+        assert small.get("b") is not None
+
+    def test_ttl_expiry(self):
+        cache = AnalysisCache("1", ttl_seconds=0)
+        cache.put("a", {"v": 1})
+        assert cache.get("a") is None
+
+    def test_persistent_tier(self, tmp_path):
+        path = str(tmp_path / "analysis_cache.db")
+        AnalysisCache("1", path=path).put("a", {"v": 1})
+        restarted = AnalysisCache("1", path=path)
+        assert restarted.get("a") == {"v": 1}
+        assert restarted.stats()["persistentHits"] == 1
+
+    def test_persistent_tier_sweeps_expired_rows(self, tmp_path):
+        path = str(tmp_path / "analysis_cache.db")
+        cache = AnalysisCache("1", ttl_seconds=0, path=path)
+        for key in ("a", "b", "c"):
+            cache.put(key, {"v": key})
+        rows = cache._db.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0]
+        # Every write sweeps with a zero TTL; only the newest row can remain
+        assert rows <= 1
+        cache.sweep()
+        assert cache._db.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0] == 0
+
+    def test_version_depends_on_scoring_mode(self):
+        assert analysis_cache.version.split(":")[1] == (
+            "deterministic" if settings.AI_DETERMINISTIC_SCORING else "random"
+        )
+
+
+class TestCategoryModel:
+    PAYMENT = ["Stripe checkout fails for ledger {i}", "Invoice ledger {i} totals drift after payment"]
+    UI = ["CSS button overlaps widget {i}", "Widget {i} layout breaks the frontend css"]
+
+    def _train(self, path):
+        engine = AIEngine()
+        texts, labels = [], []
+        for i in range(20):
+            for template in self.PAYMENT + self.UI:
+                text = template.format(i=i)
+                texts.append(text)
+                labels.append(engine.keyword_category(text, ""))
+        CategoryModel.fit(texts, labels, n_clusters=2).save(path)
+
+    def test_model_categorizes_what_keywords_cannot(self, tmp_path):
+        path = str(tmp_path / "model.joblib")
+        assert AIEngine().analyze("Ledger totals mismatch", "Ledger drift")["category"] == "General Bug"
+
+        self._train(path)
+        engine = AIEngine(category_model_path=path)
+        assert engine.model_version
+        assert engine.analyze("Ledger totals mismatch", "Ledger drift")["category"] == "Payment Gateway Integration"
+        assert engine.analyze("Widget misaligned", "")["category"] == "UI / Frontend"
+        # Keyword rules still win, and unknown vocabulary stays uncategorized
+        assert engine.analyze("Login token expired", "")["category"] == "Authentication / Security"
+        assert engine.analyze("Something odd", "")["category"] == "General Bug"
+
+    def test_batch_uses_one_transform(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "model.joblib")
+        self._train(path)
+        engine = AIEngine(category_model_path=path)
+        calls = []
+        original = CategoryModel.predict
+        monkeypatch.setattr(CategoryModel, "predict", lambda self, texts: calls.append(texts) or original(self, texts))
+        results = engine.analyze_many([
+            {"title": "Ledger totals mismatch", "description": ""},
+            {"title": "Widget misaligned", "description": ""},
+        ])
+        assert [r["category"] for r in results] == ["Payment Gateway Integration", "UI / Frontend"]
+        assert len(calls) == 1
+
+    def test_incremental_trainer(self, tmp_path):
+        path = str(tmp_path / "model.joblib")
+        self._train(path)
+        store = CategoryModelStore(path, check_interval=0)
+        before = store.get().label_counts.sum()
+        version = store.version
+
+        trainer = IncrementalTrainer(store, AIEngine().keyword_category, batch_size=3)
+        trainer.observe("Stripe refund", "ledger")
+        trainer.observe("Widget css", "")
+        assert store.version == version
+        trainer.observe("Checkout payment", "")
+        trainer.flush(timeout=30)
+        assert store.get().label_counts.sum() == before + 3
+        assert store.version != version
+
+    def test_incremental_updates_run_in_background_and_accumulate(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "model.joblib")
+        self._train(path)
+        store = CategoryModelStore(path, check_interval=0)
+        before = store.get().label_counts.sum()
+
+        release = threading.Event()
+        original = CategoryModel.partial_fit
+
+        def held_partial_fit(self, texts, labels):
+            release.wait(10)
+            original(self, texts, labels)
+
+        monkeypatch.setattr(CategoryModel, "partial_fit", held_partial_fit)
+        # Two trainers writing one file, like two API worker processes
+        trainers = [
+            IncrementalTrainer(store, AIEngine().keyword_category, batch_size=2)
+            for _ in range(2)
+        ]
+        for i, trainer in enumerate(trainers):
+            trainer.observe(f"Stripe refund {i}", "ledger")
+            trainer.observe(f"Widget css {i}", "")  # full batch: must not block
+        release.set()
+        for trainer in trainers:
+            trainer.flush(timeout=30)
+        assert store.get().label_counts.sum() == before + 4
+
+    def test_train_command(self, tmp_path):
+        token = _get_auth_token(email="train@example.com")
+        for title in ("Stripe webhook fails", "CSS overlap", "JWT expired"):
+            client.post(
+                "/api/v1/bugs",
+                json={"title": title, "description": "desc", "tags": []},
+                headers={"Authorization": f"Bearer {token}"},
+            )
+        db = TestingSessionLocal()
+        try:
+            summary = train_category_model(db, str(tmp_path / "model.joblib"), n_clusters=3)
+        finally:
+            db.close()
+        assert summary["bugs"] == 3
+        assert summary["clusters"] == 3
+        assert CategoryModel.load(summary["path"]).predict(["stripe webhook"]) == ["Payment Gateway Integration"]
+
+
+class TestKeywordIndex:
+    def test_scan_matches_substring_semantics(self):
+        keywords = {"heap", "heap limit", "timeout", "out of memory", "oom", "500"}
+        index = KeywordIndex(keywords)
+        text = "fatal: timeout of memory near heap limit in room 1500"
+        hits, _ = index.scan(text)
+        assert hits == {kw for kw in keywords if kw in text}
+
+    def test_scan_region_hits(self):
+        index = KeywordIndex({"heap", "heap limit"})
+        text = "logs: heap limit"
+        _, region_hits = index.scan(text, (6, 10))
+        assert region_hits == {"heap"}
+
+    def test_junction(self):
+        index = KeywordIndex({"refresh token"})
+        assert index.junction("expired refresh", " token") == {"refresh token"}
+
+
+class TestDeveloperMatching:
+    def _signup_developer(self, name, email):
+        return client.post(
+            "/api/v1/auth/signup",
+            json={"name": name, "email": email, "password": "pass123", "role": "Developer"},
+        )
+
+    def test_match_developers_tracks_new_signups(self):
+        token = _get_auth_token(email="matcher@example.com")
+        bug_id = client.post(
+            "/api/v1/bugs",
+            json={"title": "Match me", "description": "desc", "tags": ["python"]},
+            headers={"Authorization": f"Bearer {token}"},
+        ).json()["id"]
+
+        self._signup_developer("Dev One", "dev1@example.com")
+        response = client.get(f"/api/v1/ai/match-developers/{bug_id}")
+        assert response.status_code == 200
+        assert [d["name"] for d in response.json()] == ["Dev One"]
+
+        self._signup_developer("Dev Two", "dev2@example.com")
+        response = client.get(f"/api/v1/ai/match-developers/{bug_id}")
+        assert sorted(d["name"] for d in response.json()) == ["Dev One", "Dev Two"]
+
+    def test_match_developers_limit_and_min_score(self):
+        token = _get_auth_token(email="topk@example.com")
+        bug_id = client.post(
+            "/api/v1/bugs",
+            json={"title": "Top k", "description": "desc", "tags": ["python"]},
+            headers={"Authorization": f"Bearer {token}"},
+        ).json()["id"]
+        for i in range(4):
+            self._signup_developer(f"Dev {i}", f"topk{i}@example.com")
+
+        response = client.get(f"/api/v1/ai/match-developers/{bug_id}?limit=2")
+        assert response.status_code == 200
+        assert len(response.json()) == 2
+
+        response = client.get(f"/api/v1/ai/match-developers/{bug_id}?min_score=99")
+        assert response.status_code == 200
+        assert response.json() == []
+
+    def test_rematching_refreshes_persisted_scores(self):
+        token = _get_auth_token(email="upsert@example.com")
+        bug_id = client.post(
+            "/api/v1/bugs",
+            json={"title": "Upsert", "description": "desc", "tags": ["python"]},
+            headers={"Authorization": f"Bearer {token}"},
+        ).json()["id"]
+        self._signup_developer("Dev Upsert", "devupsert@example.com")
+
+        db = TestingSessionLocal()
+        try:
+            for _ in range(3):
+                match = client.get(f"/api/v1/ai/match-developers/{bug_id}").json()[0]
+                rows = db.query(DeveloperMatch).filter(DeveloperMatch.bug_id == bug_id).all()
+                assert len(rows) == 1
+                assert rows[0].match_score == match["matchScore"]
+                db.expire_all()
+        finally:
+            db.close()
+
+    def test_match_developers_unknown_bug(self):
+        response = client.get("/api/v1/ai/match-developers/nonexistent")
+        assert response.status_code == 404
+
+    def test_index_matches_python_scoring(self):
+        developers = [
+            {"id": "d1", "name": "A", "skills": ["Python", "SQL"], "success_rate": 90.0, "bugs_resolved": 60},
+            {"id": "d2", "name": "B", "skills": ["css"], "success_rate": 40.0, "bugs_resolved": 2},
+            {"id": "d3", "name": "C", "skills": ["python"], "success_rate": 70.0, "bugs_resolved": 20},
+        ]
+        index = DeveloperIndex()
+        index.rebuild(developers)
+        engine = AIEngine()
+        ranked = engine.match_developers(["python", "sql"], "High", index)
+        assert [m["id"] for m in ranked] == ["d1", "d3", "d2"]
+
+        index.remove("d1")
+        index.upsert({**developers[1], "skills": ["python", "sql"]})
+        ranked = engine.match_developers(["python", "sql"], "High", index, limit=1)
+        assert [m["id"] for m in ranked] == ["d2"]
+
+    def test_index_scoring_while_refreshing(self):
+        index = DeveloperIndex()
+        engine = AIEngine()
+        developers = [
+            {"id": f"d{i}", "name": f"Dev {i}", "skills": ["python"], "success_rate": 50.0, "bugs_resolved": 5}
+            for i in range(200)
+        ]
+        builds = []
+
+        def load_all():
+            builds.append(1)
+            time.sleep(0.05)
+            return developers
+
+        def refresh_and_match(i):
+            index.refresh(load_all, lambda ids: [])
+            if i % 2:
+                index.remove(f"d{i}")
+                index.upsert(developers[i])
+            return engine.match_developers(["python"], "High", index, limit=5)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(refresh_and_match, range(64)))
+        assert len(builds) == 1
+        assert all(len(ranked) == 5 and all(m["id"] for m in ranked) for ranked in results)
+
+    def test_deterministic_scoring(self):
+        developers = [
+            {"id": f"d{i}", "name": f"Dev {i}", "skills": ["python"], "success_rate": 50.0, "bugs_resolved": 5}
+            for i in range(20)
+        ]
+        engine = AIEngine(seed="s1")
+        first = engine.match_developers(["python"], "High", developers, bug_id="bug-1")
+        # Same across engine instances and between the vectorized and loop paths
+        assert AIEngine(seed="s1").match_developers(["python"], "High", developers, bug_id="bug-1") == first
+        assert engine._match_developers_loop(
+            ["python"], developers, bug_key="bug-1"
+        ) == sorted(first, key=lambda m: m["matchScore"], reverse=True)
+        # Ties between equal developers are broken by the per-pair jitter
+        assert len({m["matchScore"] for m in first}) > 1
+        assert AIEngine(seed="s2").match_developers(["python"], "High", developers, bug_id="bug-1") != first
+        assert engine.match_developers(["python"], "High", developers, bug_id="bug-2") != first
+
+        analysis = engine.analyze("Title", "Description", severity="High")
+        assert AIEngine(seed="s1").analyze("Title", "Description", severity="High") == analysis
+
+
+# ---------- Analytics ----------
+
+class TestAnalytics:
+    def test_dashboard_tracks_writes(self):
+        assert client.get("/api/v1/analytics/dashboard").json()["totalBugs"] == 0
+
+        token = _get_auth_token(email="dash@example.com")
+        headers = {"Authorization": f"Bearer {token}"}
+        bug_id = client.post(
+            "/api/v1/bugs",
+            json={"title": "Dash", "description": "desc", "tags": [], "severity": "High"},
+            headers=headers,
+        ).json()["id"]
+        client.post(
+            "/api/v1/bugs",
+            json={"title": "Dash 2", "description": "desc", "tags": [], "severity": "Low"},
+            headers=headers,
+        )
+        client.patch(f"/api/v1/bugs/{bug_id}/status", json={"status": "Resolved"}, headers=headers)
+        client.post(f"/api/v1/fund/{bug_id}", json={"contributor_name": "A", "amount": 25})
+
+        data = client.get("/api/v1/analytics/dashboard").json()
+        assert data["totalBugs"] == 2
+        assert data["resolvedBugs"] == 1
+        assert data["resolvedPercentage"] == 50.0
+        assert data["totalFunding"] == 25.0
+        assert data["bugsBySeverity"]["High"] == 1
+        assert data["bugsBySeverity"]["Low"] == 1
+        assert data["bugsByStatus"] == {
+            "Open": 1, "Funded": 0, "Claimed": 0, "In Review": 0, "Resolved": 1,
+        }
+
+        # Incrementally maintained totals agree with a fresh load
+        dashboard_aggregates.invalidate()
+        assert client.get("/api/v1/analytics/dashboard").json() == data
+
+
+class TestTimeseries:
+    def _writes(self):
+        token = _get_auth_token(email="series@example.com")
+        headers = {"Authorization": f"Bearer {token}"}
+        high = client.post(
+            "/api/v1/bugs",
+            json={"title": "Login fails", "description": "auth token rejected", "tags": [], "severity": "High"},
+            headers=headers,
+        ).json()["id"]
+        low = client.post(
+            "/api/v1/bugs",
+            json={"title": "Typo", "description": "footer text", "tags": [], "severity": "Low"},
+            headers=headers,
+        ).json()["id"]
+        db = TestingSessionLocal()
+        db.query(Bug).filter(Bug.id == high).update({"bounty": 50.0})
+        db.commit()
+        db.close()
+        client.post(f"/api/v1/fund/{high}", json={"contributor_name": "A", "amount": 30})
+        client.post(f"/api/v1/fund/{high}", json={"contributor_name": "B", "amount": 20})
+        client.patch(f"/api/v1/bugs/{low}/status", json={"status": "Resolved"}, headers=headers)
+
+    def _totals(self, metric, **params):
+        response = client.get("/api/v1/analytics/timeseries", params={"metric": metric, **params})
+        assert response.status_code == 200, response.text
+        return {
+            series["group"]: (
+                sum(p["count"] for p in series["points"]),
+                sum(p["total"] for p in series["points"]),
+            )
+            for series in response.json()["series"]
+        }
+
+    def test_writes_roll_up_into_buckets(self):
+        self._writes()
+        assert self._totals("bugs_filed") == {None: (2, 0.0)}
+        assert self._totals("bugs_filed", interval="hour", groupBy="severity") == {
+            "High": (1, 0.0), "Low": (1, 0.0),
+        }
+        assert self._totals("funding", interval="hour") == {None: (2, 50.0)}
+        assert self._totals("funding", groupBy="status") == {"Open": (1, 30.0), "Funded": (1, 20.0)}
+        assert self._totals("status_changes", groupBy="status") == {"Funded": (1, 0.0), "Resolved": (1, 0.0)}
+        assert self._totals("status_changes", status="Resolved", severity="High") == {None: (0, 0.0)}
+
+        response = client.get("/api/v1/analytics/timeseries", params={
+            "metric": "bugs_filed", "interval": "day",
+            "from": "2026-01-01T00:00:00", "to": "2026-01-04T00:00:00",
+        })
+        assert [p["bucketStart"] for p in response.json()["series"][0]["points"]] == [
+            "2026-01-01T00:00:00", "2026-01-02T00:00:00", "2026-01-03T00:00:00",
+        ]
+        assert client.get("/api/v1/analytics/timeseries", params={
+            "metric": "funding", "interval": "hour", "from": "2020-01-01", "to": "2026-01-01",
+        }).status_code == 400
+        assert client.get("/api/v1/analytics/timeseries", params={"metric": "nope"}).status_code == 422
+
+    def test_backfill_rebuilds_from_raw_rows(self):
+        self._writes()
+        live = (self._totals("bugs_filed", groupBy="category"), self._totals("funding", interval="hour"))
+
+        db = TestingSessionLocal()
+        try:
+            db.add(Bug(
+                id="bug-old", title="Old crash", description="segfault", author_id="x",
+                created_at=datetime(2026, 1, 2, 15, 30),
+            ))
+            db.commit()
+            summary = TimeseriesService.backfill(db)
+        finally:
+            db.close()
+        assert summary["categorizedBugs"] == 1
+        assert (self._totals("bugs_filed", groupBy="category"), self._totals("funding", interval="hour")) == live
+
+        old = client.get("/api/v1/analytics/timeseries", params={
+            "metric": "bugs_filed", "interval": "hour", "from": "2026-01-02T15:00:00", "to": "2026-01-02T16:00:00",
+        }).json()["series"][0]["points"]
+        assert old == [{"bucketStart": "2026-01-02T15:00:00", "count": 1, "total": 0.0}]
+
+    def test_series_reads_only_its_buckets(self):
+        self._writes()
+        db = TestingSessionLocal()
+        try:
+            statements = []
+
+            def capture(conn, cursor, statement, parameters, context, executemany):
+                if "analytics_rollups" in statement:
+                    statements.append((statement, parameters))
+
+            event.listen(engine, "before_cursor_execute", capture)
+            try:
+                TimeseriesService.series(
+                    db, "funding", "hour", datetime(2026, 1, 1), datetime(2026, 1, 2), group_by="severity",
+                )
+            finally:
+                event.remove(engine, "before_cursor_execute", capture)
+            statement, parameters = statements[0]
+            plan = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+        finally:
+            db.close()
+        assert any("USING INDEX uq_analytics_rollups_bucket" in row[-1] for row in plan), plan
+
+
+# ---------- Query plans ----------
+
+class TestQueryPlans:
+    """Guard hot-path queries against regressing to full table scans."""
+
+    def _capture_selects(self, calls):
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT") and not executemany:
+                statements.append((statement, parameters))
+
+        for target in (engine, async_engine.sync_engine):
+            event.listen(target, "before_cursor_execute", capture)
+        try:
+            for call in calls:
+                call()
+        finally:
+            for target in (engine, async_engine.sync_engine):
+                event.remove(target, "before_cursor_execute", capture)
+        return statements
+
+    def test_service_queries_use_indexes(self):
+        token = _get_auth_token(email="plans@example.com")
+        headers = {"Authorization": f"Bearer {token}"}
+        client.post(
+            "/api/v1/auth/signup",
+            json={"name": "Plan Dev", "email": "plandev@example.com", "password": "p", "role": "Developer"},
+        )
+        bug_id = client.post(
+            "/api/v1/bugs",
+            json={"title": "Plan", "description": "d", "tags": ["auth"]},
+            headers=headers,
+        ).json()["id"]
+        client.post(f"/api/v1/fund/{bug_id}", json={"contributor_name": "A", "amount": 5})
+        first_page = client.get("/api/v1/bugs", params={"limit": 1})
+
+        statements = self._capture_selects([
+            lambda: client.get("/api/v1/bugs"),
+            lambda: client.get("/api/v1/bugs", params={"cursor": first_page.headers.get("X-Next-Cursor") or ""}),
+            lambda: client.get("/api/v1/bugs", params={"status": "Open"}),
+            lambda: client.get("/api/v1/bugs", params={"severity": "High"}),
+            lambda: client.get("/api/v1/bugs", params={"tag": "auth"}),
+            lambda: client.get(f"/api/v1/bugs/{bug_id}"),
+            lambda: client.get(f"/api/v1/fund/{bug_id}"),
+            lambda: client.get("/api/v1/analytics/dashboard"),
+            lambda: client.get(f"/api/v1/ai/match-developers/{bug_id}"),
+            lambda: client.post("/api/v1/auth/login", json={"email": "plans@example.com", "password": "pass123"}),
+        ])
+        assert statements
+
+        with engine.connect() as conn:
+            for statement, parameters in statements:
+                if "GROUP BY" in statement:
+                    continue  # dashboard totals aggregate the whole table by design
+                plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+                full_scans = [
+                    row[-1] for row in plan
+                    if row[-1].startswith("SCAN ") and " USING " not in row[-1]
+                    and "VIRTUAL TABLE" not in row[-1]
+                ]
+                assert not full_scans, (statement, full_scans)
+
+
+# ---------- Migrations ----------
+
+class TestMigrations:
+    def test_unique_match_index_drops_duplicates(self, tmp_path):
+        db_engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+        Base.metadata.create_all(bind=db_engine)
+        with db_engine.begin() as conn:
+            # A database from before the index, holding duplicate pairs
+            conn.exec_driver_sql("DROP INDEX uq_developer_matches_bug_developer")
+            conn.execute(DeveloperMatch.__table__.insert(), [
+                {"id": 1, "bug_id": "b1", "developer_id": "d1", "match_score": 0.4},
+                {"id": 2, "bug_id": "b1", "developer_id": "d1", "match_score": 0.9},
+                {"id": 3, "bug_id": "b1", "developer_id": "d1", "match_score": 0.9},
+                {"id": 4, "bug_id": "b1", "developer_id": "d2", "match_score": 0.5},
+                {"id": 5, "bug_id": "b2", "developer_id": "d1", "match_score": 0.7},
+                {"id": 6, "bug_id": "b2", "developer_id": "d1", "match_score": 0.2},
+            ])
+
+        run_migrations(db_engine)
+
+        with db_engine.connect() as conn:
+            rows = conn.execute(
+                DeveloperMatch.__table__.select().order_by(DeveloperMatch.id)
+            ).all()
+            indexes = {ix["name"]: ix for ix in inspect(conn).get_indexes("developer_matches")}
+        db_engine.dispose()
+        assert [(r.id, r.match_score) for r in rows] == [(2, 0.9), (4, 0.5), (5, 0.7)]
+        assert indexes["uq_developer_matches_bug_developer"]["unique"]
+
+
+# ---------- Funding ----------
+
+class TestFunding:
+    def _bug(self, bounty=0.0):
+        token = _get_auth_token()
+        bug_id = client.post(
+            "/api/v1/bugs",
+            json={"title": "Fund me", "description": "desc", "tags": []},
+            headers={"Authorization": f"Bearer {token}"},
+        ).json()["id"]
+        if bounty:
+            db = TestingSessionLocal()
+            db.query(Bug).filter(Bug.id == bug_id).update({"bounty": bounty})
+            db.commit()
+            db.close()
+        return bug_id
+
+    def test_fund_bug(self):
+        bug_id = self._bug(bounty=100.0)
+        response = client.post(f"/api/v1/fund/{bug_id}", json={"contributor_name": "Ann", "amount": 60})
+        assert response.status_code == 200
+        assert response.json()["amount"] == 60
+        assert client.get(f"/api/v1/bugs/{bug_id}").json()["status"] == "Open"
+
+        client.post(f"/api/v1/fund/{bug_id}", json={"contributor_name": "Ben", "amount": 40})
+        bug = client.get(f"/api/v1/bugs/{bug_id}").json()
+        assert (bug["fundsRaised"], bug["contributors"], bug["status"]) == (100.0, 2, "Funded")
+        summary = client.get(f"/api/v1/fund/{bug_id}").json()
+        assert (summary["total_funded"], summary["contributors"]) == (100.0, 2)
+
+        response = client.post("/api/v1/fund/nonexistent", json={"contributor_name": "A", "amount": 1})
+        assert response.status_code == 404
+
+    def test_summary_aggregates_and_pages_pledges(self):
+        bug_id = self._bug()
+        for amount in range(1, 6):
+            client.post(f"/api/v1/fund/{bug_id}", json={"contributor_name": f"c{amount}", "amount": amount})
+
+        pages, cursor = [], None
+        while True:
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            response = client.get(f"/api/v1/fund/{bug_id}", params=params)
+            summary = response.json()
+            assert (summary["total_funded"], summary["contributors"]) == (15.0, 5)
+            pages.append([f["amount"] for f in summary["fundings"]])
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        assert pages == [[5, 4], [3, 2], [1]]
+
+        assert client.get(f"/api/v1/fund/{bug_id}", params={"cursor": "bogus"}).status_code == 400
+        empty = client.get("/api/v1/fund/nonexistent").json()
+        assert (empty["total_funded"], empty["contributors"], empty["fundings"]) == (0.0, 0, [])
+
+    def test_concurrent_pledges_are_not_lost(self):
+        bug_id = self._bug(bounty=1000.0)
+        amounts = [0.5 * (i % 7 + 1) for i in range(2000)]
+
+        def pledge(amount):
+            db = TestingSessionLocal()
+            try:
+                return FundingService.add_funding(db, bug_id, "crowd", amount)
+            finally:
+                db.close()
+
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(pledge, amounts))
+        assert all(results)
+
+        async def pledge_async(amount):
+            async with AsyncTestingSessionLocal() as db:
+                return await AsyncFundingService.add_funding(db, bug_id, "crowd", amount)
+
+        async def pledge_all():
+            return await asyncio.gather(*(pledge_async(a) for a in amounts[:200]))
+
+        assert all(asyncio.run(pledge_all()))
+
+        db = TestingSessionLocal()
+        bug = db.query(Bug).filter(Bug.id == bug_id).one()
+        expected = sum(amounts) + sum(amounts[:200])
+        assert bug.funds_raised == expected
+        assert bug.contributors == 2200
+        assert bug.status == BugStatus.FUNDED
+        assert db.query(Funding).filter(Funding.bug_id == bug_id).count() == 2200
+        db.close()
+
 
 # ---------- Verification ----------
 